@@ -28,23 +28,23 @@ Contact me at esamuelchan@gmail.com
 """
 
 from cmath import tau
-from html import entities
+from collections import OrderedDict, deque
+from html import entities, escape
 from html.parser import HTMLParser
-from string import printable
-from tkinter import Tk
+from time import perf_counter
 from typing import Tuple
-from webbrowser import open_new
 
 from arcade import (PointList, ShapeElementList, Sprite, SpriteList, Window,
                     create_rectangle_filled, create_rectangle_outline,
                     draw_rectangle_outline, enable_timings, get_fps,
-                    get_window, load_texture, run, schedule, unschedule)
+                    get_window, run, schedule, unschedule)
 from pyglet.event import EventDispatcher
-from pyglet.graphics import Batch
-from pyglet.image import load
+from pyglet.font import load as load_font
+from pyglet.graphics import Batch, Group
 from pyglet.shapes import (Arc, BorderedRectangle, Circle, Ellipse, Line,
-                           Polygon, Sector, Star, Triangle)
-from pyglet.text import DocumentLabel, HTMLLabel, decode_text
+                           Polygon, Rectangle, Sector, Star, Triangle)
+from pyglet.text import DocumentLabel, HTMLLabel, runlist
+from pyglet.text import Label as TextLabel
 from pyglet.text.caret import Caret
 from pyglet.text.formats.html import (_block_containers, _block_elements,
                                       _metadata_elements, _parse_color,
@@ -52,47 +52,105 @@ from pyglet.text.formats.html import (_block_containers, _block_elements,
 from pyglet.text.formats.structured import (ImageElement, OrderedListBuilder,
                                             StructuredTextDecoder,
                                             UnorderedListBuilder)
-from pyglet.text.layout import IncrementalTextLayout
-from pymunk import shapes
+from pyglet.text.layout import IncrementalTextLayout, TextLayout
 
+from animation import animator, ease_in_out_quad
+from cache import image_cache
+from clipboard import clipboard
 from color import (BLACK, BLUE_YONDER, COOL_BLACK, DARK_GRAY, DARK_SLATE_GRAY,
                    RED, WHITE, four_byte)
-from constants import (BOTTOM, CENTER, DEFAULT_FONT, DEFAULT_FONT_FAMILY,
-                       DEFAULT_FONT_SIZE, DISABLE_ALPHA, DOUBLE,
-                       ENTRY_BLINK_INTERVAL, KNOB_HOVER_SCALE, LEFT, MULTIPLE,
-                       RIGHT, SINGLE, SLIDER_VELOCITY, TOGGLE_FADE,
-                       TOGGLE_VELOCITY, TOP, Y)
+from constants import (BOTTOM, CENTER, COMBOBOX_ROWS, DATAGRID_COLUMNS,
+                       DATAGRID_ROW_HEIGHT, DATAGRID_ROWS, DEFAULT_FONT,
+                       DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE, DISABLE,
+                       DISABLE_ALPHA, DOUBLE, DRAG, ENTRY_BLINK_INTERVAL,
+                       FOCUS, HOVER, KNOB_HOVER_SCALE, LEFT,
+                       LISTBOX_ROW_HEIGHT, LISTBOX_ROWS, LISTBOX_SELECT_COLOR,
+                       MULTIPLE, PRESS, RIGHT, SINGLE, SLIDER_DURATION,
+                       TEXTAREA_SCROLL_SPEED, TOGGLE_DURATION, TOP, Y)
+from document import FormattedRopeDocument, RopeDocument
 from file import (combobox_bottom_normal, combobox_middle_normal,
-                  combobox_top_normal, entry_normal, knob, none,
-                  slider_horizontal, toggle_false, toggle_false_hover,
+                  combobox_top_normal, entry_normal, knob, load_texture,
+                  none, slider_horizontal, toggle_false, toggle_false_hover,
                   toggle_true, toggle_true_hover, widgets)
 from geometry import Point, get_distance
-from key import (ALT, CONTROL, ENTER, KEY_LEFT, KEY_RIGHT, MOTION_BACKSPACE,
-                 MOTION_BEGINNING_OF_FILE, MOTION_BEGINNING_OF_LINE,
-                 MOTION_COPY, MOTION_DELETE, MOTION_DOWN, MOTION_END_OF_FILE,
-                 MOTION_END_OF_LINE, MOTION_LEFT, MOTION_NEXT_WORD,
-                 MOTION_PREVIOUS_WORD, MOTION_RIGHT, MOTION_UP,
-                 MOUSE_BUTTON_LEFT, SHIFT, SPACE, TAB, A, C, Keys, V, X)
+from highlight import Highlighter
+from key import (ALT, CONTROL, END, ENTER, HOME, KEY_DOWN, KEY_LEFT, KEY_RIGHT,
+                 KEY_UP, MOTION_BACKSPACE, MOTION_BEGINNING_OF_FILE,
+                 MOTION_BEGINNING_OF_LINE, MOTION_COPY, MOTION_DELETE,
+                 MOTION_DOWN, MOTION_END_OF_FILE, MOTION_END_OF_LINE,
+                 MOTION_LEFT, MOTION_NEXT_WORD, MOTION_PREVIOUS_WORD,
+                 MOTION_RIGHT, MOTION_UP, MOUSE_BUTTON_LEFT, SHIFT, SPACE,
+                 TAB, A, C, Keys, V, X)
+from key import Y as KEY_Y
+from key import Z as KEY_Z
+from options import (CachedProvider, GeneratorProvider, ListProvider,
+                     OptionProvider)
+from search import Finder
+from selection import IndexSet
+from undo import UndoManager
+from validator import (VALIDATION_ADVANCED_DIGITS, VALIDATION_DIGITS,
+                       VALIDATION_LETTERS, VALIDATION_LOWERCASE,
+                       VALIDATION_PRINTABLE, VALIDATION_PUNCTUATION,
+                       VALIDATION_REGULAR, VALIDATION_UPPERCASE,
+                       VALIDATION_WHITESPACE, compile_validator)
 
 MAX = 2 ** 32
 
-enable_timings()
+# Sprite lists are lazy, so no OpenGL resources are created until they are
+# drawn. The batch is created by the first widget that needs it. Importing the
+# widgets does not need a window.
+_widgets = SpriteList(lazy=True)
+_batch = None
+background = Group(order=-1) # Drawn behind the rest of the batch
+widgets_list = SpriteList(lazy=True)
 
-clipboard = Tk()
-clipboard.withdraw()
 
-_widgets = SpriteList()
-batch = Batch()
-widgets_list = SpriteList()
+def get_batch():
+    """Get the batch that the text and shapes of all of the widgets are drawn
+    in. It is created the first time it is needed.
+
+    returns: Batch
+    """
+
+    global _batch
+
+    if _batch is None:
+        _batch = Batch()
+
+    return _batch
+
+def __getattr__(name):
+    # The batch used to be created at import, as the batch attribute
+    if name == "batch":
+        return get_batch()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class TextGroup(Group):
+    """Group of the text of a widget. Setting the visible property of a pyglet
+    text layout deletes its vertex lists, and its document too for an
+    incremental layout. Hiding the group instead keeps all of them, and the
+    batch only skips drawing the group.
+
+    pyglet groups are equal when their order and parent are, which would
+    share the visibility of every widget's text. Text groups are only equal
+    to themselves, so each one is drawn separately from the text of other
+    widgets.
+    """
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
 
 def clipboard_get():
-    """Get some text from the clipboard.
+    """Get some text from the clipboard. This blocks until the text is read,
+    so use clipboard.get_async in event handlers.
 
     returns: str
     """
 
-    return clipboard.clipboard_get()
+    return clipboard.get()
 
 def clipboard_append(text):
     """Append some text to the clipboard.
@@ -102,7 +160,7 @@ def clipboard_append(text):
     parameters: str
     """
 
-    clipboard.clipboard_append(text)
+    clipboard.append(text)
 
 def insert(index, text, add):
     """Insert some text to a string given an index. This was originally used for
@@ -188,14 +246,16 @@ class HTMLDecoder(HTMLParser, StructuredTextDecoder):
         self.close()
 
     def get_image(self, filename):
-        """Get an image from a filename. This uses the location.
+        """Get an image from a filename. This uses the location. Images are
+        shared through the image cache, so repeating the same icon in many
+        labels only decodes and uploads it once.
 
         filename - filename of image
 
         parameters: str
         """
 
-        return load(filename, file=self.location.open(filename))
+        return image_cache.get(self.location, filename)
 
     def prepare_for_data(self):
         """Prepare the document for insertion of HTML text.
@@ -627,7 +687,7 @@ class HTMLLabel(DocumentLabel):
     def __init__(self, text='', location=None,
                  x=0, y=0, width=None, height=None,
                  anchor_x='left', anchor_y='baseline',
-                 multiline=False):
+                 multiline=False, group=None):
         """Create a label with an HTML string.
 
         :Parameters:
@@ -653,6 +713,8 @@ class HTMLLabel(DocumentLabel):
             `multiline` : bool
                 If True, the label will be word-wrapped and render paragraph
                 and line breaks.  You must also set the width of the label.
+            `group` : `~pyglet.graphics.Group`
+                Optional graphics group to use.
         """
 
         self._text = text
@@ -661,8 +723,8 @@ class HTMLLabel(DocumentLabel):
         document = HTMLDecoder().decode(text, location)
 
         DocumentLabel.__init__(self, document, x, y, width, height,
-                               anchor_x, anchor_y, multiline, None, batch,
-                               None)
+                               anchor_x, anchor_y, multiline, None, get_batch(),
+                               group)
 
     def _get_text(self):
         """HTML formatted text of the label.
@@ -682,6 +744,215 @@ class HTMLLabel(DocumentLabel):
     text = property(_get_text, _set_text)
 
 
+class TextMeasure:
+    """Measure the size of plain or HTML text without creating a layout.
+
+    Creating a Label just to read its content_width and content_height builds
+    a full DocumentLabel layout with vertex lists. Doing that for thousands of
+    cells in a layout pass allocates GPU resources for text that is never
+    drawn. This computes the size from font metrics and glyph advances, which
+    are cached per font, and memoizes each result.
+    """
+
+    _breaks = "\n\u2028\u2029"
+
+    def __init__(self, max_entries=4096):
+        """Initialize a text measurer. One is already created, which can be
+        accessed with the text_measure variable.
+
+        >>> width, height = text_measure.measure("<b>Hello</b> world!")
+
+        max_entries - maximum number of memoized results. When exceeded, the
+                      least recently used results are discarded. Defaults to
+                      4096.
+
+        The result is an approximation of the layout size. Kerning, paragraph
+        margins and indents are not applied.
+
+        properties:
+            results - internal map of memoized results, least recent first
+            advances - internal map of glyph advances for each font
+
+        parameters: int
+        """
+
+        self.max_entries = max_entries
+
+        self.results = OrderedDict()
+        self.advances = {}
+
+    def _get_advances(self, font, text):
+        """Get the glyph advances of a font, adding any characters of the text
+        that have not been measured yet.
+
+        font - pyglet font of the text
+        text - text whose characters are needed
+
+        parameters: pyglet.font.base.Font, str
+        returns: dict
+        """
+
+        advances = self.advances.get(font)
+
+        if advances is None:
+            advances = self.advances[font] = {}
+
+        for char in set(text).difference(advances):
+            glyphs = font.get_glyphs(char)
+            advances[char] = glyphs[0].advance if glyphs else 0
+
+        return advances
+
+    def _get_runs(self, text, font, html):
+        """Get the runs of the text. Each run is a string with its font, or an
+        inline element (like an image) with a None string.
+
+        text - text to be measured
+        font - font of plain text
+        html - text is HTML
+
+        parameters: str, Font or tuple, bool
+        returns: list
+        """
+
+        if not html:
+            return [(text, load_font(font[0], font[1]))]
+
+        document = HTMLDecoder().decode(text)
+
+        runs = runlist.ZipRunIterator((
+            document.get_font_runs(),
+            document.get_element_runs()
+        ))
+
+        return [
+            (None, element) if element else (document.text[start:end], _font)
+            for start, end, (_font, element) in runs.ranges(
+                0, len(document.text)
+            )
+        ]
+
+    def _measure(self, runs, width, multiline):
+        """Measure runs of text by flowing them into lines.
+
+        runs - runs given by _get_runs
+        width - width to wrap lines at, or None
+        multiline - line breaks and wrapping are applied
+
+        parameters: list, int, bool
+        returns: tuple (width, height)
+        """
+
+        lines = []
+
+        # Width of the line up to the last space, and without the spaces
+        line_width = break_width = content_width = 0
+        ascent = descent = 0
+        last_ascent = last_descent = 0
+
+        for text, font in runs:
+            if text is None:
+                # Inline element
+                line_width += font.advance
+                ascent = max(ascent, font.ascent)
+                descent = min(descent, font.descent)
+
+                continue
+
+            advances = self._get_advances(font, text)
+
+            last_ascent, last_descent = font.ascent, font.descent
+
+            for char in text:
+                if char in self._breaks:
+                    if multiline:
+                        lines.append((line_width, ascent or last_ascent,
+                                      descent or last_descent))
+
+                        line_width = break_width = content_width = 0
+                        ascent = descent = 0
+
+                    continue
+
+                advance = advances[char]
+
+                if multiline and width and break_width and \
+                    line_width + advance > width and not char == " ":
+                    # Wrap at the last space. Like in a layout, the spaces at
+                    # the end of the wrapped line are not part of its width.
+                    lines.append((content_width, ascent, descent))
+
+                    line_width -= break_width
+                    break_width = content_width = 0
+
+                if char == " " and break_width != line_width:
+                    content_width = line_width
+
+                line_width += advance
+
+                ascent = max(ascent, font.ascent)
+                descent = min(descent, font.descent)
+
+                if char == " ":
+                    break_width = line_width
+
+        lines.append((line_width, ascent or last_ascent,
+                      descent or last_descent))
+
+        return (
+                max(line[0] for line in lines),
+                sum(line[1] - line[2] for line in lines)
+               )
+
+    def measure(self, text, font=DEFAULT_FONT, width=None, multiline=False,
+                html=True):
+        """Measure the size of some text. Results are memoized per (text, font,
+        width, multiline).
+
+        text - text to be measured
+        font - font of the text. This can be an object-oriented font or a
+               tuple containing the font description in (family, size). It is
+               used for plain text only, as HTML text specifies its own fonts.
+               Defaults to DEFAULT_FONT.
+        width - width to wrap lines at. This needs only to be used if the text
+                is multiline. Defaults to None.
+        multiline - text is measured multiline. Line breaks are applied and
+                    lines are wrapped at width. Defaults to False.
+        html - text is HTML, like in a Label. Defaults to True.
+
+        parameters: str, Font or tuple, int, bool, bool
+        returns: tuple (width, height)
+        """
+
+        key = (text, font[0], font[1], width, multiline, html)
+
+        size = self.results.get(key)
+
+        if size is not None:
+            self.results.move_to_end(key)
+
+            return size
+
+        size = self._measure(self._get_runs(text, font, html),
+                             width, multiline)
+
+        self.results[key] = size
+
+        if len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+        return size
+
+    def clear(self):
+        """Clear the memoized results and glyph advances."""
+
+        self.results.clear()
+        self.advances.clear()
+
+
+text_measure = TextMeasure()
+
+
 class WidgetsError(Exception):
     """Widgets error. When creating custom widgets, this can be invoked. Only
     use this if you need to, like if it is going to cause something to hang or
@@ -695,6 +966,8 @@ class WidgetsError(Exception):
 class Font:
     """An object-oriented Font."""
 
+    __slots__ = ("family", "size", "list")
+
     def __init__(self,
                  family=DEFAULT_FONT_FAMILY,
                  size=DEFAULT_FONT_SIZE
@@ -825,7 +1098,7 @@ class Container(EventDispatcher):
         [widget.draw() for widget in self.widgets]
 
         with self.window.ctx.pyglet_rendering():
-            batch.draw()
+            get_batch().draw()
 
             # A shadow effect not in progress anymore
 
@@ -866,6 +1139,18 @@ class Container(EventDispatcher):
 
         self.enable = False
 
+    def on_activate(self):
+        """The window was activated. This resumes the blink clock."""
+
+        blink_clock.resume()
+
+    def on_deactivate(self):
+        """The window was deactivated. This pauses the blink clock, so nothing
+        is blinked while the window is in the background.
+        """
+
+        blink_clock.pause()
+
     def on_key_press(self, keys, modifiers):
         """A key is pressed. This is used to detect focus change by pressing
         Tab and Shift-Tab."""
@@ -876,19 +1161,79 @@ class Container(EventDispatcher):
             else:
                 direction = 1
 
-            if self.focus in self.widgets:
-                i = self.widgets.index(self.focus)
+            # Components are skipped, their widget takes the focus
+            widgets = [widget for widget in self.widgets
+                       if widget.parent is None]
+
+            if not widgets:
+                return
+
+            if self.focus in widgets:
+                i = widgets.index(self.focus)
             else:
                 i = 0
                 direction = 0
 
-            self.focus = self.widgets[(i + direction) % len(self.widgets)]
+            self.set_focus(widgets[(i + direction) % len(widgets)])
 
-            self.focus.focus = True
+    def set_focus(self, widget):
+        """Give a widget the focus of the container. The widget that had focus
+        before loses it. Text input is only delivered to the focused widget, so
+        typing costs the same no matter how many widgets there are.
 
-            for widget in self.widgets:
-                if not widget == self.focus:
-                    widget.focus = False
+        A widget can pass the focus to one of its components with its
+        focus_widget attribute, like a combobox to its entry.
+
+        widget - widget to focus, or None to remove the focus
+
+        parameters: Widget
+        """
+
+        if widget is not None and widget.focus_widget is not None:
+            widget = widget.focus_widget
+
+        if self.focus is not None and not self.focus is widget:
+            self.focus.focus = False
+
+        self.focus = widget
+
+        if widget is not None:
+            widget.focus = True
+
+    def on_text(self, text):
+        """Text was typed. This is delivered to the focused widget only.
+
+        text - text typed by the user
+
+        parameters: str
+        """
+
+        if hasattr(self.focus, "on_text"):
+            self.focus.on_text(text)
+
+    def on_text_motion(self, motion):
+        """The caret was moved with the keyboard. This is delivered to the
+        focused widget only.
+
+        motion - motion used by the user
+
+        parameters: int (32-bit)
+        """
+
+        if hasattr(self.focus, "on_text_motion"):
+            self.focus.on_text_motion(motion)
+
+    def on_text_motion_select(self, motion):
+        """Text was selected with the keyboard. This is delivered to the
+        focused widget only.
+
+        motion - motion used by the user
+
+        parameters: int (32-bit)
+        """
+
+        if self.focus is not None:
+            self.focus.on_text_motion_select(motion)
 
 
 container = Container()
@@ -896,6 +1241,9 @@ container = Container()
 
 class Frame:
 
+    __slots__ = ("x", "y", "width", "height", "direction", "color", "widgets",
+                 "shape")
+
     def __init__(self, x, y, width=200, height=200, direction=BOTTOM):
         self.x = x
         self.y = y
@@ -919,6 +1267,62 @@ class Frame:
         self.shape.draw()
 
 
+_frame = None
+_keys = None
+
+def get_default_frame():
+    """Get the frame of widgets created without one. It is shared by all of
+    them, and does not keep track of its widgets.
+
+    returns: Frame
+    """
+
+    global _frame
+
+    if _frame is None:
+        _frame = Frame(0, 0)
+
+    return _frame
+
+def get_keys():
+    """Get the key state handler shared by all of the widgets. Every key state
+    handler pushes its own events to the window, so widgets do not create
+    their own.
+
+    returns: Keys
+    """
+
+    global _keys
+
+    if _keys is None:
+        _keys = Keys()
+
+    return _keys
+
+def _state_flag(flag, doc):
+    """Create a property of a state flag of a widget. The states of a widget
+    are packed into the bits of a single int, not stored as separate
+    attributes.
+
+    flag - bit of the state
+    doc - documentation of the property
+
+    parameters: int, str
+    returns: property
+    """
+
+    def _get(self):
+        return bool(self._state & flag)
+
+    def _set(self, value):
+        if value:
+            self._state |= flag
+        else:
+            self._state &= ~flag
+
+    return property(_get, _set, doc=doc)
+
+
 class Widget(Sprite, EventDispatcher):
     """Create a user interface GUI widget. This is a high-level class, and is
     not suitable for very complex widgets. It comes with built-in states,
@@ -964,6 +1368,34 @@ class Widget(Sprite, EventDispatcher):
         2. Move documentation from setters to getters for properties
     """
 
+    COMPONENTS = () # Attributes with the parts of the widget
+
+    _state = 0 # State flags
+
+    detached = False
+
+    parent = None # Widget this is a component of
+    focus_widget = None # Component taking the focus of this widget
+
+    text_group = None # TextGroup of the text parts of the widget
+
+    component = None
+    container = None
+    shapes = None
+
+    last_press = ()
+
+    _left = None
+    _right = None
+    _top = None
+    _bottom = None
+
+    hover = _state_flag(HOVER, "The widget is hovered by the mouse.")
+    press = _state_flag(PRESS, "The widget is pressed.")
+    disable = _state_flag(DISABLE, "The widget is disabled.")
+    drag = _state_flag(DRAG, "The widget is dragged.")
+    focus = _state_flag(FOCUS, "The widget has the focus of the container.")
+
     def __init__(self, widgets=(), image=none, scale=1.0, frame=None):
         """
         Here's an example of a widget. This _colorchooser dispatches events, so
@@ -1016,42 +1448,51 @@ class Widget(Sprite, EventDispatcher):
             image - str (filepath) or arcade Texture
         """
 
-        Sprite.__init__(self, image, scale)
-
-        self.frame = frame or Frame(0, 0)
+        # Preloaded images are used without decoding them again
+        Sprite.__init__(self, scale=scale, texture=load_texture(image))
 
-        self.frame.append(self)
+        # States (hover, press, disable, drag, and focus) are packed into
+        # _state, and attributes that are usually None are class attributes,
+        # so they are not stored for every widget
 
-        self.hover = False
-        self.press = False
-        self.disable = False
+        if frame is None:
+            self.frame = get_default_frame()
+        else:
+            self.frame = frame
+            self.frame.append(self)
 
         self.widgets = widgets
 
-        self.drag = False
+        self.frames = 0
 
-        self.focus = False
+        self.keys = get_keys()
+
+        container.append(self)
 
-        self.component = None
-        self.container = None
+        self.window = get_window()
 
-        self._left = None
-        self._right = None
-        self._top = None
-        self._bottom = None
+        self.window.push_handlers(*self._window_handlers())
 
-        self.frames = 0
+        self._adopt_components()
 
-        self.last_press = ()
+    def _adopt_components(self):
+        """Set the parent of the components of the widget. Components do not
+        take the focus when they are pressed, their widget does. Widgets that
+        create components after initializing the base class should call this
+        again.
+        """
 
-        self.keys = Keys()
-        self.shapes = None
+        for component in self._components():
+            if isinstance(component, Widget):
+                component.parent = self
 
-        container.append(self)
+    def _window_handlers(self):
+        """Get the event handlers of the widget that are pushed to the window.
 
-        self.window = get_window()
+        returns: tuple of callable
+        """
 
-        self.window.push_handlers(
+        return (
             self.on_key_press,
             self.on_key_release,
             self.on_mouse_motion,
@@ -1059,7 +1500,6 @@ class Widget(Sprite, EventDispatcher):
             self.on_mouse_release,
             self.on_mouse_scroll,
             self.on_mouse_drag,
-            self.on_text_motion_select,
             self.on_update
         )
 
@@ -1181,20 +1621,139 @@ class Widget(Sprite, EventDispatcher):
         self.disable = True
         self.focus = False
 
-        self.window.remove_handlers(
-            self.on_key_press,
-            self.on_key_release,
-            self.on_mouse_motion,
-            self.on_mouse_press,
-            self.on_mouse_release,
-            self.on_mouse_scroll,
-            self.on_mouse_drag,
-            self.on_text_motion_select,
-            self.on_update
-        )
+        if container.focus is self:
+            container.set_focus(None)
+
+        self.window.remove_handlers(*self._window_handlers())
 
         self.remove_from_sprite_lists()
 
+    def _components(self):
+        """Get the parts of the widget, listed by attribute name in the
+        COMPONENTS of its class. Lists of parts, like rows, are flattened.
+
+        returns: generator
+        """
+
+        stack = [getattr(self, name, None) for name in
+                 reversed(self.COMPONENTS)]
+
+        while stack:
+            component = stack.pop()
+
+            if isinstance(component, list):
+                stack.extend(reversed(component))
+            elif component is not None:
+                yield component
+
+    def _set_shown(self, shown):
+        """Show or hide the widget and its parts that are not widgets. Text
+        parts are hidden with the text_group of the widget, because setting
+        the visible property of a pyglet text layout deletes it. Hidden parts
+        stay in their sprite lists and batches, so their textures, documents,
+        and vertex lists are kept.
+
+        shown - widget and its parts are drawn
+
+        parameters: bool
+        """
+
+        self.visible = shown
+
+        if self.text_group:
+            self.text_group.visible = shown
+
+        for component in self._components():
+            if not isinstance(component, (Widget, TextLayout)) and \
+                hasattr(component, "visible"):
+                component.visible = shown
+
+    def detach(self):
+        """Detach the widget and its components from the window and the
+        container, so they are not drawn and do not receive any events. Unlike
+        delete, nothing is destroyed, and the widget can be attached again.
+        Use a WidgetPool to reuse detached widgets.
+
+        Widgets with parts that are not listed in COMPONENTS, or that keep
+        running without events, should override this.
+        """
+
+        if self.detached:
+            return
+
+        self.focus = False
+
+        if container.focus is self:
+            container.set_focus(None)
+
+        animator.cancel(self)
+
+        self.window.remove_handlers(*self._window_handlers())
+
+        if self in container.widgets:
+            container.widgets.remove(self)
+
+        for component in self._components():
+            if isinstance(component, Widget):
+                component.detach()
+
+        self._set_shown(False)
+
+        self.detached = True
+
+    def attach(self):
+        """Attach a detached widget and its components to the window and the
+        container again.
+        """
+
+        if not self.detached:
+            return
+
+        for component in self._components():
+            if isinstance(component, Widget):
+                component.attach()
+
+        self._set_shown(True)
+
+        container.append(self)
+
+        self.window.push_handlers(*self._window_handlers())
+
+        self.detached = False
+
+    def destroy(self):
+        """Delete the widget and all of its components for good. Use this
+        instead of delete when the class of the widget is not known, because
+        text widgets use delete to delete text.
+        """
+
+        for component in self._components():
+            if isinstance(component, Widget):
+                component.destroy()
+            elif hasattr(component, "delete"):
+                component.delete()
+
+        Widget.delete(self)
+
+    def reset(self, **properties):
+        """Reset the state of the widget, so it can be reused like a new one.
+        The hover, press, disable, drag, and focus states are cleared, and the
+        properties given are set. You may want to override this if your widget
+        keeps other state.
+
+        >>> toast.reset(text="Saved", x=200, y=40)
+
+        properties - properties to be set, like text, x, and y
+
+        parameters: dict
+        """
+
+        self._state = 0
+        self.last_press = ()
+
+        for name, value in properties.items():
+            setattr(self, name, value)
+
     def on_key_press(self, keys, modifiers):
         """The user pressed a key(s) on the keyboard.
 
@@ -1267,7 +1826,11 @@ class Widget(Sprite, EventDispatcher):
 
         if self.check_collision(Point(x, y)):
             self.press = True
-            self.focus = True
+
+            # The handlers of components run after the ones of their widget,
+            # so they would take the focus from it
+            if self.parent is None:
+                container.set_focus(self)
 
             self.dispatch_event("on_press", x, y, buttons, modifiers)
             self.dispatch_event("on_focus")
@@ -1340,7 +1903,7 @@ class Widget(Sprite, EventDispatcher):
     def on_text_motion_select(self, motion):
         """Some text in an pyglet.IncrementalTextLayout was selected. This is
         only used for entry widgets. See the entry widget on_text_select docs
-        for more info.
+        for more info. The container delivers this to the focused widget only.
         """
 
         self.dispatch_event("on_text_select", motion)
@@ -1371,7 +1934,18 @@ class Widget(Sprite, EventDispatcher):
         if self.container and not self.container.enable:
             self.disable = True
 
-        self.dispatch_event("update")
+        if self._needs_update():
+            self.dispatch_event("update")
+
+    def _needs_update(self):
+        """Check if the update event has to be dispatched this frame. Widgets
+        that only change when their state changes, or while they are
+        animated, can override this so they are not updated when idle.
+
+        returns: bool
+        """
+
+        return True
 
     def on_key(self, keys, modifiers):
         """The user pressed a key(s) on the keyboard. Note that this event is
@@ -1553,24 +2127,125 @@ Widget.register_event_type("on_focus")
 Widget.register_event_type("on_text_select")
 
 
-class Image(Widget):
+class WidgetPool:
+    """Pool of widgets of a class that are reused instead of being created
+    and deleted. Creating a widget pushes its handlers, loads its textures and
+    creates its labels, so screens that show and hide many widgets, like
+    notifications or rows of a list, should release them to a pool and acquire
+    them again.
+    """
 
-    def __init__(self, image, x, y, scale=1):
-        """Create an Image widget. This is a simple widget used as the main
-        component in many other widgets. It is not suitable to create vast
-        numbers of these, because you must create a texture every single time.
-        Use this for any sort of Image you are going to draw if you want to
-        draw it efficiently.
+    def __init__(self, widget, *args, **kwargs):
+        """Initialize a widget pool. Widgets are created with the arguments
+        given when the pool is empty.
 
-        image - filepath of the image
-        x - x position of image
-        y - y position of image
-        scale - scale of image. See arcade.sprite.Sprite for details.
+        >>> pool = WidgetPool(Label, " ", 0, 0)
+        >>> toast = pool.acquire(text="Saved", x=200, y=40)
+        >>> pool.release(toast)
+
+        widget - class of the widgets
+        args - arguments of new widgets
+        kwargs - keyword arguments of new widgets
+
+        properties:
+            free - detached widgets that can be acquired
+            size - amount of widgets created by the pool
+
+        parameters: type, tuple, dict
         """
 
-        Widget.__init__(self, image=image, scale=scale)
+        self.widget = widget
+        self.args = args
+        self.kwargs = kwargs
 
-        self.image = image
+        self.free = []
+        self.size = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def reserve(self, amount):
+        """Create detached widgets until there are enough in the pool, so
+        they are not created when the screen is shown.
+
+        amount - amount of free widgets
+
+        parameters: int
+        """
+
+        while len(self.free) < amount:
+            widget = self.widget(*self.args, **self.kwargs)
+            widget.detach()
+
+            self.free.append(widget)
+            self.size += 1
+
+    def acquire(self, **properties):
+        """Get a widget from the pool, or create one if the pool is empty.
+        The widget is reset with the properties given and attached.
+
+        properties - properties to be set, like text, x, and y
+
+        parameters: dict
+        returns: Widget
+        """
+
+        if self.free:
+            widget = self.free.pop()
+            widget.attach()
+        else:
+            widget = self.widget(*self.args, **self.kwargs)
+            self.size += 1
+
+        widget.reset(**properties)
+
+        return widget
+
+    def release(self, widget):
+        """Detach a widget and put it back into the pool. Do not use the
+        widget after releasing it.
+
+        widget - widget to be released
+
+        parameters: Widget
+        """
+
+        if not isinstance(widget, self.widget):
+            raise WidgetsError(f"Widget \"{widget}\" was not created by this "
+                                "pool.")
+
+        widget.detach()
+
+        self.free.append(widget)
+
+    def clear(self):
+        """Destroy all of the free widgets."""
+
+        for widget in self.free:
+            widget.destroy()
+
+        self.size -= len(self.free)
+        self.free.clear()
+
+
+class Image(Widget):
+
+    def __init__(self, image, x, y, scale=1):
+        """Create an Image widget. This is a simple widget used as the main
+        component in many other widgets. It is not suitable to create vast
+        numbers of these, because you must create a texture every single time.
+        Use this for any sort of Image you are going to draw if you want to
+        draw it efficiently.
+
+        image - filepath of the image
+        x - x position of image
+        y - y position of image
+        scale - scale of image. See arcade.sprite.Sprite for details.
+        """
+
+        Widget.__init__(self, image=image, scale=scale)
+
+        self.image = image
 
         self.x = x
         self.y = y
@@ -1639,6 +2314,8 @@ class Label(Widget):
     """Label widget to draw and display HTML text.
     """
 
+    COMPONENTS = ("label",)
+
     UPDATE_RATE = 7
 
     def __init__(self, text, x, y, frame=None,
@@ -1719,10 +2396,12 @@ class Label(Widget):
                                 "value greater than 0. See the documentation "
                                 "for more details.")
 
+        self.text_group = TextGroup()
+
         self.label = HTMLLabel(f"{text}", location, x, y,
                                anchor_x=LEFT, anchor_y=CENTER,
                                width=width, multiline=multiline,
-                               )
+                               group=self.text_group)
 
         Widget.__init__(self, frame=frame)
 
@@ -1839,6 +2518,8 @@ class Label(Widget):
 
     def _get_width(self):
         """Get the content width of the label. This property cannot be set.
+        To get the size of some text without creating a label, use
+        text_measure.measure.
 
         returns: int
         """
@@ -2019,6 +2700,8 @@ class Button(Widget):
     its command, which is a function or callable.
     """
 
+    COMPONENTS = ("image", "label")
+
     keys = []
 
     def __init__(
@@ -2199,6 +2882,8 @@ class Button(Widget):
             self.command()
 
         if self.link:
+            from webbrowser import open_new
+
             open_new(self.link)
 
     def draw(self):
@@ -2309,12 +2994,36 @@ class Slider(Widget):
     https://github.com/eschan145/Armies/issues/20
     """
 
+    COMPONENTS = ("bar", "knob", "label")
+
     _value = 0
     destination = 0
 
+    _last_value = 0 # Value in the last frame
+    _changed_at = 0 # Time the value last changed
+    _committed = 0 # Value of the last on_change event
+    _dispatched_at = 0 # Time of the last on_change event
+    _knob_hover = False # Hover state the knob was last scaled for
+
     def __init__(self, text, x, y, colors=BLACK, font=DEFAULT_FONT,
-                 default=0, size=10, length=200, padding=50, round=0):
-        """Initialize a slider."""
+                 default=0, size=10, length=200, padding=50, round=0,
+                 throttle=0, debounce=0, commit=False):
+        """Initialize a slider. When its value changes, the on_change event
+        is dispatched once per frame at most, with the final value of the
+        frame, so dragging the knob does not dispatch it for every movement.
+
+        >>> slider = Slider("Volume", 200, 200, throttle=0.1)
+        >>> @slider.event
+            def on_change(value):
+                mixer.volume = value
+
+        throttle - minimum time in seconds between on_change events.
+                   Defaults to 0.
+        debounce - time in seconds the value has to stay the same before
+                   on_change is dispatched. Defaults to 0.
+        commit - on_change is only dispatched when the knob is released and
+                 has stopped gliding. Defaults to False.
+        """
 
         self.bar = Image(slider_horizontal, x, y)
         self.knob = Image(knob, x, y)
@@ -2329,9 +3038,14 @@ class Slider(Widget):
         self.length = length
         self.padding = padding
         self.round = round
+        self.throttle = throttle
+        self.debounce = debounce
+        self.commit = commit
 
         self.value = default
 
+        self._last_value = self._committed = self._value
+
         self.x = x
         self.y = y
 
@@ -2412,9 +3126,10 @@ class Slider(Widget):
     y = property(_get_y, _set_y)
 
     def update_knob(self, x):
-        """Update the knob and give it a velocity when moving. When calling
-        this, the knob's position will automatically update so it is congruent
-        with its size.
+        """Update the knob and make it glide to a position. When calling this,
+        the knob's position will automatically update so it is congruent with
+        its size. The knob takes SLIDER_DURATION seconds to glide, whatever
+        the frame rate is.
 
         x - x position of the position
 
@@ -2426,6 +3141,9 @@ class Slider(Widget):
         self._value = round(abs(((self.knob.x - self.left) * self.size) \
                       / (self.left - self.right)), self.round)
 
+        animator.tween(self.knob, "x", self.destination, SLIDER_DURATION,
+                       on_update=self.reposition_knob)
+
     def reposition_knob(self):
         """Update the value of the slider. This is used when you want to move
         the knob without it snapping to a certain position and want to update
@@ -2523,36 +3241,79 @@ class Slider(Widget):
 
         self.value += mouse.y
 
+    def on_change(self, value):
+        """The value of the slider changed. This is dispatched once per frame
+        at most, and less often with throttle, debounce, or commit.
+
+        value - new value of the slider
+
+        parameters: int or float
+        """
+
+    def _check_change(self):
+        """Dispatch the on_change event if the value changed since the last
+        one, and throttle, debounce, and commit allow it.
+        """
+
+        now = perf_counter()
+
+        if self._value != self._last_value:
+            self._last_value = self._value
+            self._changed_at = now
+
+        if self._value == self._committed:
+            return
+
+        if self.commit and (self.press or self.drag or
+                            animator.is_animating(self.knob)):
+            return
+        if self.debounce and now - self._changed_at < self.debounce:
+            return
+        if self.throttle and now - self._dispatched_at < self.throttle:
+            return
+
+        self._committed = self._value
+        self._dispatched_at = now
+
+        self.dispatch_event("on_change", self._value)
+
+    def _needs_update(self):
+        """Check if the slider has to be updated. It is only updated while its
+        value is changing, an on_change event is pending, or the hover state
+        of the knob changed, so an idle slider is not updated every frame.
+
+        returns: bool
+        """
+
+        return self._value != self._committed or \
+               self._value != self._last_value or \
+               self.knob.hover != self._knob_hover
+
     def update(self):
-        """Update the knob. This adjusts its position and adds effects like
-        gliding when the knob is moving. This way, the knob doesn't just snap to
-        position. When the knob is hovered, its scale is increased by
-        KNOB_HOVER_SCALE.
+        """Update the knob. When the knob is hovered, its scale is increased by
+        KNOB_HOVER_SCALE. Gliding is animated by the animator, so it is not
+        done here. The on_change event is dispatched here, so it is dispatched
+        once per frame at most.
         """
-        
-        if self.destination:
-            if self.knob.x <= self.destination and \
-               self.knob.right <= self.right:
-                # Knob too left, moving to the right
-                self.knob.x += SLIDER_VELOCITY
-                self.reposition_knob()
-                
-            if self.knob.right > self.destination and \
-               self.knob.left >= self.left:
-                # Knob too right, moving to the left
-                self.knob.x -= SLIDER_VELOCITY
-                self.reposition_knob()
+
+        self._check_change()
 
         # Knob hover effect
-        if self.knob.hover:
-            self.knob.scale = KNOB_HOVER_SCALE
-        else:
-            self.knob.scale = 1
+        if self.knob.hover != self._knob_hover:
+            self._knob_hover = self.knob.hover
+
+            if self.knob.hover:
+                self.knob.scale = KNOB_HOVER_SCALE
+            else:
+                self.knob.scale = 1
 
         self.bar.update()
         self.knob.update()
 
 
+Slider.register_event_type("on_change")
+
+
 class Toggle(Widget):
     """Toggle widget to switch between true and false values. This uses
     a special effect of fading during the switch.
@@ -2560,15 +3321,21 @@ class Toggle(Widget):
     FIXME: even knob moves when setting x property
     """
 
-    true_image = load_texture(toggle_true)
-    false_image = load_texture(toggle_false)
-    hover_true_image = load_texture(toggle_true_hover)
-    hover_false_image = load_texture(toggle_false_hover)
+    COMPONENTS = ("bar", "knob", "label")
+
+    # Loaded when the first toggle is created
+    true_image = None
+    false_image = None
+    hover_true_image = None
+    hover_false_image = None
 
     on_left = True
     on_right = False
     value = None
     switch = False
+    progress = 0
+
+    _shown = None # State the images were last updated for
 
     def __init__(
                  self, text, x, y,
@@ -2606,6 +3373,12 @@ class Toggle(Widget):
         else:
             image = toggle_false
 
+        if Toggle.true_image is None:
+            Toggle.true_image = load_texture(toggle_true)
+            Toggle.false_image = load_texture(toggle_false)
+            Toggle.hover_true_image = load_texture(toggle_true_hover)
+            Toggle.hover_false_image = load_texture(toggle_false_hover)
+
         if not callback in (SINGLE, DOUBLE, MULTIPLE):
             raise WidgetsError("Invalid callback for toggle. Must be 1, 2, or "
                                "3. Refer to the class documentation for more "
@@ -2701,7 +3474,7 @@ class Toggle(Widget):
         """
 
         if not modifiers & CONTROL:
-            self.switch = True
+            self.invoke()
 
     def on_key(self, keys, modifiers):
         """A key is pressed. This is used for keyboard shortcuts when the toggle
@@ -2716,64 +3489,101 @@ class Toggle(Widget):
 
         if self.focus:
             if keys == SPACE or keys == ENTER:
-                self.switch = True
+                self.invoke()
 
-    def update(self):
-        """Update the toggle. This updates its position and registers its
-        special effects.
+    def invoke(self):
+        """Switch the toggle. The knob glides to the other side while the bar
+        fades, which takes TOGGLE_DURATION seconds. If the toggle is disabled
+        or already switching, this has no effect.
         """
 
+        if self.switch or self.disable:
+            return
+
+        self.switch = True
+        self.progress = 0
+
+        self._knob_start = self.knob.x
+
         if self.on_left:
-            self.value = True
+            self._knob_end = self.bar.right - 2 - self.knob.width / 2
         else:
-            self.value = False
+            self._knob_end = self.bar.left + 2 + self.knob.width / 2
 
-        if self.callback == MULTIPLE:
-            if self.keys[SPACE]:
-                self.switch = True
-                
-        if self.switch and not self.disable:
-            if self.on_left:
-                # Knob on the left, moving towards the right
-                if self.knob.right < self.bar.right - 2:
-                    self.knob.x += TOGGLE_VELOCITY
-                else:
-                    self.on_right = True
-                    self.on_left = False
+        animator.tween(self, "progress", 1, TOGGLE_DURATION,
+                       easing=ease_in_out_quad,
+                       on_update=self._animate_switch,
+                       on_complete=self._finish_switch)
 
-                    self.switch = False
+    def _animate_switch(self):
+        """Move the knob and fade the bar during a switch. The bar fades out
+        until the knob is halfway, then fades in with its new image.
+        """
 
-                if self.knob.x < self.x:
-                    try: self.bar.alpha -= TOGGLE_FADE
-                    except ValueError: pass
-                elif self.knob.x > self.x: # More than halfway
-                    try: self.bar.alpha += TOGGLE_FADE
-                    except ValueError: pass
+        self.knob.x = self._knob_start + \
+                      (self._knob_end - self._knob_start) * self.progress
 
-                    self.bar.texture = self.false_image
-                    if self.hover: self.bar.texture = self.hover_false_image
+        self.bar.alpha = int(255 * abs(1 - 2 * self.progress))
 
-            elif self.on_right:
-                # Knob on the right, moving towards the left
-                if self.knob.left > self.bar.left + 2:
-                    self.knob.x -= TOGGLE_VELOCITY
-                else:
-                    self.on_left = True
-                    self.on_right = False
+        if self.progress < 0.5:
+            return
+
+        if self.on_left:
+            # Knob moving towards the right
+            if self.hover: self.bar.texture = self.hover_false_image
+            else: self.bar.texture = self.false_image
+        else:
+            if self.hover: self.bar.texture = self.hover_true_image
+            else: self.bar.texture = self.true_image
+
+    def _finish_switch(self):
+        """The switch has finished, so the value of the toggle changes."""
+
+        self.on_left, self.on_right = self.on_right, self.on_left
+
+        self.bar.alpha = 255
+        self.switch = False
+
+    def _get_shown(self):
+        """Get the state the images of the toggle depend on.
+
+        returns: tuple
+        """
+
+        return (self.on_left, self.switch, self._state, self.knob.hover)
 
-                    self.switch = False
+    def _needs_update(self):
+        """Check if the toggle has to be updated. Its images are only updated
+        when its state changed, so an idle toggle is not updated every frame.
+        Toggles invoked continuously are always updated, to check the keys.
 
-                if self.knob.x > self.x:
-                    try: self.bar.alpha -= TOGGLE_FADE
-                    except ValueError: pass
-                elif self.knob.x < self.x:
-                    try: self.bar.alpha += TOGGLE_FADE
-                    except ValueError: pass
+        returns: bool
+        """
 
-                    self.bar.texture = self.hover_true_image
-                    if self.hover: self.bar.texture = self.hover_true_image
+        return self.callback == MULTIPLE or self._shown != self._get_shown()
+
+    def update(self):
+        """Update the toggle. This updates its images when its state changed.
+        Switching is animated by the animator, so the knob is not moved here.
+        """
 
+        if self.on_left:
+            self.value = True
         else:
+            self.value = False
+
+        if self.callback == MULTIPLE:
+            if self.keys[SPACE]:
+                self.invoke()
+
+        shown = self._get_shown()
+
+        if shown == self._shown:
+            return
+
+        self._shown = shown
+
+        if not self.switch:
             if self.hover:
                 if self.value: self.bar.texture = self.hover_true_image
                 else: self.bar.texture = self.hover_false_image
@@ -2798,6 +3608,10 @@ class Caret(_Caret):
 
     BLINK_INTERVAL = 0.5
 
+    # Pyglet schedules a blink for every caret. Carets of entries are blinked
+    # by the shared blink_clock instead.
+    PERIOD = 0
+
     def __init__(self, layout):
         """Initalize a caret designed for interactive editing and scrolling of
         large documents and/or text.
@@ -2805,6 +3619,89 @@ class Caret(_Caret):
 
         _Caret.__init__(self, layout)
 
+    WORD_WINDOW = 256 # Characters searched first for word boundaries
+
+    def _next_word(self, position):
+        """Get the start of the next word after a position. Only the text
+        around the position is sliced, and the slice is doubled until a word
+        is found, so the text of a Rope is never joined.
+
+        position - position to search from
+
+        parameters: int
+        returns: int, or None if there is no next word
+        """
+
+        text = self._layout.document.text
+
+        # The pattern looks behind by one character
+        start = max(0, position - 1)
+        size = self.WORD_WINDOW
+
+        while True:
+            end = min(position + size, len(text))
+
+            match = self._next_word_re.search(text[start:end],
+                                              position - start)
+
+            if match:
+                return start + match.start()
+            if end == len(text):
+                return None
+
+            size *= 2
+
+    def _previous_word(self, position):
+        """Get the start of the word before a position. Like _next_word, only
+        the text before the position is sliced.
+
+        position - position to search from
+
+        parameters: int
+        returns: int, or None if there is no previous word
+        """
+
+        text = self._layout.document.text
+
+        size = self.WORD_WINDOW
+
+        while True:
+            start = max(0, position - size)
+
+            match = self._previous_word_re.search(text[start:position])
+
+            if match:
+                return start + match.start()
+            if not start:
+                return None
+
+            size *= 2
+
+    def select_word(self, x, y):
+        """Select the word at the given window coordinate. This is used when
+        the layout is double-clicked.
+
+        x - x position of the word
+        y - y position of the word
+
+        parameters: int, int
+        """
+
+        line = self._layout.get_line_from_point(x, y)
+        position = self._layout.get_position_on_line(line, x)
+
+        start = self._previous_word(position + 1)
+        end = self._next_word(position)
+
+        self.mark = start or 0
+
+        if end is None:
+            end = len(self._layout.document.text)
+
+        self._position = end
+        self._update(line=line)
+        self._next_attributes.clear()
+
     def on_text_motion(self, motion, select=False):
         """The caret was moved or a selection was made with the keyboard.
 
@@ -2864,19 +3761,17 @@ class Caret(_Caret):
         elif motion == MOTION_END_OF_FILE:
             self.position = len(self._layout.document.text)
         elif motion == MOTION_NEXT_WORD:
-            pos = self._position + 1
-            m = self._next_word_re.search(self._layout.document.text, pos)
-            if not m:
+            position = self._next_word(self._position + 1)
+            if position is None:
                 self.position = len(self._layout.document.text)
             else:
-                self.position = m.start()
+                self.position = position
         elif motion == MOTION_PREVIOUS_WORD:
-            pos = self._position
-            m = self._previous_word_re.search(self._layout.document.text, 0, pos)
-            if not m:
+            position = self._previous_word(self._position)
+            if position is None:
                 self.position = 0
             else:
-                self.position = m.start()
+                self.position = position
 
         self._next_attributes.clear()
         self._nudge()
@@ -2916,6 +3811,150 @@ class Caret(_Caret):
         self._layout.ensure_x_visible(x)
 
 
+class BlinkClock:
+    """Clock that blinks the caret of the focused entry. There is only one of
+    these, the blink_clock, so the number of scheduled functions stays the same
+    no matter how many entries are created.
+    """
+
+    def __init__(self, interval=ENTRY_BLINK_INTERVAL):
+        """Initialize a blink clock. You shouldn't usually need to create an
+        instance of this class directly.
+
+        The clock is only scheduled while an entry has focus and the window is
+        active. It can also be advanced manually with tick, which makes the
+        blinking deterministic.
+
+        >>> blink_clock.entry = entry
+        >>> blink_clock.tick(ENTRY_BLINK_INTERVAL)
+        >>> entry.blinking
+        False
+
+        interval - interval in seconds the caret blinks. Defaults to
+                   ENTRY_BLINK_INTERVAL.
+
+        properties:
+            entry - entry the caret is blinked of
+            visible - caret of the entry is visible
+            elapsed - time in seconds since the caret last blinked
+            active - window is active. The clock is paused when it is not.
+            scheduled - clock is scheduled
+
+        parameters: float
+        """
+
+        self.interval = interval
+
+        self.visible = True
+        self.elapsed = 0
+        self.active = True
+        self.scheduled = False
+
+        self._entry = None
+
+    def _get_entry(self):
+        """Get the entry the caret is blinked of.
+
+        returns: Entry
+        """
+
+        return self._entry
+
+    def _set_entry(self, entry):
+        """Set the entry the caret is blinked of. The caret of the previous
+        entry is hidden, and the caret of the new entry is shown.
+
+        entry - entry that has focus, or None
+
+        parameters: Entry
+        """
+
+        if entry is self._entry:
+            return
+
+        if self._entry:
+            self._entry.show_caret(False)
+
+        self._entry = entry
+
+        self.reset()
+        self._schedule()
+
+    entry = property(_get_entry, _set_entry)
+
+    def _schedule(self):
+        """Schedule or unschedule the clock. It only runs while it has an entry
+        and the window is active.
+        """
+
+        running = self._entry is not None and self.active
+
+        if running and not self.scheduled:
+            schedule(self.tick, self.interval)
+        elif not running and self.scheduled:
+            unschedule(self.tick)
+
+        self.scheduled = running
+
+    def reset(self):
+        """Show the caret and restart the blink. This is called when the user
+        types, so the caret stays visible while typing.
+        """
+
+        self.visible = True
+        self.elapsed = 0
+
+        if self._entry:
+            self._entry.show_caret(True)
+
+    def tick(self, delta):
+        """Advance the clock. The caret switches its visibility every interval.
+
+        delta - time in seconds to advance the clock by
+
+        parameters: float
+        """
+
+        if not self._entry or not self.active:
+            return
+
+        self.elapsed += delta
+
+        if self.elapsed < self.interval:
+            return
+
+        # Blinks that were missed during a long frame are skipped
+        if (self.elapsed // self.interval) % 2:
+            self.visible = not self.visible
+
+        self.elapsed %= self.interval
+
+        self._entry.show_caret(self.visible)
+
+    def pause(self):
+        """Pause the clock. This is called when the window is deactivated. The
+        caret is hidden until the clock is resumed.
+        """
+
+        self.active = False
+
+        if self._entry:
+            self._entry.show_caret(False)
+
+        self._schedule()
+
+    def resume(self):
+        """Resume the clock. This is called when the window is activated."""
+
+        self.active = True
+
+        self.reset()
+        self._schedule()
+
+
+blink_clock = BlinkClock()
+
+
 class Entry(Widget):
     """Entry widget to display user-editable text. This makes use of the
     pyglet.text.layout.IncrementalTextLayout and a modified version of its
@@ -2930,7 +3969,7 @@ class Entry(Widget):
     1. Add rich text formatting (use pyglet.text.document.HTMLDocument)
     2. Add show feature for passwords
     3. Add copy, paste, select all, and more text features (COMPLETED)
-    4. Add undo and redo features
+    4. Add undo and redo features (COMPLETED)
     5. Enable updates for the layout for smoother performance. This raises
        AssertionError, one that has been seen before.
     6. Finish up scrolling of history. This is incomplete, and if text is
@@ -2941,32 +3980,36 @@ class Entry(Widget):
     Last updated: August 4th 2022
     """
 
+    COMPONENTS = ("image", "layout")
+
     blinking = True
     length = 0
     max = MAX
-    _validate = printable
+    _validate = VALIDATION_PRINTABLE
     _document = None
     _placeholder = None
-
-    undo_stack = []
-    redo_stack = []
-
-    # Validations
-    VALIDATION_LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
-    VALIDATION_UPPERCASE = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    VALIDATION_LETTERS = VALIDATION_LOWERCASE + VALIDATION_UPPERCASE
-    VALIDATION_DIGITS = "1234567890"
-    VALIDATION_ADVANCED_DIGITS = "1234567890.+-*/^<>[]{}()!|"
-    VALIDATION_PUNCTUATION = r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""
-    VALIDATION_WHITESPACE = " \t\n\r\v\f"
-    VALIDATION_REGULAR = None
+    _paste = None
+    _finder = None
+
+    highlighter = None
+
+    # Validations (compiled, see the validator module)
+    VALIDATION_LOWERCASE = VALIDATION_LOWERCASE
+    VALIDATION_UPPERCASE = VALIDATION_UPPERCASE
+    VALIDATION_LETTERS = VALIDATION_LETTERS
+    VALIDATION_DIGITS = VALIDATION_DIGITS
+    VALIDATION_ADVANCED_DIGITS = VALIDATION_ADVANCED_DIGITS
+    VALIDATION_PUNCTUATION = VALIDATION_PUNCTUATION
+    VALIDATION_WHITESPACE = VALIDATION_WHITESPACE
+    VALIDATION_PRINTABLE = VALIDATION_PRINTABLE
+    VALIDATION_REGULAR = VALIDATION_REGULAR
 
     def __init__(self, x, y, text="", font=default_font, color=BLACK,
                  history=True):
 
         """Initialize the entry. Typically a widget will push events
-        automatically, but because there are custom named events, they have
-        to be defined here.
+        automatically. Text input (on_text and on_text_motion) is not pushed,
+        as the container delivers it to the focused entry only.
 
         An entry is a widget where text input can be returned. Typing into
         an entry appends some text, which can be used for usernames,
@@ -2985,8 +4028,13 @@ class Entry(Widget):
         properties:
             document - document of the IncrementalTextLayout
             layout - internal IncrementalTextLayout for efficient rendering
+            layout_updates - number of times the layout was moved. This stays
+                             the same on idle frames.
             caret - caret of the entry
             image - image displayed to give the entry a graphical look
+            undo_manager - undo and redo history of the entry
+            highlighter - highlighter of the entry, if it is highlighted
+            finder - find and replace of the entry
 
             x - x position of the entry
             y - y position of the entry
@@ -3001,50 +4049,72 @@ class Entry(Widget):
             text - displayed text of the entry
             selection - selected text of the entry
             layout_colors - layout colors of the entry
-            validate - validation of the characters in the entry
+            validate - validator of the text typed or pasted into the entry
             index - index of the caret (position)
             view - view vector of the entry
 
         methods:
             blink - blink the caret and switch its visibility
+            show_caret - show or hide the caret
             insert - insert some text in the entry
             delete - delete some text from the entry
+            undo - undo the last edit of the entry
+            redo - redo the last undone edit of the entry
+            highlight - highlight the text of the entry with a lexer
         """
 
-        self._document = decode_text(text)
+        self._document = RopeDocument(text)
+
+        self.text_group = TextGroup()
+        self.layout = IncrementalTextLayout(self._document, 190, 24,
+                                            batch=get_batch(),
+                                            group=self.text_group)
+
+        # Anchors are applied once. Setting them relayouts all of the text, so
+        # afterwards the layout is only moved when the entry is moved.
+
+        self.layout.begin_update()
+
+        self.layout.anchor_x = LEFT
+        self.layout.anchor_y = CENTER
 
-        self.layout = IncrementalTextLayout(self._document, 190, 24, batch=batch)
+        self.layout.end_update()
 
         self.image = Image(entry_normal, x, y)
         self.caret = Caret(self.layout)
 
         Widget.__init__(self)
 
+        self.layout_updates = 0
+
+        self.show_caret(False)
+
         self.x = x
         self.y = y
         self.font = font
         self.default = text
 
-        self.layout.anchor_x = LEFT
-        self.layout.anchor_y = CENTER
-
         self.history = []
         self._history_index = 0
         self._history_enabled = history
 
-        self._document.set_style(0, len(text), dict(font_name=DEFAULT_FONT[0],
-                                                    font_size=DEFAULT_FONT[1],
-                                                    color=four_byte(color)))
+        self.undo_manager = UndoManager(self._document)
 
-        self.window.push_handlers(
-            self.on_text,
-            self.on_text_motion
-        )
+        self._style = dict(font_name=DEFAULT_FONT[0],
+                           font_size=DEFAULT_FONT[1],
+                           color=four_byte(color))
+
+        self._document.set_style(0, len(text), self._style)
+
+        # Text input is delivered by the container to the focused entry, so
+        # no handlers are pushed to the window.
 
     def _get_document(self):
-        """Get the current document of the entry.
+        """Get the current document of the entry. This is a RopeDocument, so
+        inserting and deleting text takes O(log n) time, even with megabytes of
+        text.
 
-        returns: pyglet.text.document.UnformattedDocument
+        returns: RopeDocument
         """
 
         return self.layout.document
@@ -3062,12 +4132,14 @@ class Entry(Widget):
         self.layout.document = document
 
     def _get_text(self):
-        """Return the text of the entry.
+        """Return the text of the entry. The document stores its text in a
+        Rope, so this joins the text, which is cached until it is edited. Use
+        len(entry.document.text) to get its length without joining it.
 
         returns: str
         """
 
-        return self.document.text
+        return str(self.document.text)
 
     def _set_text(self, text):
         """Set the text of the entry.
@@ -3112,9 +4184,10 @@ class Entry(Widget):
         parameters: int
         """
 
-        self.layout.x = x - self.layout.width / 2
         self.image.x = x
 
+        self._position_layout()
+
     def _get_y(self):
         """Get the y position of the entry.
 
@@ -3131,9 +4204,10 @@ class Entry(Widget):
         parameters: int
         """
 
-        self.layout.y = y - 5
         self.image.y = y
 
+        self._position_layout()
+
     def _get_index(self):
         """Return the index of the current caret position within the
         document.
@@ -3191,7 +4265,7 @@ class Entry(Widget):
         return (
                 self.layout.selection_start,
                 self.layout.selection_end,
-                self.text[
+                self.document.text[
                     self.layout.selection_start : self.layout.selection_end
                 ]
                )
@@ -3244,22 +4318,43 @@ class Entry(Widget):
     def _get_validate(self):
         """Get the validation of the entry.
 
-        returns: str
+        returns: Validator
         """
 
         return self._validate
 
     def _set_validate(self, validate):
-        """Set the validation of the entry. This is a string containing all
-        of the characters the user is able to type. Common charsets cam be
-        found in the string module.
+        """Set the validation of the entry. This can be a string containing
+        all of the characters the user is able to type, which is compiled into
+        a CharsetValidator once, or a Validator from the validator module, like
+        a RegexValidator or a RangeValidator. Common charsets can be found in
+        the VALIDATION_* constants.
 
-        validate - validation to set
+        >>> entry.validate = Entry.VALIDATION_DIGITS
+        >>> entry.validate = RangeValidator(0, 255, integer=True)
 
-        parameters: str
+        validate - validation to set. If None, any text can be typed.
+
+        parameters: str or Validator
+        """
+
+        self._validate = compile_validator(validate)
+
+    def _get_finder(self):
+        """Get the finder of the entry, used to find and replace text. It is
+        created the first time it is used, and keeps a search index of the
+        document that is updated as the text is edited.
+
+        >>> entry.finder.search("error")
+        >>> entry.finder.next()
+
+        returns: Finder
         """
 
-        self._validate = validate
+        if self._finder is None:
+            self._finder = Finder(self.layout)
+
+        return self._finder
 
     def _get_placeholder(self):
         """Get the placeholder text of the entry.
@@ -3313,29 +4408,81 @@ class Entry(Widget):
     layout_colors = property(_get_layout_colors, _set_layout_colors)
     validate = property(_get_validate, _set_validate)
     placeholder = property(_get_placeholder, _set_placeholder)
+    finder = property(_get_finder)
     view = property(_get_view, _set_view)
 
-    def blink(self, delta):
-        """The caret toggles between white and black colors. This is called
-        every 0.5 seconds, and only when the caret has focus.
+    def _position_layout(self):
+        """Move the layout to the position of the entry. Moving an incremental
+        layout reinitializes its document, so this is only done when the
+        position actually changed, and x and y are applied together. The
+        layout_updates property counts how many times the layout was moved.
+        """
 
-        delta - delta time in seconds since the function was last called.
-                This varies about 0.5 seconds give or take, because of
-                calling delay, lags, and other inefficiencies.
+        x = self.image.x - self.layout.width / 2
+        y = self.image.y - 5
 
-        parameters: float
+        if self.layout.x == x and self.layout.y == y:
+            return
+
+        self.layout.position = (x, y)
+
+        self.layout_updates += 1
+
+    def highlight(self, lexer, styles):
+        """Highlight the text of the entry, for example JSON. The document is
+        replaced with a FormattedRopeDocument the first time, which clears the
+        undo history. Afterwards, only the edited lines are highlighted again.
+
+        >>> entry.highlight(JSON_LEXER, JSON_STYLES)
+
+        lexer - lexer used to tokenize the text, found in the highlight module
+        styles - map of tokens to their style attributes
+
+        parameters: Lexer, dict
         """
 
-        if not self.caret._list.colors[3] or \
-            not self.caret._list.colors[7]:
-            alpha = 255
+        if self.highlighter is None:
+            self._document = FormattedRopeDocument(self.text)
+            self._document.set_style(0, len(self._document.text), self._style)
+
+            self.layout.document = self._document
+
+            self.undo_manager = UndoManager(self._document)
+
+            if self._finder:
+                self._finder.delete()
+                self._finder = None
         else:
-            alpha = 0
+            self.highlighter.delete()
+
+        self.highlighter = Highlighter(self._document, lexer, styles,
+                                       self._style)
+
+    def show_caret(self, visible):
+        """Show or hide the caret. This is called by the blink_clock.
+
+        visible - caret is visible
+
+        parameters: bool
+        """
+
+        self.blinking = visible
+
+        self.caret.visible = visible
+
+    def blink(self, delta):
+        """The caret toggles its visibility. The caret of the focused entry is
+        blinked by the shared blink_clock, so this is no longer scheduled for
+        each entry.
+
+        delta - delta time in seconds since the function was last called
 
-        self.caret._list.colors[3] = alpha
-        self.caret._list.colors[7] = alpha
+        parameters: float
+        """
 
-    def insert(self, index, text, change_index=True):
+        self.show_caret(not self.blinking)
+
+    def insert(self, index, text, change_index=True, validate=True):
         """Insert some text at a given index one character after the index.
 
         >>> entry.text = "Hello!"
@@ -3352,13 +4499,21 @@ class Entry(Widget):
         change_index - index is updated to the end of the addition. This value
                        usually just needs to be left where it is. Defaults to
                        True.
+        validate - the text is validated by the validate property first. All
+                   of the text is checked in a single pass, so pasting is as
+                   fast as typing. Defaults to True.
 
-        parameters: int, str, bool
+        parameters: int, str, bool, bool
         """
 
-        # self.text = insert(index, self.text, text)
+        if validate and self.validate:
+            text = self.validate.validate(text, self.document.text,
+                                          index, index)
+
+            if not text:
+                return
 
-        self.document._insert_text(index, text, None)
+        self.document.insert_text(index, text)
 
         if change_index:
             self.index = self.index + len(text)
@@ -3382,9 +4537,29 @@ class Entry(Widget):
         parameters: int, int
         """
 
-        # self.text = delete(start, end, self.text)
+        self.document.delete_text(start, end)
+
+    def undo(self):
+        """Undo the last edit of the entry. Consecutive typing is undone as a
+        single step. The caret is moved to where the edit was.
+        """
+
+        index = self.undo_manager.undo()
 
-        self.document._delete_text(start, end)
+        if index is not None:
+            self.mark = None
+            self.index = index
+
+    def redo(self):
+        """Redo the last undone edit of the entry. The caret is moved to where
+        the edit was.
+        """
+
+        index = self.undo_manager.redo()
+
+        if index is not None:
+            self.mark = None
+            self.index = index
 
     def clear(self, text=False, mark=0, index=0):
         """Clear the text in the entry and remove all of its caret properties.
@@ -3401,24 +4576,35 @@ class Entry(Widget):
         self.mark = mark
         self.index = index
 
+    def detach(self):
+        """Detach the entry. Its caret is hidden and stops blinking."""
+
+        Widget.detach(self)
+
+        if blink_clock.entry is self:
+            blink_clock.entry = None
+
+        self.caret.visible = False
+
+    def destroy(self):
+        """Delete the entry, its caret, and its components for good."""
+
+        self.detach()
+        self.caret.delete()
+
+        Widget.destroy(self)
+
     def draw(self):
         """Draw the entry. The layout is drawn with pyglet rendering.
 
         1. Image component
         2. Layout
 
-        FIXME: there is a bug here. The anchor_x and anchor_y properties of the
-               layout have to be set again and again. This makes performance
-               deadly slow.
+        The layout's anchors are applied once when the entry is created, and
+        its position only when the entry is moved, so nothing is relayouted on
+        idle frames. See layout_updates.
         """
 
-        self.layout.begin_update()
-
-        self.layout.anchor_x = LEFT
-        self.layout.anchor_y = CENTER
-
-        self.layout.end_update()
-
         self.component = self.image
 
     def on_key(self, keys, modifiers):
@@ -3430,6 +4616,9 @@ class Entry(Widget):
         Control + X     Cut the selected text and add it to the clipboard. This
                         is essentially copying and deleting text, useful for
                         moving incorrectly placed text.
+        Control + Z     Undo the last edit
+        Control + Y     Redo the last undone edit. Control + Shift + Z can
+                        also be used.
 
         If history is enabled, the user can hold Alt and press Left and Right
         to scroll back history.
@@ -3440,15 +4629,18 @@ class Entry(Widget):
         parameters: int (32-bit), int (32-bit)
         """
 
-        if keys == SPACE:
-            self.undo_stack.append(self.text)
-
-        if modifiers & CONTROL:
-            if keys == V:
-                self.insert(self.index, clipboard_get(), change_index=True)
+        # Every entry receives the key, so only the focused one handles it
+        if modifiers & CONTROL and self.focus:
+            if keys == KEY_Z and modifiers & SHIFT or keys == KEY_Y:
+                self.redo()
+            elif keys == KEY_Z:
+                self.undo()
+            elif keys == V:
+                # The text is inserted in update when it has been read
+                self._paste = clipboard.get_async()
             elif keys == C:
                 clipboard_append(self.selection[2])
-            if keys == X:
+            elif keys == X:
                 clipboard_append(self.selection[2])
                 self.caret._delete_selection()
             elif keys == A:
@@ -3487,7 +4679,7 @@ class Entry(Widget):
         and stops a few errors.
         """
 
-        if self.text == self.default:
+        if self.document.text == self.default:
             self.clear()
 
     def on_text(self, text):
@@ -3503,16 +4695,26 @@ class Entry(Widget):
         parameters: str
         """
 
-        if self.focus and \
-            self.length < self.max:
-            if self.validate:
-                if text in self.validate:
-                    self.caret.on_text(text)
+        if not self.focus or \
+            not self.length < self.max:
+            return
+
+        if self.validate:
+            start, end = self.caret.position, self.caret.position
+
+            if self.caret.mark is not None:
+                start = min(self.caret.mark, self.caret.position)
+                end = max(self.caret.mark, self.caret.position)
 
-                    return
+            text = self.validate.validate(text, self.document.text, start, end)
+
+            if not text:
+                return
 
         self.caret.on_text(text)
 
+        blink_clock.reset()
+
     def on_text_motion(self, motion):
         """The entry has caret motion. This can be moving the caret's
         position to the left with the Left key, deleting a character
@@ -3524,67 +4726,1294 @@ class Entry(Widget):
         motion - motion used by the user. This can be one of many motions,
                  defined by keyboard constants found in the keyboard module.
 
-                 MOTION_LEFT                MOTION_RIGHT
-                 MOTION_UP                  MOTION_DOWN
-                 MOTION_NEXT_WORD           MOTION_PREVIOUS_WORD
-                 MOTION_BEGINNING_OF_LINE   MOTION_END_OF_LINE
-                 MOTION_NEXT_PAGE           MOTION_PREVIOUS_PAGE
-                 MOTION_BEGINNING_OF_FILE   MOTION_END_OF_FILE
-                 MOTION_BACKSPACE           MOTION_DELETE
-                 MOTION_COPY                MOTION_PASTE
+                 MOTION_LEFT                MOTION_RIGHT
+                 MOTION_UP                  MOTION_DOWN
+                 MOTION_NEXT_WORD           MOTION_PREVIOUS_WORD
+                 MOTION_BEGINNING_OF_LINE   MOTION_END_OF_LINE
+                 MOTION_NEXT_PAGE           MOTION_PREVIOUS_PAGE
+                 MOTION_BEGINNING_OF_FILE   MOTION_END_OF_FILE
+                 MOTION_BACKSPACE           MOTION_DELETE
+                 MOTION_COPY                MOTION_PASTE
+
+                 You can get the list of all text motions with motions_string()
+                 in the keyboard module. You can also get their keyboard
+                 combinations with motions_combinations().
+
+        parameters: int (32-bit)
+        """
+
+        if not self.focus:
+            return
+
+        if self.keys[ALT]:
+            if motion == MOTION_LEFT or \
+                motion == MOTION_RIGHT:
+                return
+
+        if not motion == MOTION_BACKSPACE and \
+            not motion == MOTION_DELETE:
+            # Moving the caret starts a new undo step
+            self.undo_manager.separate()
+
+        self.caret.on_text_motion(motion)
+
+        blink_clock.reset()
+
+    def on_text_select(self, motion):
+        """Some text in the entry is selected. When this happens, the
+        selected text will have a blue background to it. Moving the caret
+        with a text motion removes the selection (does not remove the text).
+
+        NOTE: this is not called with caret mouse selections. See on_press.
+
+        motion - motion used by the user. These can be made with the user.
+
+                 SHIFT + LEFT               SHIFT + RIGHT
+                 SHIFT + UP                 SHIFT + DOWN
+                 CONTROL + SHIFT + LEFT     CONTROL + SHIFT + RIGHT
+
+        parameters: int (32-bit)
+        """
+
+        if not self.focus:
+            return
+
+        self.caret.on_text_motion_select(motion)
+
+    def on_press(self, x, y, buttons, modifiers):
+        """The entry is pressed. This will do a number of things.
+
+            - The caret's position is set to the nearest character.
+            - The history will add the caret's position.
+            - If text is selected, the selection will be removed.
+            - If the Shift key is being held, a selection will be created
+              between the current caret index and the closest character to
+              the mouse.
+            - If two clicks are made within 0.5 seconds (double-click), the
+              current word is selected.
+            - If three clicks are made within 0.5 seconds (triple-click), the
+              current paragraph is selected.
+            - If there is a placeholder text, the text is removed.
+
+        x - x position of the press
+        y - y position of the press
+        buttons - buttons that were pressed with the mouse
+        modifiers - modifiers being held down
+
+        parameters: int, int, int (32-bit), int (32-bit)
+        """
+
+        _x, _y = x - self.layout.x, y - self.layout.y
+
+        if self.document.text == self.placeholder:
+            self.text = None
+
+        index_before = self.index
+
+        self.caret.on_mouse_press(x, y, buttons, modifiers)
+
+        index_after = self.index
+
+        self.mark = None
+
+        self.undo_manager.separate()
+
+        if index_before is not index_after:
+            # Add history
+            self.history.append(index_after)
+
+        if self.keys[SHIFT]:
+            indices = sorted((index_before, index_after))
+
+            self.selection = indices
+            self.mark = max(index_before, index_after)
+
+
+    def on_drag(self, x, y, dx, dy, buttons, modifiers):
+        """The user dragged the mouse when it was pressed. This can create
+        selections on entries and move the knob in sliders.
+
+        x - x position of the current position
+        y - y position of the current position
+        dx - movement in x vector from the last position
+        dy - movement in y vector from the last position
+
+        buttons - buttons that were dragged with the mouse
+        modifiers - modifiers being held down
+
+        parameters: int, int, float, float, int (32-bit), int (32-bit)
+        """
+
+        _x, _y = x - self.layout.x, y - self.layout.y
+
+        if self.press:
+            self.caret.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+
+            self.index = self.caret.position
+        else:
+            if self.focus:
+                self.caret.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+
+                self.index = self.caret.position
+
+    def update(self):
+        """Update the caret and entry. This inserts pasted text when it has
+        been read from the clipboard, hands the entry to the blink_clock when
+        it gains focus, and keeps track of focus.
+        """
+
+        if self._paste is not None and self._paste.done():
+            text = self._paste.result()
+
+            self._paste = None
+
+            self.insert(self.index, text, change_index=True)
+
+        if self.highlighter:
+            self.highlighter.flush()
+
+        if not self.length == len(self.document.text):
+            self.length = len(self.document.text)
+
+        if self.focus:
+            blink_clock.entry = self
+
+            return
+
+        if blink_clock.entry is self:
+            blink_clock.entry = None
+
+        if self.index or self.mark is not None:
+            self.index = 0
+            self.mark = None
+
+
+class TextArea(Widget):
+    """Multiline text area to display large amounts of text, like logs. This
+    makes use of the pyglet.text.layout.IncrementalTextLayout, so only the
+    lines inside of its view are laid out, and the existing Caret for
+    selecting text.
+
+    Unlike a multiline Label, changing the text does not relayout the whole
+    document. Lines are added with append, which only collects them. They are
+    inserted into the document together once per frame, so a console receiving
+    thousands of lines per second only changes its document once a frame.
+
+    Only the latest max_lines lines are kept. When more lines are added, the
+    oldest ones are removed from the start of the document, like a ring
+    buffer.
+    """
+
+    COMPONENTS = ("layout",)
+
+    highlighter = None
+
+    _finder = None
+
+    def __init__(self, x, y, width=400, height=300, text="",
+                 font=DEFAULT_FONT, color=BLACK, max_lines=10000,
+                 autoscroll=True):
+
+        """Initialize a text area.
+
+        >>> console = TextArea(300, 200, max_lines=5000)
+        >>> for i in range(1000):
+                console.append(f"Line {i}")
+        >>> console.lines # Lines are added on the next frame
+        0
+
+        x - x position of the text area
+        y - y position of the text area
+        width - width of the text area
+        height - height of the text area
+        text - default text of the text area
+        font - font of the text in the text area
+        color - color of the text in RGB as a tuple of three ints
+        max_lines - maximum amount of lines kept. When exceeded, the oldest
+                    lines are removed. Defaults to 10000.
+        autoscroll - the text area scrolls to the bottom when lines are
+                     added. Scrolling up with the mouse pauses this until the
+                     text area is scrolled to the bottom again. Defaults to
+                     True.
+
+        properties:
+            document - document of the IncrementalTextLayout
+            layout - internal IncrementalTextLayout for efficient rendering
+            caret - caret of the text area, used for selecting text
+            highlighter - highlighter of the text area, if it is highlighted
+            finder - find and replace of the text area
+
+            x - x position of the text area
+            y - y position of the text area
+
+            text - text of the text area
+            lines - amount of lines in the text area
+            max_lines - maximum amount of lines kept
+            autoscroll - text area scrolls to the bottom when lines are added
+            following - text area is scrolled to the bottom
+            selection - selected text of the text area
+            view - view vector of the text area
+
+        methods:
+            append - add some lines to the end of the text area
+            flush - add the lines collected by append to the document
+            clear - remove all of the text
+            scroll_to_end - scroll to the bottom of the text area
+            highlight - highlight the text of the text area with a lexer
+        """
+
+        self._document = RopeDocument(text)
+
+        self.text_group = TextGroup()
+        self.layout = IncrementalTextLayout(self._document, width, height,
+                                            multiline=True, batch=get_batch(),
+                                            group=self.text_group)
+
+        self.layout.begin_update()
+
+        self.layout.anchor_x = LEFT
+        self.layout.anchor_y = CENTER
+
+        self.layout.end_update()
+
+        self.caret = Caret(self.layout)
+        self.caret.visible = False
+
+        self._x = x
+        self._y = y
+
+        Widget.__init__(self)
+
+        self.max_lines = max_lines
+        self.autoscroll = autoscroll
+        self.following = True
+
+        # Length of each line, oldest first
+        self._lines = deque(len(line) for line in text.split("\n")) \
+                      if text else deque()
+        self._pending = []
+
+        self._style = dict(font_name=font[0],
+                           font_size=font[1],
+                           color=four_byte(color))
+
+        self._document.set_style(0, len(text), self._style)
+
+        self._position_layout()
+
+    def _get_text(self):
+        """Get the text of the text area. Lines that were appended this frame
+        are not included until they are flushed.
+
+        returns: str
+        """
+
+        return str(self._document.text)
+
+    def _set_text(self, text):
+        """Set the text of the text area. This removes all of the lines.
+
+        text - new text of the text area
+
+        parameters: str
+        """
+
+        self.clear()
+        self.append(text)
+        self.flush()
+
+    def _get_x(self):
+        """Get the x position of the text area.
+
+        returns: int
+        """
+
+        return self._x
+
+    def _set_x(self, x):
+        """Set the x position of the text area.
+
+        x - new x position of the text area
+
+        parameters: int
+        """
+
+        self._x = x
+
+        self._position_layout()
+
+    def _get_y(self):
+        """Get the y position of the text area.
+
+        returns: int
+        """
+
+        return self._y
+
+    def _set_y(self, y):
+        """Set the y position of the text area.
+
+        y - new y position of the text area
+
+        parameters: int
+        """
+
+        self._y = y
+
+        self._position_layout()
+
+    def _get_document(self):
+        """Get the document of the text area. This is a RopeDocument, so
+        removing the oldest lines does not copy the whole text.
+
+        returns: RopeDocument
+        """
+
+        return self._document
+
+    def _get_lines(self):
+        """Get the amount of lines in the text area.
+
+        returns: int
+        """
+
+        return len(self._lines)
+
+    def _get_finder(self):
+        """Get the finder of the text area, used to find and replace text. It is
+        created the first time it is used, and keeps a search index of the
+        document that is updated as the text is edited.
+
+        >>> console.finder.search("error")
+        >>> console.finder.next()
+
+        returns: Finder
+        """
+
+        if self._finder is None:
+            self._finder = Finder(self.layout)
+
+        return self._finder
+
+    def _get_selection(self):
+        """Get the selected text of the text area.
+
+        returns: tuple (start, end, text)
+        """
+
+        start = self.layout.selection_start
+        end = self.layout.selection_end
+
+        return (start, end, self._document.text[start:end])
+
+    def _get_view(self):
+        """Get the view vector of the text area.
+
+        returns: tuple (x, y)
+        """
+
+        return (
+                self.layout.view_x,
+                self.layout.view_y
+        )
+
+    def _set_view(self, view):
+        """Set the view vector of the text area.
+
+        view - vector of x and y views as a Point
+
+        parameters: Point
+        """
+
+        self.layout.view_x = view.x
+        self.layout.view_y = view.y
+
+        self.following = self._at_end()
+
+    text = property(_get_text, _set_text)
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+    document = property(_get_document)
+    lines = property(_get_lines)
+    selection = property(_get_selection)
+    finder = property(_get_finder)
+    view = property(_get_view, _set_view)
+
+    def _position_layout(self):
+        """Move the layout to the position of the text area, and update its
+        hit box. Moving an incremental layout reinitializes its document, so
+        this is only done when the position is changed.
+        """
+
+        self.layout.position = (self._x - self.layout.width / 2, self._y)
+
+        self._left = self._x - self.layout.width / 2
+        self._right = self._x + self.layout.width / 2
+        self._top = self._y + self.layout.height / 2
+        self._bottom = self._y - self.layout.height / 2
+
+    def _at_end(self):
+        """Check if the text area is scrolled to the bottom.
+
+        returns: bool
+        """
+
+        return self.layout.view_y <= \
+               self.layout.height - self.layout.content_height
+
+    def append(self, text):
+        """Add some lines to the end of the text area. The lines are collected
+        and added to the document once per frame, in update. Text containing
+        newlines is added as multiple lines.
+
+        >>> console.append("Loading textures...")
+
+        text - line or lines to be added
+
+        parameters: str
+        """
+
+        self._pending.append(text)
+
+    def flush(self):
+        """Add the lines collected by append to the document, and remove the
+        oldest lines if there are more than max_lines. The document is only
+        relayouted once, no matter how many lines were appended. This is called
+        every frame, but can be called manually to add the lines immediately.
+        """
+
+        if not self._pending:
+            return
+
+        lines = "\n".join(self._pending).split("\n")
+
+        self._pending.clear()
+
+        following = self.autoscroll and self.following
+
+        # The caret scrolls itself into view when the document changes, so the
+        # view is restored if it is not following the end
+        view_y = self.layout.view_y
+
+        self.layout.begin_update()
+
+        if len(lines) >= self.max_lines:
+            # The new lines replace all of the old ones
+            lines = lines[-self.max_lines:]
+
+            self._document.delete_text(0, len(self._document.text))
+            self._lines.clear()
+
+        text = "\n".join(lines)
+
+        if self._lines:
+            text = "\n" + text
+
+        self._document.insert_text(len(self._document.text), text)
+        self._lines.extend(len(line) for line in lines)
+
+        removed = 0
+
+        while len(self._lines) > self.max_lines:
+            removed += self._lines.popleft() + 1
+
+        if removed:
+            self._document.delete_text(0, removed)
+
+            self.caret.mark = None
+            self.caret.position = max(0, self.caret.position - removed)
+
+        self.layout.end_update()
+
+        if following:
+            self.scroll_to_end()
+        else:
+            self.layout.view_y = view_y
+
+    def clear(self):
+        """Remove all of the text, including the lines that were not flushed
+        yet.
+        """
+
+        self._pending.clear()
+
+        self.caret.mark = None
+        self.caret.position = 0
+
+        self._document.delete_text(0, len(self._document.text))
+        self._lines.clear()
+
+    def highlight(self, lexer, styles):
+        """Highlight the text of the text area, for example log levels. The
+        document is replaced with a FormattedRopeDocument the first time.
+        Afterwards, only the lines that are added or removed are highlighted.
+
+        >>> console.highlight(LOG_LEXER, LOG_STYLES)
+
+        lexer - lexer used to tokenize the text, found in the highlight module
+        styles - map of tokens to their style attributes
+
+        parameters: Lexer, dict
+        """
+
+        if self.highlighter is None:
+            self.flush()
+
+            self._document = FormattedRopeDocument(self.text)
+            self._document.set_style(0, len(self._document.text), self._style)
+
+            self.layout.document = self._document
+
+            if self._finder:
+                self._finder.delete()
+                self._finder = None
+        else:
+            self.highlighter.delete()
+
+        self.highlighter = Highlighter(self._document, lexer, styles,
+                                       self._style)
+
+    def scroll_to_end(self):
+        """Scroll to the bottom of the text area. The view is clamped by the
+        layout, so this scrolls to the last line.
+        """
+
+        self.layout.view_y = -self.layout.content_height
+
+        self.following = True
+
+    def on_scroll(self, x, y, scroll):
+        """The text area is scrolled with the mouse. Scrolling up pauses
+        autoscroll, until the text area is scrolled to the bottom again.
+
+        x - x position of the mouse
+        y - y position of the mouse
+        scroll - scroll vector
+
+        parameters: int, int, Point
+        """
+
+        self.layout.view_y += scroll.y * TEXTAREA_SCROLL_SPEED
+
+        self.following = self._at_end()
+
+    def on_press(self, x, y, buttons, modifiers):
+        """The text area is pressed. This moves the caret to the nearest
+        character, so text can be selected by dragging.
+
+        x - x position of the press
+        y - y position of the press
+        buttons - buttons that were pressed with the mouse
+        modifiers - modifiers being held down
+
+        parameters: int, int, int (32-bit), int (32-bit)
+        """
+
+        self.caret.on_mouse_press(x, y, buttons, modifiers)
+
+    def on_drag(self, x, y, dx, dy, buttons, modifiers):
+        """The user dragged the mouse when it was pressed. This selects some
+        text.
+
+        x - x position of the current position
+        y - y position of the current position
+        dx - movement in x vector from the last position
+        dy - movement in y vector from the last position
+        buttons - buttons that were dragged with the mouse
+        modifiers - modifiers being held down
+
+        parameters: int, int, float, float, int (32-bit), int (32-bit)
+        """
+
+        if self.press:
+            self.caret.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+
+    def on_key(self, keys, modifiers):
+        """A key is pressed. This is used for keyboard shortcuts.
+
+        Control + A     Select all of the text
+        Control + C     Copy the selected text and add it to the clipboard
+
+        keys - key pressed
+        modifiers - modifier pressed
+
+        parameters: int (32-bit), int (32-bit)
+        """
+
+        if not self.focus or not modifiers & CONTROL:
+            return
+
+        if keys == C:
+            clipboard_append(self.selection[2])
+        elif keys == A:
+            self.caret.position = len(self._document.text)
+            self.caret.mark = 0
+
+    def on_text_motion(self, motion):
+        """The caret is moved with the keyboard. The text area cannot be
+        edited, so deleting motions are ignored.
+
+        motion - motion used by the user
+
+        parameters: int (32-bit)
+        """
+
+        if motion == MOTION_BACKSPACE or \
+            motion == MOTION_DELETE:
+            return
+
+        self.caret.on_text_motion(motion)
+
+        self.following = self._at_end()
+
+    def on_text_motion_select(self, motion):
+        """Some text is selected with the keyboard.
+
+        motion - motion used by the user
+
+        parameters: int (32-bit)
+        """
+
+        self.caret.on_text_motion_select(motion)
+
+    def destroy(self):
+        """Delete the text area, its caret, and its layout for good."""
+
+        self.caret.delete()
+
+        Widget.destroy(self)
+
+    def update(self):
+        """Update the text area. This adds the lines appended during the
+        frame, and highlights them.
+        """
+
+        self.flush()
+
+        if self.highlighter:
+            self.highlighter.flush()
+
+
+class Combobox(Widget, EventDispatcher):
+
+    COMPONENTS = ("entry", "button", "rows")
+
+    _display = []
+    _view = 0
+    displayed = False
+    last_text = None
+    scroller = None
+
+    def __init__(self, x, y, options, color="yellow", default=0, fuzzy=False):
+
+        """Initialize a combobox. The options are indexed once, so filtering
+        them while the user types does not look at every option.
+
+        Options that are not in a list, like a large catalog on disk, can be
+        given with an OptionProvider or a function returning a generator of
+        them. Only the displayed options are fetched, with a small read-ahead
+        cache, so the memory used does not grow with the amount of options.
+
+        >>> combobox = Combobox(100, 200, CatalogProvider("catalog.db"))
+
+        x - x position of the combobox
+        y - y position of the combobox
+        options - list of options as strings, OptionProvider, or function
+                  returning an iterator of the options
+        color - color of the combobox button. Defaults to "yellow".
+        default - index of the default option. Defaults to 0.
+        fuzzy - options with typos are also shown, ranked by how similar they
+                are to the text. Defaults to False.
+
+        The rows of the dropdown are created once, and are rebound to other
+        options when the combobox is filtered or scrolled.
+
+        properties:
+            provider - provider of the options
+            rows - row widgets of the dropdown, one for each displayed option
+        """
+
+        self.entry = Entry(x, y)
+        self.button = Pushable(None, x, y, self.reset_display,
+                               images=(widgets[f"{color}_button_square_normal"],
+                                       widgets[f"{color}_button_square_hover"],
+                                       widgets[f"{color}_button_square_press"])
+                               )
+        self.button.image.scale = 0.5
+
+        self.textures = (
+            load_texture(combobox_top_normal),
+            load_texture(combobox_middle_normal),
+            load_texture(combobox_bottom_normal)
+        )
+
+        self.rows = []
+
+        for identifier in range(COMBOBOX_ROWS):
+            row = Pushable(
+                    None, 0, Y,
+                    images=(combobox_middle_normal, combobox_middle_normal),
+                    command=self.switch,
+                    parameters=identifier + 2
+                    )
+
+            row.y = (x - 70) - 24 * (identifier + 2)
+            row.push_handlers(on_scroll=self.on_scroll)
+
+            self.rows.append(row)
+            _widgets.append(row)
+
+        Widget.__init__(self)
+
+        self.focus_widget = self.entry
+
+        self.x = x
+        self.y = y
+        self.options = options
+
+        if isinstance(options, OptionProvider):
+            self.provider = CachedProvider(options)
+        elif callable(options):
+            self.provider = CachedProvider(GeneratorProvider(options))
+        else:
+            self.provider = ListProvider(options, fuzzy)
+
+        self.display = self.provider.fetch(0, COMBOBOX_ROWS)
+
+        _widgets.append(self.entry.image)
+        _widgets.append(self.button.image)
+
+    def _get_text(self):
+        return self.entry.text
+
+    def _set_text(self, text):
+        self.entry.text = text
+
+    def _get_x(self):
+        """Get the x position of the Combobox.
+
+        returns: int
+        """
+
+        return self.entry.x
+
+    def _set_x(self, x):
+        """Set the x position of the Combobox.
+
+        x - new x position of the Combobox
+
+        parameters: int
+        """
+
+        self.entry.x = x
+
+    def _get_y(self):
+        """Get the y position of the Combobox.
+
+        returns: int
+        """
+
+        return self.entry.y
+
+    def _set_y(self, y):
+        """Set the y position of the Combobox.
+
+        y - new y position of the Combobox
+
+        parameters: int
+        """
+
+        self.entry.y = y
+
+    def _get_view(self):
+        """Get the vertical view of the Combobox.
+
+        returns: int
+        """
+
+        return self._view
+
+    def _set_view(self, view):
+        """Set the vertical view of the Combobox.
+
+        view - vertical view of the Combobox
+
+        parameters: int
+        """
+
+        self._view = view
+        self.display = self._get_page(view)
+
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+    view = property(_get_view, _set_view)
+
+    def _get_display(self):
+        """Get the displayed options of the Combobox.
+
+        returns: list of str
+        """
+
+        return self._display
+
+    def _set_display(self, display):
+        """Set the displayed options of the Combobox. This rebinds the rows to
+        the options, and hides the rows that are not needed. No widgets are
+        created.
+
+        display - new displayed options, up to COMBOBOX_ROWS
+
+        parameters: list of str
+        """
+
+        self._display = display
+
+        for identifier, row in enumerate(self.rows):
+            shown = identifier < len(display)
+
+            row.image.visible = shown
+            row.label.text_group.visible = shown
+
+            if not shown:
+                continue
+
+            if identifier == 0: texture = self.textures[0]
+            elif identifier == len(display) - 1: texture = self.textures[2]
+            else: texture = self.textures[1]
+
+            row.text = display[identifier]
+            row.normal_image = row.image.texture = texture
+
+    def _get_page(self, view):
+        """Get the options of the current matches displayed at a view.
+
+        view - vertical view of the Combobox
+
+        parameters: int
+        returns: list of str
+        """
+
+        return self.provider.page(view, COMBOBOX_ROWS)
+
+    def _get_buttons(self):
+        """Get the rows of the Combobox that are displayed.
+
+        returns: list of Pushable
+        """
+
+        return self.rows[:len(self._display)]
+
+    text = property(_get_text, _set_text)
+    display = property(_get_display, _set_display)
+    buttons = property(_get_buttons)
+
+    def switch(self, identifier):
+        if identifier - 2 < len(self._display):
+            self.text = self._display[identifier - 2]
+
+    def reset_display(self):
+        """Show the first options, when the drop-down button is pressed. The
+        filter of the text is cleared, so scrolling goes through all of the
+        options instead of jumping back to the matches.
+        """
+
+        self.provider.request("")
+        self.provider.poll()
+
+        self._view = 0
+        self.display = self.provider.fetch(0, COMBOBOX_ROWS)
+
+    def draw(self):
+        self.button.x = self.right - 16
+
+        for row in self.rows:
+            row.image.left = self.left
+            row.label.x = self.left + 10
+
+        self.component = self.entry
+
+    def delete(self):
+        """Delete the combobox and stop filtering its options."""
+
+        self.provider.delete()
+
+        Widget.delete(self)
+
+    def attach(self):
+        """Attach the combobox. The rows are bound to the displayed options
+        again, so the rows that are not needed stay hidden.
+        """
+
+        Widget.attach(self)
+
+        self.display = self._display
+
+    def destroy(self):
+        """Delete the combobox and its components for good, and stop
+        filtering its options.
+        """
+
+        self.provider.delete()
+
+        Widget.destroy(self)
+
+    def update(self):
+        """Update the combobox. The options are filtered again only when the
+        text of the entry changed, once per frame at most. Large option lists
+        are filtered on a worker thread, and the display is updated when the
+        matches are ready.
+        """
+
+        if self.last_text != self.entry.text:
+            self.last_text = self.entry.text
+
+            self.provider.request(self.entry.text)
+
+        if self.provider.poll():
+            self.view = 0
+
+    def on_scroll(self, x, y, scroll):
+        """The combobox or one of its rows was scrolled. This scrolls the
+        displayed options, rebinding the rows.
+
+        x - x position of the mouse
+        y - y position of the mouse
+        scroll - scroll vector of the mouse
+
+        parameters: int, int, Point
+        """
+
+        view = max(0, self.view - int(scroll.y))
+
+        if view == self.view:
+            return
+
+        display = self._get_page(view)
+
+        # Stop at the last page of matches
+        if len(display) == COMBOBOX_ROWS or view < self.view:
+            self._view = view
+            self.display = display
+
+
+class ListBox(Widget):
+    """List of options, of which one or more can be selected. Only the rows
+    inside of the view are created, as Labels, and they are rebound to other
+    options when the list box is scrolled. A list box of a million options has
+    as many widgets as one of ten.
+
+    Selected options are stored as ranges of indices in an IndexSet, so
+    selecting all of a million options stores a single range.
+    """
+
+    COMPONENTS = ("rows", "highlights")
+
+    _view = 0
+
+    def __init__(self, x, y, options, width=200, rows=LISTBOX_ROWS,
+                 mode=SINGLE, command=None, font=DEFAULT_FONT):
+
+        """Initialize a list box.
+
+        >>> listbox = ListBox(200, 200, [f"Item {i}" for i in range(1000000)],
+                              mode=MULTIPLE)
+        >>> listbox.select(5)
+        >>> listbox.select(500000, extend=True)
+        >>> listbox.selection
+        IndexSet([(5, 500001)])
+
+        x - x position of the list box
+        y - y position of the list box
+        options - list of options as strings, OptionProvider, or function
+                  returning an iterator of the options
+        width - width of the list box
+        rows - amount of rows displayed. Defaults to LISTBOX_ROWS.
+        mode - selection mode of the list box. Its avaliable options are:
+
+               SINGLE - only one option can be selected
+               MULTIPLE - multiple options can be selected, with Control to
+                          toggle an option and Shift to select a range
+
+               Defaults to SINGLE.
+        command - command called when the selection changes
+        font - font of the rows
+
+        properties:
+            provider - provider of the options
+            rows - Labels of the displayed rows
+            highlights - rectangles drawn behind the selected rows
+            selection - indices of the selected options
+            selected - first selected option
+            anchor - index of the option from where ranges are selected
+            cursor - index of the last selected option, moved with the keys
+            view - index of the first displayed option
+
+        methods:
+            select - select an option
+            select_all - select all of the options
+            clear_selection - deselect all of the options
+            see - scroll to an option
+
+        parameters: int, int, list of str, int, int, str, callable, tuple
+        """
+
+        if not mode in (SINGLE, MULTIPLE):
+            raise WidgetsError(f"Invalid list box mode \"{mode}\". Must be "
+                               "\"single\" or \"multiple\".")
+
+        self._x = x
+        self._y = y
+        self._width = width
+
+        Widget.__init__(self)
+
+        # Rows are components, so pressing a row gives the focus to the list
+        # box
+        self.rows = [Label(None, 0, 0, font=font) for row in range(rows)]
+
+        # Selected rows are highlighted by rectangles behind them. The style
+        # of the rows is not changed, because Label.update restyles them.
+        self.highlights = [_Rectangle(0, 0, width, LISTBOX_ROW_HEIGHT,
+                                      LISTBOX_SELECT_COLOR[:3], batch=get_batch(),
+                                      group=background)
+                           for row in range(rows)]
+
+        for highlight in self.highlights:
+            highlight.opacity = LISTBOX_SELECT_COLOR[3]
+            highlight.visible = False
+
+        self._adopt_components()
+
+        self.options = options
+
+        if isinstance(options, OptionProvider):
+            self.provider = CachedProvider(options)
+        elif callable(options):
+            self.provider = CachedProvider(GeneratorProvider(options))
+        else:
+            self.provider = ListProvider(options)
+
+        self.mode = mode
+        self.command = command
+
+        self.selection = IndexSet()
+        self.anchor = None
+        self.cursor = None
+
+        self._position_rows()
+        self._bind()
+
+    def _get_x(self):
+        """Get the x position of the list box.
+
+        returns: int
+        """
+
+        return self._x
+
+    def _set_x(self, x):
+        """Set the x position of the list box.
+
+        x - new x position of the list box
+
+        parameters: int
+        """
+
+        self._x = x
+
+        self._position_rows()
+
+    def _get_y(self):
+        """Get the y position of the list box.
+
+        returns: int
+        """
+
+        return self._y
+
+    def _set_y(self, y):
+        """Set the y position of the list box.
+
+        y - new y position of the list box
+
+        parameters: int
+        """
+
+        self._y = y
+
+        self._position_rows()
+
+    def _get_view(self):
+        """Get the index of the first displayed option.
+
+        returns: int
+        """
+
+        return self._view
+
+    def _set_view(self, view):
+        """Set the index of the first displayed option. The view is clamped,
+        and the rows are rebound to the options inside of it.
+
+        view - index of the first displayed option
+
+        parameters: int
+        """
+
+        view = max(0, min(view, len(self.provider) - len(self.rows)))
+
+        if view == self._view:
+            return
+
+        self._view = view
+
+        self._bind()
+
+    def _get_selected(self):
+        """Get the first selected option.
+
+        returns: str, or None if no option is selected
+        """
+
+        index = self.selection.first()
+
+        if index is None:
+            return None
+
+        return self.provider.fetch(index, index + 1)[0]
+
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+    view = property(_get_view, _set_view)
+    selected = property(_get_selected)
+
+    def _position_rows(self):
+        """Move the rows to the position of the list box, and update its hit
+        box.
+        """
+
+        height = len(self.rows) * LISTBOX_ROW_HEIGHT
+
+        self._left = self._x - self._width / 2
+        self._right = self._x + self._width / 2
+        self._top = self._y + height / 2
+        self._bottom = self._y - height / 2
+
+        for identifier, (row, highlight) in enumerate(zip(self.rows,
+                                                          self.highlights)):
+            row.x = self._left + 5
+            row.y = self._top - LISTBOX_ROW_HEIGHT * (identifier + 0.5)
+
+            highlight.position = (self._left,
+                                  self._top - LISTBOX_ROW_HEIGHT *
+                                  (identifier + 1))
+
+    def _bind(self):
+        """Rebind the rows to the options inside of the view. Rows after the
+        last option are hidden.
+        """
+
+        options = self.provider.fetch(self._view,
+                                      self._view + len(self.rows))
+
+        for identifier, (row, highlight) in enumerate(zip(self.rows,
+                                                          self.highlights)):
+            shown = identifier < len(options)
+
+            row.text_group.visible = shown
+            highlight.visible = shown and \
+                                self._view + identifier in self.selection
+
+            if not shown:
+                continue
+
+            row.force_text(escape(str(options[identifier])))
+
+    def _invoke(self):
+        """Rebind the rows and call the command after the selection changed.
+        """
+
+        self._bind()
+
+        if self.command:
+            self.command()
+
+    def select(self, index, extend=False, toggle=False):
+        """Select an option. Without extend or toggle, the other options are
+        deselected.
 
-                 You can get the list of all text motions with motions_string()
-                 in the keyboard module. You can also get their keyboard
-                 combinations with motions_combinations().
+        index - index of the option
+        extend - select all of the options from the anchor to the option. This
+                 only works in MULTIPLE mode.
+        toggle - select the option if it is not selected, otherwise deselect
+                 it. This only works in MULTIPLE mode.
 
-        parameters: int (32-bit)
+        parameters: int, bool, bool
         """
 
-        if not self.focus:
+        if self.mode == MULTIPLE and extend and self.anchor is not None:
+            self.selection.clear()
+            self.selection.add_range(min(self.anchor, index),
+                                     max(self.anchor, index) + 1)
+        elif self.mode == MULTIPLE and toggle:
+            self.selection.toggle(index)
+            self.anchor = index
+        else:
+            self.selection.clear()
+            self.selection.add(index)
+            self.anchor = index
+
+        self.cursor = index
+
+        self._invoke()
+
+    def select_all(self):
+        """Select all of the options. This only works in MULTIPLE mode."""
+
+        if self.mode != MULTIPLE:
             return
 
-        if self.keys[ALT]:
-            if motion == MOTION_LEFT or \
-                motion == MOTION_RIGHT:
-                return
+        self.selection.add_range(0, len(self.provider))
 
-        self.caret.on_text_motion(motion)
+        self._invoke()
 
-    def on_text_select(self, motion):
-        """Some text in the entry is selected. When this happens, the
-        selected text will have a blue background to it. Moving the caret
-        with a text motion removes the selection (does not remove the text).
+    def clear_selection(self):
+        """Deselect all of the options."""
 
-        NOTE: this is not called with caret mouse selections. See on_press.
+        self.selection.clear()
+        self.anchor = self.cursor = None
 
-        motion - motion used by the user. These can be made with the user.
+        self._invoke()
 
-                 SHIFT + LEFT               SHIFT + RIGHT
-                 SHIFT + UP                 SHIFT + DOWN
-                 CONTROL + SHIFT + LEFT     CONTROL + SHIFT + RIGHT
+    def see(self, index):
+        """Scroll the list box so an option is displayed.
 
-        parameters: int (32-bit)
+        index - index of the option
+
+        parameters: int
         """
 
-        if not self.focus:
-            return
+        if index < self._view:
+            self.view = index
+        elif index >= self._view + len(self.rows):
+            self.view = index - len(self.rows) + 1
 
-        self.caret.on_text_motion_select(motion)
+    def on_scroll(self, x, y, scroll):
+        """The list box is scrolled with the mouse. This rebinds the rows, and
+        does not create any widgets.
 
-    def on_press(self, x, y, buttons, modifiers):
-        """The entry is pressed. This will do a number of things.
+        x - x position of the mouse
+        y - y position of the mouse
+        scroll - scroll vector
 
-            - The caret's position is set to the nearest character.
-            - The history will add the caret's position.
-            - If text is selected, the selection will be removed.
-            - If the Shift key is being held, a selection will be created
-              between the current caret index and the closest character to
-              the mouse.
-            - If two clicks are made within 0.5 seconds (double-click), the
-              current word is selected.
-            - If three clicks are made within 0.5 seconds (triple-click), the
-              current paragraph is selected.
-            - If there is a placeholder text, the text is removed.
+        parameters: int, int, Point
+        """
+
+        self.view -= int(scroll.y)
+
+    def on_press(self, x, y, buttons, modifiers):
+        """The list box is pressed. This selects the option of the row that
+        was pressed.
 
         x - x position of the press
         y - y position of the press
@@ -3594,153 +6023,208 @@ class Entry(Widget):
         parameters: int, int, int (32-bit), int (32-bit)
         """
 
-        _x, _y = x - self.layout.x, y - self.layout.y
+        if buttons != MOUSE_BUTTON_LEFT:
+            return
 
-        if self.text == self.placeholder:
-            self.text = None
+        index = self._view + int((self._top - y) // LISTBOX_ROW_HEIGHT)
 
-        index_before = self.index
+        if index >= len(self.provider):
+            return
 
-        self.caret.on_mouse_press(x, y, buttons, modifiers)
+        self.select(index, extend=modifiers & SHIFT,
+                    toggle=modifiers & CONTROL)
 
-        index_after = self.index
+    def on_key(self, keys, modifiers):
+        """A key is pressed. This is used for keyboard navigation when the
+        list box has focus.
 
-        self.mark = None
+        Up, Down        Select the previous or next option
+        Home, End       Select the first or last option
+        Shift           Select a range while moving
+        Control + A     Select all of the options
 
-        if index_before is not index_after:
-            # Add history
-            self.history.append(index_after)
+        keys - key pressed
+        modifiers - modifier pressed
 
-        if self.keys[SHIFT]:
-            indices = sorted((index_before, index_after))
+        parameters: int (32-bit), int (32-bit)
+        """
 
-            self.selection = indices
-            self.mark = max(index_before, index_after)
+        if not self.focus or not len(self.provider):
+            return
 
+        if keys == A and modifiers & CONTROL:
+            self.select_all()
+            return
 
-    def on_drag(self, x, y, dx, dy, buttons, modifiers):
-        """The user dragged the mouse when it was pressed. This can create
-        selections on entries and move the knob in sliders.
+        current = self.cursor if self.cursor is not None else -1
 
-        x - x position of the current position
-        y - y position of the current position
-        dx - movement in x vector from the last position
-        dy - movement in y vector from the last position
+        if keys == KEY_UP: index = current - 1
+        elif keys == KEY_DOWN: index = current + 1
+        elif keys == HOME: index = 0
+        elif keys == END: index = len(self.provider) - 1
+        else: return
 
-        buttons - buttons that were dragged with the mouse
-        modifiers - modifiers being held down
+        index = max(0, min(index, len(self.provider) - 1))
 
-        parameters: int, int, float, float, int (32-bit), int (32-bit)
-        """
+        self.select(index, extend=modifiers & SHIFT)
 
-        _x, _y = x - self.layout.x, y - self.layout.y
+        self.see(index)
 
-        if self.press:
-            self.caret.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+    def delete(self):
+        """Delete the list box and its rows."""
 
-            self.index = self.caret.position
-        else:
-            if self.focus:
-                self.caret.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+        for row in self.rows:
+            row.label.visible = False
+            row.delete()
 
-                self.index = self.caret.position
+        for highlight in self.highlights:
+            highlight.delete()
 
-    def update(self):
-        """Update the caret and entry. This schedules caret blinking and
-        keeps track of focus.
+        self.provider.delete()
+
+        Widget.delete(self)
+
+    def attach(self):
+        """Attach the list box. The rows are bound to the options again, so
+        the rows that are not needed stay hidden.
         """
 
-        if not self.length == len(self.text):
-            self.length = len(self.text)
+        Widget.attach(self)
 
-        if self.focus:
-            if not self.blinking:
-                schedule(self.blink, ENTRY_BLINK_INTERVAL)
+        self._bind()
 
-                self.blinking = True
+    def destroy(self):
+        """Delete the list box and its rows for good, and stop filtering its
+        options.
+        """
 
-        else:
-            self.index = 0
-            self.mark = None
-            self.blinking = False
+        self.provider.delete()
 
-            unschedule(self.blink)
+        Widget.destroy(self)
 
 
-class Combobox(Widget, EventDispatcher):
+class DataGrid(Widget):
+    """Grid of cells displaying a table, like live telemetry. The table is a
+    GridModel of NumPy columns. Only the cells inside of the view are created,
+    as plain pyglet text labels, and they are rebound to other rows and
+    columns when the grid is scrolled.
 
-    _display = []
-    _view = None
-    displayed = False
-    last_text = None
-    scroller = None
+    Sorting is a single argsort of a column. Updated rows only change the
+    text of their cells that are displayed.
+    """
 
-    def __init__(self, x, y, options, color="yellow", default=0):
+    COMPONENTS = ("header", "cells")
 
-        self.entry = Entry(x, y)
-        self.button = Pushable(None, x, y, self.reset_display,
-                               images=(widgets[f"{color}_button_square_normal"],
-                                       widgets[f"{color}_button_square_hover"],
-                                       widgets[f"{color}_button_square_press"])
-                               )
-        self.button.image.scale = 0.5
+    _view = 0
+    _column_view = 0
+
+    def __init__(self, x, y, data, width=500, rows=DATAGRID_ROWS,
+                 columns=DATAGRID_COLUMNS, formats=None, font=DEFAULT_FONT,
+                 color=BLACK):
+
+        """Initialize a data grid. This requires NumPy.
+
+        >>> grid = DataGrid(300, 200, {"id" : ids, "speed" : speeds},
+                            formats={"speed" : ".2f"})
+        >>> grid.sort("speed", reverse=True)
+        >>> grid.update_rows([4, 17], {"speed" : [12.5, 3.25]})
+
+        x - x position of the data grid
+        y - y position of the data grid
+        data - table of the data grid, as a GridModel, a NumPy structured
+               array, or a dict of column names to sequences
+        width - width of the data grid
+        rows - amount of rows displayed. Defaults to DATAGRID_ROWS.
+        columns - amount of columns displayed. Defaults to DATAGRID_COLUMNS.
+        formats - map of column names to format specifications of their
+                  values, like ".2f". Defaults to None.
+        font - font of the cells
+        color - color of the text in RGB as a tuple of three ints
+
+        properties:
+            model - GridModel of the table
+            header - text labels of the displayed column names
+            cells - text labels of the displayed cells, by row
+            view - displayed position of the first displayed row
+            column_view - index of the first displayed column
+
+        methods:
+            sort - sort the rows by a column
+            update_rows - set the values of some rows
+
+        parameters: int, int, GridModel or numpy.ndarray or dict, int, int,
+                    int, dict, tuple, tuple
+        """
+
+        from grid import GridModel
 
-        self.buttons = []
+        self.model = data if isinstance(data, GridModel) else GridModel(data)
+
+        self._x = x
+        self._y = y
+        self._width = width
 
         Widget.__init__(self)
 
-        self.x = x
-        self.y = y
-        self.options = options
-        self.display = options
+        self.formats = formats or {}
 
-        _widgets.append(self.entry.image)
-        _widgets.append(self.button.image)
+        # All of the cells share one group, so they are still drawn together
+        self.text_group = TextGroup()
 
-    def _get_text(self):
-        return self.entry.text
+        style = dict(font_name=font[0], font_size=font[1],
+                     color=four_byte(color), anchor_x=LEFT, anchor_y=CENTER,
+                     batch=get_batch(), group=self.text_group)
 
-    def _set_text(self, text):
-        self.entry.text = text
+        self.header = [TextLabel(bold=True, **style) for column in
+                       range(columns)]
+        self.cells = [[TextLabel(**style) for column in range(columns)]
+                      for row in range(rows)]
+
+        self._position_cells()
+        self._bind()
 
     def _get_x(self):
-        """Get the x position of the Combobox.
+        """Get the x position of the data grid.
 
         returns: int
         """
 
-        return self.entry.x
+        return self._x
 
     def _set_x(self, x):
-        """Set the x position of the Combobox.
+        """Set the x position of the data grid.
 
-        x - new x position of the Combobox
+        x - new x position of the data grid
 
         parameters: int
         """
 
-        self.entry.x = x
+        self._x = x
+
+        self._position_cells()
 
     def _get_y(self):
-        """Get the y position of the Combobox.
+        """Get the y position of the data grid.
 
         returns: int
         """
 
-        return self.entry.y
+        return self._y
 
     def _set_y(self, y):
-        """Set the y position of the Combobox.
+        """Set the y position of the data grid.
 
-        y - new y position of the Combobox
+        y - new y position of the data grid
 
         parameters: int
         """
 
-        self.entry.y = y
+        self._y = y
+
+        self._position_cells()
 
     def _get_view(self):
-        """Get the vertical view of the Combobox.
+        """Get the displayed position of the first displayed row.
 
         returns: int
         """
@@ -3748,92 +6232,238 @@ class Combobox(Widget, EventDispatcher):
         return self._view
 
     def _set_view(self, view):
-        """Set the vertical view of the Combobox.
+        """Set the displayed position of the first displayed row. The view is
+        clamped, and the cells are rebound.
 
-        view - vertical view of the Combobox
+        view - displayed position of the first displayed row
 
         parameters: int
         """
 
+        view = max(0, min(view, len(self.model) - len(self.cells)))
+
+        if view == self._view:
+            return
+
         self._view = view
-        self.display = self.display[view : view + 3]
+
+        self._bind()
+
+    def _get_column_view(self):
+        """Get the index of the first displayed column.
+
+        returns: int
+        """
+
+        return self._column_view
+
+    def _set_column_view(self, column_view):
+        """Set the index of the first displayed column. The view is clamped,
+        and the cells are rebound.
+
+        column_view - index of the first displayed column
+
+        parameters: int
+        """
+
+        column_view = max(0, min(column_view,
+                                 len(self.model.columns) - len(self.header)))
+
+        if column_view == self._column_view:
+            return
+
+        self._column_view = column_view
+
+        self._bind()
 
     x = property(_get_x, _set_x)
     y = property(_get_y, _set_y)
     view = property(_get_view, _set_view)
+    column_view = property(_get_column_view, _set_column_view)
 
-    def _get_display(self):
-        return self._display
+    def _get_columns(self):
+        """Get the names of the displayed columns.
 
-    def _set_display(self, display):
-        self.buttons.clear()
+        returns: list of str
+        """
 
-        identifier = 1
+        return self.model.columns[self._column_view :
+                                  self._column_view + len(self.header)]
 
-        for option in display:
-            identifier += 1
+    def _position_cells(self):
+        """Move the cells to the position of the data grid, and update its hit
+        box.
+        """
 
-            if identifier == 2: image = (combobox_top_normal, combobox_top_normal)
-            elif identifier == len(display) + 1: image = (combobox_bottom_normal, combobox_bottom_normal)
-            else: image = (combobox_middle_normal, combobox_middle_normal)
+        column_width = self._width / len(self.header)
+        height = (len(self.cells) + 1) * DATAGRID_ROW_HEIGHT
 
-            button = Pushable(
-                      option, 0,
-                      Y,
-                      images=image,
-                      command=self.switch,
-                      parameters=identifier
-                      )
+        self._left = self._x - self._width / 2
+        self._right = self._x + self._width / 2
+        self._top = self._y + height / 2
+        self._bottom = self._y - height / 2
 
-            button.y = (self.x - 70) - 24 * identifier
+        for row, labels in enumerate([self.header] + self.cells):
+            for column, label in enumerate(labels):
+                label.position = (
+                    self._left + column * column_width + 5,
+                    self._top - DATAGRID_ROW_HEIGHT * (row + 0.5)
+                )
 
-            self.buttons.append(button)
-            _widgets.append(button)
+    def _set_cell(self, label, text):
+        """Set the text of a cell, if it changed.
 
-    text = property(_get_text, _set_text)
-    display = property(_get_display, _set_display)
+        label - text label of the cell
+        text - new text of the cell
 
-    def switch(self, identifier):
-        if len(self.buttons) > 1:
-            self.text = self.buttons[identifier - 2].text
-        elif len(self.buttons) == 1:
-            self.text = self.buttons[0].text
+        parameters: pyglet.text.Label, str
+        """
 
-    def reset_display(self):
-        self.display = self.options
+        if label.text != text:
+            label.text = text
 
-    def draw(self):
-        self.button.x = self.right - 16
+    def _format(self, column, value):
+        """Format a value of a column.
 
-        for button in self.buttons:
-            button.image.left = self.left
-            button.label.x = self.left + 10
+        column - name of the column
+        value - value of a cell of the column
 
-        self.component = self.entry
+        parameters: str, any
+        returns: str
+        """
 
-        if not self.displayed:
-            self.display = self.options[:3]
-            self.displayed = True
+        return format(value, self.formats.get(column, ""))
 
-        if self.last_text is not self.entry.text and \
-            self.entry.text:
+    def _bind_row(self, row, columns):
+        """Rebind the cells of a displayed row.
 
-            if self.entry.text == "" and \
-                self.display is not self.options:
-                self.display = self.options[:3]
-                return
+        row - index of the displayed row
+        columns - names of the columns to rebind
+
+        parameters: int, list of str
+        """
 
-            self.display = []
-            self.increment = (0, 0)
-            # If filter removed show all data
+        labels = self.cells[row]
+        position = self._view + row
 
-            filtered_data = list()
-            for item in self.options:
-                if self.entry.text in item:
-                    filtered_data.append(item)
+        if position >= len(self.model):
+            for label in labels:
+                self._set_cell(label, "")
 
-            self.display = filtered_data[:3]
-            self.last_text = self.entry.text
+            return
+
+        index = self.model.order[position]
+
+        for column, name in enumerate(self._get_columns()):
+            if name in columns:
+                self._set_cell(labels[column], self._format(
+                    name, self.model.data[name][index]
+                ))
+
+    def _bind(self):
+        """Rebind all of the displayed cells."""
+
+        columns = self._get_columns()
+
+        for column, label in enumerate(self.header):
+            if column < len(columns):
+                self._set_cell(label, columns[column])
+            else:
+                self._set_cell(label, "")
+
+        for row, labels in enumerate(self.cells):
+            self._bind_row(row, columns)
+
+            for label in labels[len(columns):]:
+                self._set_cell(label, "")
+
+    def sort(self, column, reverse=None):
+        """Sort the rows by a column.
+
+        column - name of the column
+        reverse - sort in descending order. If None, the order is reversed
+                  when the rows are already sorted by the column. Defaults to
+                  None.
+
+        parameters: str, bool
+        """
+
+        if reverse is None:
+            reverse = self.model.sort_column == column and \
+                      not self.model.reverse
+
+        self.model.sort(column, reverse)
+
+        self._bind()
+
+    def update_rows(self, indices, values):
+        """Set the values of some rows. Only the cells of the changed columns
+        of the displayed rows are set again, so updating thousands of rows
+        each frame costs little more than updating the model.
+
+        >>> grid.update_rows(changed, telemetry[changed])
+
+        indices - indices of the rows
+        values - new values, as a NumPy structured array or a dict of column
+                 names to sequences, in the order of indices
+
+        parameters: sequence of int, numpy.ndarray or dict
+        """
+
+        positions, columns = self.model.update_rows(indices, values)
+
+        displayed = positions[(positions >= self._view) &
+                              (positions < self._view + len(self.cells))]
+
+        for position in displayed:
+            self._bind_row(int(position) - self._view, columns)
+
+    def on_scroll(self, x, y, scroll):
+        """The data grid is scrolled with the mouse. Vertical scrolling moves
+        through the rows and horizontal scrolling through the columns.
+
+        x - x position of the mouse
+        y - y position of the mouse
+        scroll - scroll vector
+
+        parameters: int, int, Point
+        """
+
+        if scroll.y:
+            self.view -= int(scroll.y)
+        if scroll.x:
+            self.column_view += int(scroll.x)
+
+    def on_press(self, x, y, buttons, modifiers):
+        """The data grid is pressed. Pressing the name of a column sorts the
+        rows by it, and pressing it again reverses the order.
+
+        x - x position of the press
+        y - y position of the press
+        buttons - buttons that were pressed with the mouse
+        modifiers - modifiers being held down
+
+        parameters: int, int, int (32-bit), int (32-bit)
+        """
+
+        if buttons != MOUSE_BUTTON_LEFT or \
+            y < self._top - DATAGRID_ROW_HEIGHT:
+            return
+
+        column = int((x - self._left) // (self._width / len(self.header)))
+        columns = self._get_columns()
+
+        if column < len(columns):
+            self.sort(columns[column])
+
+    def delete(self):
+        """Delete the data grid and its cells."""
+
+        for labels in [self.header] + self.cells:
+            for label in labels:
+                label.delete()
+
+        Widget.delete(self)
 
 
 class Pushable(Widget):
@@ -3843,6 +6473,8 @@ class Pushable(Widget):
     TODO: add specifying border properties (left, right, top, bottom)
     """
 
+    COMPONENTS = ("image", "label")
+
     def __init__(
                  self, text, x, y, command=None, parameters=[],
                  images=(), font=default_font,
@@ -4019,6 +6651,8 @@ class Shape(Widget):
     """Primitive drawing Shape. This is subclassed by all shapes. You may or
     may not want to subclass this."""
 
+    COMPONENTS = ("shape",)
+
     def __init__(self):
         """Initialize a shape. When using a shape, be sure to create vertex
         lists from pyglet.graphics.vertex_list(), then draw them with pyglet
@@ -4095,6 +6729,7 @@ class Shape(Widget):
         self.shape.delete()
 
 
+_Rectangle = Rectangle
 _Circle = Circle
 _Ellipse = Ellipse
 _Sector = Sector
@@ -4133,7 +6768,7 @@ class Rectangle(Shape):
         self.shape = BorderedRectangle(
                             x, y, width, height,
                             border, colors[0], colors[1],
-                            batch=batch
+                            batch=get_batch()
                         )
 
         Shape.__init__(self) # Do this after defining self.shape
@@ -4199,7 +6834,7 @@ class Circle(Shape):
         if not segments:
             segments = max(14, int(radius / 1.25))
 
-        self.shape = _Circle(x, y, radius, segments, color, batch=batch)
+        self.shape = _Circle(x, y, radius, segments, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4289,7 +6924,7 @@ class Ellipse(Shape):
 
         """
 
-        self.shape = _Ellipse(x, y, a, b, color, batch=batch)
+        self.shape = _Ellipse(x, y, a, b, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4404,7 +7039,7 @@ class Sector(Shape):
         parameters: int, int, int, int, int
         """
 
-        self.shape = _Sector(x, y, radius, segments, angle, start, color, batch=batch)
+        self.shape = _Sector(x, y, radius, segments, angle, start, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4527,7 +7162,7 @@ class Line(Shape):
 
         self.shape = _Line(point1.x, point1.y,
                            point2.x, point2.y,
-                           width, color, batch=batch)
+                           width, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4622,7 +7257,7 @@ class Triangle(Shape):
         parameters: Pointlist, tuple (RGB)
         """
 
-        self.shape = _Triangle(*points, color, batch=batch)
+        self.shape = _Triangle(*points, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4700,7 +7335,7 @@ class Star(Shape):
                 "incorrect, but results in interesting patterns."
             )
 
-        self.shape = _Star(x, y, outer, inner, spikes, rotation, color, batch=batch)
+        self.shape = _Star(x, y, outer, inner, spikes, rotation, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4776,7 +7411,7 @@ class Star(Shape):
 class Polygon(Shape):
 
     def __init__(self, *coordinates, color=BLACK):
-        self.shape = _Polygon(*coordinates, color, batch=batch)
+        self.shape = _Polygon(*coordinates, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4793,7 +7428,7 @@ class Arc(Shape):
     def __init__(self, x, y, radius, segments=None,
                  angle=tau, start=0, closed=False, color=BLACK):
 
-        self.shape = _Arc(x, y, radius, segments, angle, start, closed, color, batch=batch)
+        self.shape = _Arc(x, y, radius, segments, angle, start, closed, color, batch=get_batch())
 
         Shape.__init__(self)
 
@@ -4825,6 +7460,8 @@ class MyWindow(Window):
             self, width, height, title
         )
 
+        enable_timings() # For get_fps
+
         from pyglet.image import load
 
         from file import blank1, blank2
@@ -4868,6 +7505,9 @@ class MyWindow(Window):
             300,
             size=100)
 
+        self.slider.push_handlers(on_change=self.on_slider_change)
+        self.on_slider_change(self.slider.value)
+
         self.entry = Entry(
             300,
             160,
@@ -4902,23 +7542,28 @@ class MyWindow(Window):
     def click(self):
         self._label.text = self.entry.text
 
+    def on_slider_change(self, value):
+        self.label.UPDATE_RATE = value + 1 # Compensate for zero
+        self.slider.text = str(int(value))
+
     def on_draw(self):
         self.clear()
         self.set_caption(f"{int(get_fps())} fps")
 
         container.draw()
 
-        self.label.UPDATE_RATE = self.slider.value + 1 # Compensate for zero
-
         if self.toggle.value:
             self.label.text = f"{int(get_fps())} fps"
         else:
             self.label.text = "<b>Bold</b>, <i>italic</i>, and <u>underline</u> text in <font color='red'>HTML</font>."
 
-        self.slider.text = str(int(self.slider.value))
-
 
 if __name__ == "__main__":
+    from file import resources
+
+    # Decode the images in the background while the window is created
+    resources.preload(theme="yellow")
+
     window = MyWindow(" ", 500, 400)
 
     from pyglet.app import run
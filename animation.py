@@ -0,0 +1,482 @@
+"""Tweens and easing curves for arcade-gui animations."""
+
+from math import cos, pi
+
+from pyglet.clock import schedule, unschedule
+
+__all__ = [
+           "linear",
+           "ease_in_quad",
+           "ease_out_quad",
+           "ease_in_out_quad",
+           "ease_out_cubic",
+           "ease_in_out_sine",
+           "Tween",
+           "AnimationGroup",
+           "Animator",
+           "animator"
+          ]
+
+
+def linear(t):
+    """Move at a constant speed.
+
+    t - progress of the animation, from 0 to 1
+
+    parameters: float
+    returns: float
+    """
+
+    return t
+
+def ease_in_quad(t):
+    """Start slowly and speed up.
+
+    t - progress of the animation, from 0 to 1
+
+    parameters: float
+    returns: float
+    """
+
+    return t * t
+
+def ease_out_quad(t):
+    """Start quickly and slow down.
+
+    t - progress of the animation, from 0 to 1
+
+    parameters: float
+    returns: float
+    """
+
+    return t * (2 - t)
+
+def ease_in_out_quad(t):
+    """Start and end slowly.
+
+    t - progress of the animation, from 0 to 1
+
+    parameters: float
+    returns: float
+    """
+
+    if t < 0.5:
+        return 2 * t * t
+
+    return -1 + (4 - 2 * t) * t
+
+def ease_out_cubic(t):
+    """Start quickly and slow down more than ease_out_quad.
+
+    t - progress of the animation, from 0 to 1
+
+    parameters: float
+    returns: float
+    """
+
+    return (t - 1) ** 3 + 1
+
+def ease_in_out_sine(t):
+    """Start and end slowly, following a sine curve.
+
+    t - progress of the animation, from 0 to 1
+
+    parameters: float
+    returns: float
+    """
+
+    return (1 - cos(pi * t)) / 2
+
+
+class Tween:
+    """Animation of a numeric attribute of an object from its current value to
+    another one over some time. The progress depends on the time elapsed, not
+    on the amount of frames, so animations take as long at any frame rate.
+    """
+
+    __slots__ = ("target", "attribute", "start", "end", "duration", "easing",
+                 "on_update", "on_complete", "elapsed")
+
+    def __init__(self, target, attribute, end, duration,
+                 easing=ease_out_quad, on_update=None, on_complete=None):
+        """Initialize a tween. Use Animator.tween to start one.
+
+        target - object to be animated
+        attribute - name of the attribute to be animated
+        end - value of the attribute at the end of the animation
+        duration - duration of the animation in seconds
+        easing - easing curve of the animation. Defaults to ease_out_quad.
+        on_update - function called after each step of the animation.
+                    Defaults to None.
+        on_complete - function called when the animation has finished.
+                      Defaults to None.
+
+        properties:
+            start - value of the attribute at the start of the animation
+            elapsed - time elapsed since the start of the animation
+
+        parameters: object, str, float, float, callable, callable, callable
+        """
+
+        self.target = target
+        self.attribute = attribute
+        self.start = getattr(target, attribute)
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.on_update = on_update
+        self.on_complete = on_complete
+
+        self.elapsed = 0
+
+    def tick(self, delta):
+        """Advance the animation.
+
+        delta - time elapsed since the last tick
+
+        parameters: float
+        returns: bool (whether the animation is still running)
+        """
+
+        self.elapsed += delta
+
+        if self.duration > 0:
+            progress = min(self.elapsed / self.duration, 1)
+        else:
+            progress = 1
+
+        value = self.start + (self.end - self.start) * self.easing(progress)
+
+        setattr(self.target, self.attribute, value)
+
+        if self.on_update:
+            self.on_update()
+
+        if progress < 1:
+            return True
+
+        if self.on_complete:
+            self.on_complete()
+
+        return False
+
+
+class AnimationGroup:
+    """Animation of attributes of many objects at once, like fading all of the
+    widgets of a screen. The start values, end values, and timing of every
+    target are stored in NumPy arrays, so the easing of all of them is
+    evaluated in one vectorized step per frame. Only the targets that are
+    moving are written back.
+
+    Easing curves have to work on arrays. The built-in curves do.
+    """
+
+    INTEGER_ATTRIBUTES = ("alpha", "opacity") # Rounded when written
+
+    def __init__(self, easing=ease_out_quad, on_complete=None):
+        """Initialize an animation group. This requires NumPy.
+
+        >>> group = AnimationGroup(ease_in_out_quad)
+        >>> group.add_all(widgets_list, "alpha", 0, 0.3, stagger=0.01)
+        >>> group.add_all(widgets_list, "center_x", 0, 0.3)
+        >>> animator.play(group)
+
+        easing - easing curve of all of the targets. Defaults to
+                 ease_out_quad.
+        on_complete - function called when all of the targets have finished.
+                      Defaults to None.
+
+        properties:
+            targets - animated objects with their attributes
+            elapsed - time elapsed since the group started playing
+
+        parameters: callable, callable
+        """
+
+        import numpy
+
+        self.numpy = numpy
+        self.easing = self._vectorize(easing)
+        self.on_complete = on_complete
+
+        self.targets = []
+        self.elapsed = 0
+
+        self._columns = ([], [], [], [], []) # Start, end, delay, duration,
+                                             # integer
+        self._arrays = None
+        self._finished = None
+
+    def __len__(self):
+        return len(self.targets)
+
+    def _vectorize(self, easing):
+        """Get the version of an easing curve that works on arrays.
+
+        easing - easing curve
+
+        parameters: callable
+        returns: callable
+        """
+
+        numpy = self.numpy
+
+        if easing is ease_in_out_quad:
+            return lambda t: numpy.where(t < 0.5, 2 * t * t,
+                                         -1 + (4 - 2 * t) * t)
+        if easing is ease_in_out_sine:
+            return lambda t: (1 - numpy.cos(numpy.pi * t)) / 2
+
+        return easing
+
+    def add(self, target, attribute, end, duration, delay=0):
+        """Add a target to the group. Its start value is its current value.
+
+        target - object to be animated
+        attribute - name of the attribute to be animated
+        end - value of the attribute at the end of the animation
+        duration - duration of the animation in seconds
+        delay - time in seconds before the target starts moving. Defaults
+                to 0.
+
+        parameters: object, str, float, float, float
+        """
+
+        self.targets.append((target, attribute))
+
+        for column, value in zip(self._columns, (
+            getattr(target, attribute), end, delay, duration,
+            attribute in self.INTEGER_ATTRIBUTES)):
+            column.append(value)
+
+        self._arrays = None
+
+    def add_all(self, targets, attribute, end, duration, stagger=0):
+        """Add many targets to the group.
+
+        targets - objects to be animated
+        attribute - name of the attribute to be animated
+        end - value of the attribute at the end of the animation, or a
+              sequence of them for each target
+        duration - duration of the animation in seconds
+        stagger - delay between the starts of consecutive targets. Defaults
+                  to 0.
+
+        parameters: iterable, str, float or sequence, float, float
+        """
+
+        targets = list(targets)
+
+        if not hasattr(end, "__len__"):
+            end = [end] * len(targets)
+
+        for i, (target, value) in enumerate(zip(targets, end)):
+            self.add(target, attribute, value, duration, i * stagger)
+
+    def _get_arrays(self):
+        """Get the arrays of the targets, converting the added ones.
+
+        returns: tuple of numpy.ndarray
+        """
+
+        if self._arrays is None:
+            numpy = self.numpy
+
+            start, end, delay, duration, integer = self._columns
+
+            self._arrays = (
+                numpy.array(start, dtype=float),
+                numpy.array(end, dtype=float),
+                numpy.array(delay, dtype=float),
+                # Targets without a duration finish as soon as they start
+                numpy.maximum(numpy.array(duration, dtype=float), 1e-9),
+                numpy.array(integer, dtype=bool)
+            )
+            self._finished = numpy.zeros(len(self.targets), dtype=bool)
+
+        return self._arrays
+
+    def tick(self, delta):
+        """Advance all of the targets in one vectorized step, and write back
+        the targets that moved.
+
+        delta - time elapsed since the last tick
+
+        parameters: float
+        returns: bool (whether the group is still running)
+        """
+
+        numpy = self.numpy
+
+        start, end, delay, duration, integer = self._get_arrays()
+
+        self.elapsed += delta
+
+        progress = numpy.clip((self.elapsed - delay) / duration, 0, 1)
+        values = start + (end - start) * self.easing(progress)
+        values = numpy.where(integer, numpy.rint(values), values)
+
+        # Targets that started and were not finished in the last tick
+        moving = numpy.flatnonzero((self.elapsed >= delay) & ~self._finished)
+
+        targets = self.targets
+
+        for i, value in zip(moving.tolist(), values[moving].tolist()):
+            target, attribute = targets[i]
+
+            setattr(target, attribute, int(value) if integer[i] else value)
+
+        self._finished = progress >= 1
+
+        if self._finished.all():
+            if self.on_complete:
+                self.on_complete()
+
+            return False
+
+        return True
+
+
+class Animator:
+    """Engine running all of the tweens. It is only scheduled with the pyglet
+    clock while there are tweens running, so widgets at rest cost nothing.
+    Finished tweens are removed.
+    """
+
+    def __init__(self):
+        """Initialize an animator. You shouldn't usually need to create an
+        instance of this class directly. Use the animator variable.
+
+        >>> animator.tween(slider.knob, "x", 200, 0.15)
+
+        properties:
+            tweens - running tweens, by target and attribute
+            groups - animation groups being played
+            scheduled - animator is scheduled with the clock
+        """
+
+        self.tweens = {}
+        self.groups = []
+        self.scheduled = False
+
+    def _schedule(self):
+        """Schedule the animator with the clock if it is not scheduled."""
+
+        if not self.scheduled:
+            schedule(self.tick)
+
+            self.scheduled = True
+
+    def tween(self, target, attribute, end, duration, easing=ease_out_quad,
+              on_update=None, on_complete=None):
+        """Start animating an attribute of an object. If the attribute is
+        already being animated, that tween is replaced and the new one starts
+        from the current value.
+
+        target - object to be animated
+        attribute - name of the attribute to be animated
+        end - value of the attribute at the end of the animation
+        duration - duration of the animation in seconds
+        easing - easing curve of the animation. Defaults to ease_out_quad.
+        on_update - function called after each step of the animation.
+                    Defaults to None.
+        on_complete - function called when the animation has finished.
+                      Defaults to None.
+
+        parameters: object, str, float, float, callable, callable, callable
+        returns: Tween
+        """
+
+        tween = Tween(target, attribute, end, duration, easing,
+                      on_update, on_complete)
+
+        self.tweens[(id(target), attribute)] = tween
+
+        self._schedule()
+
+        return tween
+
+    def play(self, group):
+        """Start playing an animation group.
+
+        group - animation group to be played
+
+        parameters: AnimationGroup
+        """
+
+        if group not in self.groups:
+            self.groups.append(group)
+
+        self._schedule()
+
+    def stop(self, group):
+        """Stop playing an animation group. The targets keep their current
+        values and on_complete is not called.
+
+        group - animation group to be stopped
+
+        parameters: AnimationGroup
+        """
+
+        if group in self.groups:
+            self.groups.remove(group)
+
+    def cancel(self, target, attribute=None):
+        """Stop animating an object. The attributes keep their current values
+        and on_complete is not called.
+
+        target - animated object
+        attribute - name of the attribute. Defaults to None (all of the
+                    attributes of the object).
+
+        parameters: object, str
+        """
+
+        for key in list(self.tweens):
+            if key[0] == id(target) and \
+                (attribute is None or key[1] == attribute):
+                del self.tweens[key]
+
+    def is_animating(self, target, attribute=None):
+        """Check if an object is being animated.
+
+        target - object to check
+        attribute - name of the attribute. Defaults to None (any attribute).
+
+        parameters: object, str
+        returns: bool
+        """
+
+        if attribute is not None:
+            return (id(target), attribute) in self.tweens
+
+        return any(key[0] == id(target) for key in self.tweens)
+
+    def tick(self, delta):
+        """Advance all of the tweens, and remove the finished ones. This is
+        called by the pyglet clock while there are tweens running.
+
+        delta - time elapsed since the last tick
+
+        parameters: float
+        """
+
+        for key, tween in list(self.tweens.items()):
+            if self.tweens.get(key) is not tween:
+                # Cancelled or replaced by a callback of another tween
+                continue
+
+            if not tween.tick(delta) and self.tweens.get(key) is tween:
+                del self.tweens[key]
+
+        for group in list(self.groups):
+            if group in self.groups and not group.tick(delta):
+                self.groups.remove(group)
+
+        if not self.tweens and not self.groups:
+            unschedule(self.tick)
+
+            self.scheduled = False
+
+
+animator = Animator()
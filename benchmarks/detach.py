@@ -0,0 +1,114 @@
+"""Detach and attach round trip check of text widgets for arcade-gui.
+
+Entries and text areas are detached and attached again, directly and through
+a WidgetPool, in a hidden window. Their layouts must keep their documents and
+batches, stay editable, and must not be relayouted by the round trip.
+
+    python benchmarks/detach.py
+    python benchmarks/detach.py --rounds 1000 --headless
+"""
+
+from argparse import ArgumentParser
+from sys import exit
+from time import perf_counter
+
+from entry_layout import count_calls, run_frames
+from memory import directory, load
+
+
+def check(gui, widget, rounds, round_trip):
+    """Detach and attach a widget a number of times, and check its layout.
+
+    gui - module of the widgets
+    widget - entry or text area to check
+    rounds - amount of round trips
+    round_trip - function detaching and attaching the widget, and returning
+                 the attached widget
+
+    parameters: module, Widget, int, callable
+    returns: tuple (float, list) (seconds per round trip, problems found)
+    """
+
+    problems = []
+
+    document = widget.layout.document
+    relayouts = count_calls(widget.layout, "_update")
+
+    start = perf_counter()
+
+    for i in range(rounds):
+        widget = round_trip(widget)
+
+    elapsed = (perf_counter() - start) / rounds
+
+    if relayouts[0]:
+        problems.append(f"relayouted {relayouts[0]} times")
+
+    if widget.layout.document is not document:
+        problems.append("lost its document")
+    if widget.layout.batch is not gui.get_batch():
+        problems.append("lost its batch")
+
+    try:
+        widget.layout.document.insert_text(0, "Attached ")
+        run_frames(gui, 1)
+    except Exception as exception:
+        problems.append(f"cannot be edited: {exception!r}")
+
+    return elapsed, problems
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+
+    parser.add_argument("--rounds", type=int, default=100,
+                        help="amount of round trips of each widget")
+    parser.add_argument("--headless", action="store_true",
+                        help="use pyglet's headless mode")
+
+    arguments = parser.parse_args()
+
+    gui = load(directory, arguments.headless)
+
+    def detach_attach(widget):
+        widget.detach()
+        run_frames(gui, 1)
+        widget.attach()
+
+        return widget
+
+    def pooled(pool):
+        def release_acquire(widget):
+            pool.release(widget)
+            run_frames(gui, 1)
+
+            return pool.acquire()
+
+        return release_acquire
+
+    cases = []
+
+    for widget in (gui.Entry, gui.TextArea):
+        cases.append((f"{widget.__name__}.detach/attach",
+                      widget(200, 200, text="Hello world!"), detach_attach))
+
+        pool = gui.WidgetPool(widget, 200, 200, text="Hello world!")
+
+        cases.append((f"WidgetPool({widget.__name__})", pool.acquire(),
+                      pooled(pool)))
+
+    failed = False
+
+    for name, widget, round_trip in cases:
+        elapsed, problems = check(gui, widget, arguments.rounds, round_trip)
+
+        failed = failed or bool(problems)
+
+        print(f"{name:<28} {elapsed * 1000:8.3f} ms per round trip "
+              f"{', '.join(problems) or 'ok'}")
+
+    exit(failed)
+
+
+if __name__ == "__main__":
+    main()
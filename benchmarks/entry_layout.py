@@ -0,0 +1,103 @@
+"""Regression benchmark of the entry layout for arcade-gui.
+
+An entry is updated and drawn for many idle frames in a hidden window. Its
+IncrementalTextLayout must not be relayouted or moved on any of them, and
+moving the entry must move its layout exactly once.
+
+    python benchmarks/entry_layout.py
+    python benchmarks/entry_layout.py --frames 1000 --headless
+"""
+
+from argparse import ArgumentParser
+from sys import exit
+from time import perf_counter
+
+from memory import directory, load
+
+
+def count_calls(instance, name):
+    """Count the calls of a method of an instance.
+
+    instance - instance with the method
+    name - name of the method
+
+    parameters: object, str
+    returns: list (with the amount of calls as its only item)
+    """
+
+    method = getattr(instance, name)
+    calls = [0]
+
+    def counted(*args, **kwargs):
+        calls[0] += 1
+
+        return method(*args, **kwargs)
+
+    setattr(instance, name, counted)
+
+    return calls
+
+
+def run_frames(gui, frames):
+    """Update and draw the widgets for a number of frames.
+
+    gui - module of the widgets
+    frames - amount of frames
+
+    parameters: module, int
+    returns: float (seconds per frame)
+    """
+
+    window = gui.container.window
+
+    start = perf_counter()
+
+    for frame in range(frames):
+        window.dispatch_event("on_update", 1 / 60)
+
+        window.clear()
+        gui.container.draw()
+
+    return (perf_counter() - start) / frames
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+
+    parser.add_argument("--frames", type=int, default=600,
+                        help="amount of idle frames")
+    parser.add_argument("--headless", action="store_true",
+                        help="use pyglet's headless mode")
+
+    arguments = parser.parse_args()
+
+    gui = load(directory, arguments.headless)
+
+    entry = gui.Entry(200, 200, "Hello world!")
+
+    # The first frame may still lay out the initial text
+    run_frames(gui, 1)
+
+    relayouts = count_calls(entry.layout, "_update")
+    moves = entry.layout_updates
+
+    elapsed = run_frames(gui, arguments.frames)
+
+    idle_relayouts = relayouts[0]
+    idle_moves = entry.layout_updates - moves
+
+    entry.x += 10
+
+    run_frames(gui, 1)
+
+    print(f"{arguments.frames} idle frames, {elapsed * 1000:.3f} ms each")
+    print(f"relayouts on idle frames  {idle_relayouts}")
+    print(f"moves on idle frames      {idle_moves}")
+    print(f"moves after moving once   {entry.layout_updates - moves}")
+
+    exit(bool(idle_relayouts or idle_moves or
+              entry.layout_updates - moves != 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Memory benchmark of widgets for arcade-gui.
+
+The Python memory taken by each Button, Label, and Entry is measured with
+tracemalloc, by creating many of them in a hidden window. Run it against
+another checkout to compare before and after, for example the baseline:
+
+    git worktree add /tmp/baseline 7b69be3
+    python benchmarks/memory.py --tree /tmp/baseline
+    python benchmarks/memory.py
+
+Only memory allocated by Python is counted, not textures or vertex buffers.
+"""
+
+from argparse import ArgumentParser
+from gc import collect
+from importlib.util import module_from_spec, spec_from_file_location
+from os.path import abspath, dirname, join
+from sys import modules, path
+from tracemalloc import get_traced_memory, start, stop
+
+directory = dirname(dirname(abspath(__file__)))
+
+# Widgets measured, and how to create one at a position
+WIDGETS = {
+    "Button" : lambda gui, x, y: gui.Button("Button", x, y),
+    "Label" : lambda gui, x, y: gui.Label("Label", x, y),
+    "Entry" : lambda gui, x, y: gui.Entry(x, y)
+}
+
+
+def load(tree, headless):
+    """Import the widgets of a checkout, and open a hidden window for them.
+
+    tree - directory of the checkout
+    headless - use pyglet's headless mode, for machines without a display
+
+    parameters: str, bool
+    returns: module
+    """
+
+    if headless:
+        import pyglet
+
+        pyglet.options["headless"] = True
+
+    path.insert(0, tree)
+
+    spec = spec_from_file_location("arcade_gui", join(tree, "__init__.py"))
+    gui = module_from_spec(spec)
+    modules["arcade_gui"] = gui
+    spec.loader.exec_module(gui)
+
+    from arcade import Window
+
+    window = Window(800, 600, "Memory", visible=False)
+
+    gui.container.window = window
+
+    return gui
+
+
+def measure(gui, name, amount):
+    """Measure the memory taken by a widget.
+
+    gui - module of the widgets
+    name - name of the widget
+    amount - amount of widgets to create
+
+    parameters: module, str, int
+    returns: float (bytes per widget)
+    """
+
+    create = WIDGETS[name]
+
+    # The first widget loads its textures and fonts, which are shared
+    warmup = create(gui, 0, 0)
+
+    collect()
+    start()
+
+    before = get_traced_memory()[0]
+
+    widgets = [create(gui, i % 800, i // 800 % 600) for i in range(amount)]
+
+    collect()
+
+    after = get_traced_memory()[0]
+
+    stop()
+
+    del widgets, warmup
+
+    return (after - before) / amount
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+
+    parser.add_argument("--tree", default=directory,
+                        help="checkout to measure. Defaults to this one.")
+    parser.add_argument("--amount", type=int, default=1000,
+                        help="amount of each widget to create")
+    parser.add_argument("--headless", action="store_true",
+                        help="use pyglet's headless mode")
+
+    arguments = parser.parse_args()
+
+    gui = load(abspath(arguments.tree), arguments.headless)
+
+    print(f"{arguments.tree} ({arguments.amount} of each widget)")
+
+    for name in WIDGETS:
+        size = measure(gui, name, arguments.amount)
+
+        print(f"{name:<8} {size:10.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Import-time budget benchmark for arcade-gui.
+
+Every import is timed in a fresh interpreter, so modules cached by an earlier
+import are not counted. Importing constants and key is what command line tools
+do, and importing the widgets must not create a Tk root, a window, or a batch.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --widgets 1.5 --runs 10
+"""
+
+from argparse import ArgumentParser
+from os.path import abspath, dirname, join
+from subprocess import run
+from sys import executable, exit
+
+directory = dirname(dirname(abspath(__file__)))
+
+# Modules that must not be imported by importing the toolkit. Modules that
+# importing arcade alone already loads, like pymunk, are not counted.
+FORBIDDEN = ("tkinter", "webbrowser", "pymunk")
+
+SCRIPT = """
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+from time import perf_counter
+
+sys.path.insert(0, {directory!r})
+
+start = perf_counter()
+
+if {target!r} == "widgets":
+    spec = spec_from_file_location("arcade_gui", {init!r})
+    module = module_from_spec(spec)
+    sys.modules["arcade_gui"] = module
+    spec.loader.exec_module(module)
+
+    assert module._batch is None, "a batch was created at import"
+else:
+    __import__({target!r})
+
+elapsed = perf_counter() - start
+
+forbidden = [name for name in {forbidden!r} if name in sys.modules]
+
+print(elapsed, " ".join(forbidden))
+"""
+
+
+def measure(target, runs):
+    """Measure the time an import takes in a fresh interpreter.
+
+    target - module to import, like "arcade", or "widgets" for the whole
+             toolkit
+    runs - amount of interpreters to start. The fastest run is kept.
+
+    parameters: str, int
+    returns: tuple (float, list) (seconds, forbidden modules imported)
+    """
+
+    script = SCRIPT.format(directory=directory,
+                           init=join(directory, "__init__.py"),
+                           target=target,
+                           forbidden=FORBIDDEN)
+
+    times = []
+    forbidden = []
+
+    for i in range(runs):
+        result = run([executable, "-c", script], capture_output=True,
+                     text=True, cwd=directory)
+
+        if result.returncode:
+            raise RuntimeError(f"importing {target} failed:\n"
+                               f"{result.stderr}")
+
+        elapsed, *forbidden = result.stdout.split()
+
+        times.append(float(elapsed))
+
+    return min(times), forbidden
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+
+    parser.add_argument("--constants", type=float, default=0.01,
+                        help="budget of importing constants, in seconds")
+    parser.add_argument("--key", type=float, default=0.15,
+                        help="budget of importing key, in seconds")
+    parser.add_argument("--widgets", type=float, default=1.0,
+                        help="budget of importing the widgets, in seconds")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="amount of runs of each import")
+
+    arguments = parser.parse_args()
+
+    budgets = {
+        "constants" : arguments.constants,
+        "key" : arguments.key,
+        "widgets" : arguments.widgets
+    }
+
+    failed = False
+
+    # Modules loaded by the dependencies are not caused by the toolkit
+    arcade = set(measure("arcade", 1)[1])
+
+    for target, budget in budgets.items():
+        elapsed, forbidden = measure(target, arguments.runs)
+
+        forbidden = [name for name in forbidden if name not in arcade]
+
+        status = "ok"
+
+        if elapsed > budget:
+            status = "over budget"
+            failed = True
+
+        if forbidden:
+            status = f"imported {', '.join(forbidden)}"
+            failed = True
+
+        print(f"{target:<10} {elapsed * 1000:8.1f} ms "
+              f"(budget {budget * 1000:.0f} ms) {status}")
+
+    exit(failed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Shared image cache for inline HTML images in arcade-gui."""
+
+from collections import OrderedDict
+
+from pyglet.image import load
+from pyglet.image.atlas import AllocatorException, TextureBin
+
+__all__ = [
+           "ImageCache",
+           "image_cache"
+          ]
+
+
+class ImageCache:
+    """Process-wide cache of textures used by <img> elements.
+
+    Decoding a PNG and uploading it to the GPU is far slower than laying out
+    the text around it. Labels that repeat the same icon (status dots, flags,
+    and so on) would otherwise decode the image again for every label and every
+    text change. Textures are keyed by (location, filename), so every label
+    asking for the same file gets the same texture back.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, atlas=False,
+                 atlas_size=1024, atlas_max=256):
+        """Initialize an image cache.
+
+        >>> cache = ImageCache(max_bytes=4 * 1024 * 1024, atlas=True)
+        >>> texture = cache.get(location, "status_green.png")
+        >>> texture is cache.get(location, "status_green.png")
+        True
+
+        max_bytes - size budget of the cache in bytes, estimated as four bytes
+                    per pixel. When the budget is exceeded, the least recently
+                    used images are evicted. Defaults to 32 MiB.
+        atlas - pack small images into a shared texture atlas. This reduces
+                texture switches when drawing many icons. Defaults to False.
+        atlas_size - width and height of each atlas texture. Defaults to 1024.
+        atlas_max - images larger than this in either dimension get their own
+                    texture instead of being packed. Defaults to 256.
+
+        Images packed into an atlas still count towards the budget, but their
+        space in the atlas is not reclaimed when they are evicted, as pyglet
+        atlases cannot free regions.
+
+        properties:
+            textures - internal map of cached textures, least recent first
+            size - estimated size of all cached textures in bytes
+            hits - number of lookups served from the cache
+            misses - number of lookups that had to load the image
+
+        parameters: int, bool, int, int
+        """
+
+        self.max_bytes = max_bytes
+        self.atlas = atlas
+        self.atlas_size = atlas_size
+        self.atlas_max = atlas_max
+
+        self.textures = OrderedDict()
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self._bin = None
+
+    def _get_key(self, location, filename):
+        """Get the key of an image. Pyglet creates a new FileLocation each time
+        a document is decoded without one, so locations are compared by their
+        path instead of their identity.
+
+        location - pyglet resource location of the image
+        filename - filename of the image relative to the location
+
+        parameters: Location, str
+        returns: tuple
+        """
+
+        path = getattr(location, "path", None)
+
+        if path is None:
+            path = getattr(location, "dir", location)
+
+        return (path, filename)
+
+    def _load(self, location, filename):
+        """Load an image and upload it to the GPU.
+
+        location - pyglet resource location of the image
+        filename - filename of the image relative to the location
+
+        parameters: Location, str
+        returns: pyglet.image.Texture or TextureRegion
+        """
+
+        with location.open(filename) as file:
+            image = load(filename, file=file)
+
+        if self.atlas and \
+            image.width <= self.atlas_max and \
+            image.height <= self.atlas_max:
+            if self._bin is None:
+                self._bin = TextureBin(self.atlas_size, self.atlas_size)
+
+            try:
+                return self._bin.add(image)
+            except AllocatorException:
+                pass
+
+        return image.get_texture()
+
+    def get(self, location, filename):
+        """Get the texture of an image, loading it if it is not cached.
+
+        location - pyglet resource location of the image
+        filename - filename of the image relative to the location
+
+        parameters: Location, str
+        returns: pyglet.image.Texture or TextureRegion
+        """
+
+        key = self._get_key(location, filename)
+
+        texture = self.textures.get(key)
+
+        if texture is not None:
+            self.textures.move_to_end(key)
+            self.hits += 1
+
+            return texture
+
+        self.misses += 1
+
+        texture = self._load(location, filename)
+
+        self.textures[key] = texture
+        self.size += texture.width * texture.height * 4
+
+        self.evict()
+
+        return texture
+
+    def evict(self, max_bytes=None):
+        """Evict the least recently used textures until the cache fits in its
+        budget. The most recent texture is never evicted, so an image larger
+        than the whole budget can still be displayed.
+
+        max_bytes - budget to evict down to. Defaults to the max_bytes
+                    property.
+
+        parameters: int
+        """
+
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        while self.size > max_bytes and len(self.textures) > 1:
+            key, texture = self.textures.popitem(last=False)
+
+            self.size -= texture.width * texture.height * 4
+
+    def clear(self):
+        """Clear the cache. Labels that are already displayed keep their
+        textures until they are decoded again.
+        """
+
+        self.textures.clear()
+        self.size = 0
+
+        self._bin = None
+
+
+image_cache = ImageCache()
@@ -0,0 +1,256 @@
+"""Clipboard backends for arcade-gui."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+__all__ = [
+           "MemoryClipboard",
+           "TkClipboard",
+           "Clipboard",
+           "clipboard"
+          ]
+
+
+class MemoryClipboard:
+    """Clipboard stored in memory. This is used when there is no display, for
+    example in headless runs and tests. The text is only shared within the
+    application.
+    """
+
+    def __init__(self):
+        """Initialize a memory clipboard.
+
+        properties:
+            text - text of the clipboard
+        """
+
+        self.text = ""
+
+    def get(self):
+        """Get the text of the clipboard.
+
+        returns: str
+        """
+
+        return self.text
+
+    def append(self, text):
+        """Append some text to the clipboard.
+
+        text - text to append to the clipboard
+
+        parameters: str
+        """
+
+        self.text += text
+
+    def clear(self):
+        """Clear the clipboard."""
+
+        self.text = ""
+
+
+class TkClipboard:
+    """Clipboard of the system, accessed with tkinter. Tkinter is imported and
+    its root is created on first use, not when the module is imported. Tk can
+    only be used from the thread that created it, so every call is made on a
+    single worker thread, which also keeps large clipboards from blocking the
+    frame when they are read with get_async.
+    """
+
+    def __init__(self):
+        """Initialize a tkinter clipboard. Nothing is created until the
+        clipboard is first used.
+        """
+
+        self._root = None
+        self._executor = None
+
+    def _get_root(self):
+        """Get the tkinter root, creating it if needed. This may only be
+        called on the worker thread.
+
+        returns: tkinter.Tk
+        """
+
+        if self._root is None:
+            from tkinter import Tk
+
+            self._root = Tk()
+            self._root.withdraw()
+
+        return self._root
+
+    def _submit(self, function, *args):
+        """Call a function on the worker thread.
+
+        function - function to be called with the tkinter root
+        *args - arguments of the function
+
+        parameters: callable, *any
+        returns: Future
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="clipboard"
+            )
+
+        return self._executor.submit(
+            lambda: function(self._get_root(), *args)
+        )
+
+    def open(self):
+        """Create the tkinter root. This raises an error if there is no
+        display.
+        """
+
+        self._submit(lambda root: None).result()
+
+    def get_async(self):
+        """Get the text of the clipboard without blocking.
+
+        returns: Future (of str)
+        """
+
+        return self._submit(self._get_text)
+
+    def _get_text(self, root):
+        """Get the text of the clipboard on the worker thread.
+
+        root - tkinter root
+
+        parameters: tkinter.Tk
+        returns: str
+        """
+
+        try:
+            return root.clipboard_get()
+        except Exception:
+            # Tkinter raises an error if the clipboard is empty
+            return ""
+
+    def get(self):
+        """Get the text of the clipboard. This blocks until it is read.
+
+        returns: str
+        """
+
+        return self.get_async().result()
+
+    def append(self, text):
+        """Append some text to the clipboard. This does not block.
+
+        text - text to append to the clipboard
+
+        parameters: str
+        """
+
+        self._submit(lambda root: root.clipboard_append(text))
+
+    def clear(self):
+        """Clear the clipboard. This does not block."""
+
+        self._submit(lambda root: root.clipboard_clear())
+
+
+class Clipboard:
+    """Clipboard used by the widgets. Its backend is chosen on first use. The
+    system clipboard (TkClipboard) is used if it can be opened, otherwise the
+    MemoryClipboard is used.
+    """
+
+    def __init__(self, backend=None):
+        """Initialize a clipboard. You shouldn't usually need to create an
+        instance of this class directly. Use the clipboard variable.
+
+        >>> future = clipboard.get_async()
+        >>> # Some frames later...
+        >>> if future.done():
+                text = future.result()
+
+        backend - backend of the clipboard. If None, it is chosen on first
+                  use. Defaults to None.
+
+        properties:
+            backend - backend of the clipboard
+
+        parameters: MemoryClipboard or TkClipboard
+        """
+
+        self._backend = backend
+
+    def _get_backend(self):
+        """Get the backend of the clipboard, choosing one if it is not set.
+
+        returns: MemoryClipboard or TkClipboard
+        """
+
+        if self._backend is None:
+            backend = TkClipboard()
+
+            try:
+                backend.open()
+            except Exception:
+                # No display or no Tcl/Tk installation
+                backend = MemoryClipboard()
+
+            self._backend = backend
+
+        return self._backend
+
+    def _set_backend(self, backend):
+        """Set the backend of the clipboard.
+
+        backend - backend of the clipboard, or None to choose it on first use
+
+        parameters: MemoryClipboard or TkClipboard
+        """
+
+        self._backend = backend
+
+    backend = property(_get_backend, _set_backend)
+
+    def get(self):
+        """Get the text of the clipboard. This blocks until it is read. Use
+        get_async in event handlers.
+
+        returns: str
+        """
+
+        return self.backend.get()
+
+    def get_async(self):
+        """Get the text of the clipboard without blocking. The text can be
+        read from the future when it is done.
+
+        returns: Future (of str)
+        """
+
+        backend = self.backend
+
+        if hasattr(backend, "get_async"):
+            return backend.get_async()
+
+        future = Future()
+        future.set_result(backend.get())
+
+        return future
+
+    def append(self, text):
+        """Append some text to the clipboard.
+
+        text - text to append to the clipboard
+
+        parameters: str
+        """
+
+        self.backend.append(text)
+
+    def clear(self):
+        """Clear the clipboard."""
+
+        self.backend.clear()
+
+
+clipboard = Clipboard()
@@ -13,18 +13,46 @@ BOTTOM = "bottom"
 SINGLE = "single"
 MULTIPLE = "multiple"
 
+# Widget states, packed into the state flags of a widget
+HOVER = 1 << 0
+PRESS = 1 << 1
+DISABLE = 1 << 2
+DRAG = 1 << 3
+FOCUS = 1 << 4
+
 DISABLE_ALPHA = 160 # Alpha of disabled widget
 FOCUS_SIZE = 1.05 # [DEPRECATED]
 
 X = 0
 Y = 0
 
+# Validation
+REJECT = "reject" # Invalid text is rejected entirely
+FILTER = "filter" # Invalid characters are removed from the text
+
 ENTRY_BLINK_INTERVAL = 0.5 # Interval in seconds the caret blinks in an entry
 
-TOGGLE_VELOCITY = 2 # How fast the knob moves in a toggle
-TOGGLE_FADE = 17 # How fast the toggle fades during transitions
+COMBOBOX_ROWS = 3 # Amount of options displayed in a combobox
+COMBOBOX_THREAD_THRESHOLD = 50000 # Options filtered on a worker thread
+COMBOBOX_READ_AHEAD = 64 # Options fetched at once from a provider
+COMBOBOX_CACHE_PAGES = 16 # Fetched pages of options cached by a provider
+
+TEXTAREA_SCROLL_SPEED = 20 # Pixels a text area scrolls per mouse wheel notch
+
+LISTBOX_ROWS = 10 # Amount of rows displayed in a list box
+LISTBOX_ROW_HEIGHT = 20 # Height of a row in a list box
+LISTBOX_SELECT_COLOR = (0, 120, 215, 80) # Background of selected rows
+
+DATAGRID_ROWS = 20 # Amount of rows displayed in a data grid
+DATAGRID_COLUMNS = 5 # Amount of columns displayed in a data grid
+DATAGRID_ROW_HEIGHT = 20 # Height of a row in a data grid
+
+TOGGLE_VELOCITY = 2 # [DEPRECATED]
+TOGGLE_FADE = 17 # [DEPRECATED]
+TOGGLE_DURATION = 0.25 # Seconds the knob of a toggle takes to switch
 
-SLIDER_VELOCITY = 10 # How fast does the slider glide
+SLIDER_VELOCITY = 10 # [DEPRECATED]
+SLIDER_DURATION = 0.15 # Seconds the knob of a slider takes to glide
 KNOB_HOVER_SCALE = 1.1
 
 HORIZONTAL = "horizontal"
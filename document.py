@@ -0,0 +1,563 @@
+"""Rope-backed text storage and documents for arcade-gui."""
+
+from random import random
+
+from pyglet.text.document import (AbstractDocument, FormattedDocument,
+                                  UnformattedDocument)
+
+__all__ = [
+           "Rope",
+           "RopeDocument",
+           "FormattedRopeDocument"
+          ]
+
+CHUNK_SIZE = 1024 # Size of the chunks text is split into
+MAX_CHUNK_SIZE = 2048 # Size a chunk may grow to before it is split
+
+
+class _Node:
+    """Node of a rope. Ropes are stored as a treap ordered by position, so
+    every node holds a chunk of text and the size of its subtree.
+    """
+
+    __slots__ = ("chunk", "size", "priority", "left", "right")
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+        self.size = len(chunk)
+        self.priority = random()
+
+        self.left = None
+        self.right = None
+
+
+def _size(node):
+    return node.size if node else 0
+
+def _update(node):
+    node.size = len(node.chunk) + _size(node.left) + _size(node.right)
+
+def _merge(left, right):
+    """Merge two treaps, keeping all of left before right.
+
+    parameters: _Node, _Node
+    returns: _Node
+    """
+
+    if not left:
+        return right
+    if not right:
+        return left
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+
+        return left
+
+    right.left = _merge(left, right.left)
+    _update(right)
+
+    return right
+
+def _split(node, index):
+    """Split a treap into the text before an index and the text after it. A
+    chunk is split in two if the index falls inside of it.
+
+    parameters: _Node, int
+    returns: tuple (_Node, _Node)
+    """
+
+    if not node:
+        return None, None
+
+    left_size = _size(node.left)
+    chunk_end = left_size + len(node.chunk)
+
+    if index <= left_size:
+        left, node.left = _split(node.left, index)
+        _update(node)
+
+        return left, node
+
+    if index >= chunk_end:
+        node.right, right = _split(node.right, index - chunk_end)
+        _update(node)
+
+        return node, right
+
+    offset = index - left_size
+
+    right = _merge(_Node(node.chunk[offset:]), node.right)
+
+    node.chunk = node.chunk[:offset]
+    node.right = None
+    _update(node)
+
+    return node, right
+
+def _build(text):
+    """Build a treap from some text.
+
+    parameters: str
+    returns: _Node
+    """
+
+    root = None
+
+    for i in range(0, len(text), CHUNK_SIZE):
+        root = _merge(root, _Node(text[i : i + CHUNK_SIZE]))
+
+    return root
+
+def _chunks(node, offset, start, end, reverse):
+    """Iterate over the chunks of a treap overlapping start and end, with
+    their positions.
+
+    parameters: _Node, int, int, int, bool
+    returns: generator of tuple (int, str)
+    """
+
+    if not node or start >= offset + node.size or end <= offset:
+        return
+
+    position = offset + _size(node.left)
+    chunk = (position, node.chunk)
+
+    overlaps = node.chunk and position < end and \
+               position + len(node.chunk) > start
+
+    if reverse:
+        yield from _chunks(node.right, position + len(node.chunk),
+                           start, end, reverse)
+
+        if overlaps:
+            yield chunk
+
+        yield from _chunks(node.left, offset, start, end, reverse)
+    else:
+        yield from _chunks(node.left, offset, start, end, reverse)
+
+        if overlaps:
+            yield chunk
+
+        yield from _chunks(node.right, position + len(node.chunk),
+                           start, end, reverse)
+
+
+class Rope:
+    """Mutable text stored as a balanced tree of chunks.
+
+    Inserting into or deleting from a Python str copies the whole string, so
+    with several megabytes of text every keystroke becomes slow. A rope only
+    touches the chunks around the edit, which takes O(log n) time, and its
+    length is always known.
+
+    A rope can be used in most places a str is read. It can be indexed and
+    sliced (which returns a str), searched with find and rfind, and compared
+    with a str. Converting it with str() joins all of its chunks, and the
+    result is cached until the rope is changed.
+    """
+
+    def __init__(self, text=""):
+        """Initialize a rope.
+
+        >>> rope = Rope("Hello!")
+        >>> rope.insert(5, " world")
+        >>> rope[0:5]
+        "Hello"
+        >>> len(rope)
+        12
+
+        text - initial text of the rope
+
+        parameters: str
+        """
+
+        self._root = _build(text)
+        self._string = text
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __str__(self):
+        if self._string is None:
+            self._string = "".join(
+                chunk for position, chunk in self.chunks()
+            )
+
+        return self._string
+
+    def __repr__(self):
+        return f"Rope({len(self)} characters)"
+
+    def __eq__(self, other):
+        if isinstance(other, Rope):
+            other = str(other)
+
+        if isinstance(other, str):
+            return len(self) == len(other) and str(self) == other
+
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __iter__(self):
+        for position, chunk in self.chunks():
+            yield from chunk
+
+    def __contains__(self, text):
+        return self.find(text) >= 0
+
+    def __getitem__(self, index):
+        """Get a character or a slice of the rope. Slices are returned as a
+        str, like slices of a str, including extended and negative steps. Only
+        the chunks inside the slice are visited.
+
+        index - index or slice to get
+
+        parameters: int or slice
+        returns: str
+        """
+
+        length = len(self)
+
+        if isinstance(index, slice):
+            if self._string is not None:
+                return self._string[index]
+
+            indices = range(*index.indices(length))
+
+            if not indices:
+                return ""
+
+            # Characters between the first and last index, in order
+            start = min(indices[0], indices[-1])
+            end = max(indices[0], indices[-1]) + 1
+
+            text = "".join(
+                chunk[max(start - position, 0) : end - position]
+                for position, chunk in self.chunks(start, end)
+            )
+
+            # A negative step starts from the last character, like indices[0]
+            return text if indices.step == 1 else text[::indices.step]
+
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError("rope index out of range")
+
+        node = self._root
+
+        while True:
+            left_size = _size(node.left)
+
+            if index < left_size:
+                node = node.left
+            elif index < left_size + len(node.chunk):
+                return node.chunk[index - left_size]
+            else:
+                index -= left_size + len(node.chunk)
+                node = node.right
+
+    def chunks(self, start=0, end=None, reverse=False):
+        """Iterate over the chunks of text, with their positions.
+
+        start - start of the text to iterate over
+        end - end of the text to iterate over. Defaults to the end of the rope.
+        reverse - iterate from the end of the text to its start
+
+        parameters: int, int, bool
+        returns: generator of tuple (int, str)
+        """
+
+        if end is None:
+            end = len(self)
+
+        return _chunks(self._root, 0, start, end, reverse)
+
+    def insert(self, index, text):
+        """Insert some text at an index. Small insertions are added to the
+        chunk they fall in, so typing does not create a node per character.
+
+        index - index of the text addition
+        text - text to be added
+
+        parameters: int, str
+        """
+
+        if not text:
+            return
+
+        index = max(0, min(index, len(self)))
+
+        self._string = None
+
+        path = []
+        node = self._root
+        start = index
+
+        while node:
+            path.append(node)
+
+            left_size = _size(node.left)
+
+            if node.left and index <= left_size:
+                node = node.left
+            elif index <= left_size + len(node.chunk):
+                offset = index - left_size
+
+                if len(node.chunk) + len(text) > MAX_CHUNK_SIZE:
+                    break
+
+                node.chunk = node.chunk[:offset] + text + node.chunk[offset:]
+
+                for parent in path:
+                    parent.size += len(text)
+
+                return
+            else:
+                index -= left_size + len(node.chunk)
+                node = node.right
+
+        left, right = _split(self._root, start)
+
+        self._root = _merge(_merge(left, _build(text)), right)
+
+    def delete(self, start, end):
+        """Delete the text between start and end. Deletions that stay inside
+        one chunk edit that chunk directly.
+
+        start - start of the text to be deleted
+        end - end of the text to be deleted
+
+        parameters: int, int
+        """
+
+        start = max(0, start)
+        end = min(end, len(self))
+
+        if end <= start:
+            return
+
+        self._string = None
+
+        path = []
+        node = self._root
+        index = start
+
+        while node:
+            path.append(node)
+
+            left_size = _size(node.left)
+
+            if index < left_size:
+                node = node.left
+            elif index < left_size + len(node.chunk):
+                offset = index - left_size
+
+                if offset + end - start >= len(node.chunk):
+                    break
+
+                node.chunk = node.chunk[:offset] + \
+                             node.chunk[offset + end - start:]
+
+                for parent in path:
+                    parent.size -= end - start
+
+                return
+            else:
+                index -= left_size + len(node.chunk)
+                node = node.right
+
+        left, rest = _split(self._root, start)
+        middle, right = _split(rest, end - start)
+
+        self._root = _merge(left, right)
+
+    def find(self, sub, start=0, end=None):
+        """Get the lowest index where a substring is found between start and
+        end, like str.find.
+
+        sub - substring to find
+        start - start of the search
+        end - end of the search. Defaults to the end of the rope.
+
+        parameters: str, int, int
+        returns: int (-1 if not found)
+        """
+
+        length = len(self)
+
+        if end is None or end > length:
+            end = length
+
+        if self._string is not None:
+            return self._string.find(sub, start, end)
+
+        if not sub:
+            return start if start <= end else -1
+
+        carry = ""
+
+        for position, chunk in self.chunks(start, end):
+            piece_start = max(start, position)
+            text = carry + chunk[piece_start - position : end - position]
+
+            index = text.find(sub)
+
+            if index >= 0:
+                return piece_start - len(carry) + index
+
+            carry = text[-(len(sub) - 1):] if len(sub) > 1 else ""
+
+        return -1
+
+    def rfind(self, sub, start=0, end=None):
+        """Get the highest index where a substring is found between start and
+        end, like str.rfind.
+
+        sub - substring to find
+        start - start of the search
+        end - end of the search. Defaults to the end of the rope.
+
+        parameters: str, int, int
+        returns: int (-1 if not found)
+        """
+
+        length = len(self)
+
+        if end is None or end > length:
+            end = length
+
+        if self._string is not None:
+            return self._string.rfind(sub, start, end)
+
+        if not sub:
+            return end if start <= end else -1
+
+        carry = ""
+
+        for position, chunk in self.chunks(start, end, reverse=True):
+            piece_start = max(start, position)
+            text = chunk[piece_start - position : end - position] + carry
+
+            index = text.rfind(sub)
+
+            if index >= 0:
+                return piece_start + index
+
+            carry = text[:len(sub) - 1]
+
+        return -1
+
+
+class _RopeDocument(AbstractDocument):
+    """Document whose text is stored in a Rope. The document's text property
+    returns the rope itself, which pyglet's layouts can index and slice without
+    copying the whole text.
+    """
+
+    def _get_text(self):
+        return self._rope
+
+    def _set_text(self, text):
+        self._rope = Rope(str(text))
+
+    _text = property(_get_text, _set_text)
+
+    def get_paragraph_start(self, pos):
+        """Get the starting position of a paragraph, searching the rope instead
+        of running a regular expression over the whole text.
+
+        pos - character position within the paragraph
+
+        parameters: int
+        returns: int
+        """
+
+        if pos < len(self._rope) and self._rope[pos] in "\n\u2029":
+            return pos
+
+        return max(self._rope.rfind("\n", 0, pos + 1),
+                   self._rope.rfind("\u2029", 0, pos + 1)) + 1
+
+    def get_paragraph_end(self, pos):
+        """Get the end position of a paragraph.
+
+        pos - character position within the paragraph
+
+        parameters: int
+        returns: int
+        """
+
+        ends = [index for index in (self._rope.find("\n", pos),
+                                    self._rope.find("\u2029", pos))
+                if index >= 0]
+
+        if not ends:
+            return len(self._rope)
+
+        return min(ends) + 1
+
+    def delete_text(self, start, end):
+        """Delete text from the document. After the text is deleted, an
+        on_remove_text event is dispatched with the start position and the
+        text that was removed, which is used to record undo steps.
+
+        start - start of the text to be deleted
+        end - end of the text to be deleted
+
+        parameters: int, int
+        """
+
+        text = self._rope[start:end]
+
+        super().delete_text(start, end)
+
+        self.dispatch_event("on_remove_text", start, text)
+
+    def _insert_text(self, start, text, attributes):
+        self._rope.insert(start, text)
+
+        len_text = len(text)
+
+        for element in self._elements:
+            if element._position >= start:
+                element._position += len_text
+
+    def _delete_text(self, start, end):
+        for element in list(self._elements):
+            if start <= element._position < end:
+                self._elements.remove(element)
+            elif element._position >= end:
+                element._position -= (end - start)
+
+        self._rope.delete(start, end)
+
+
+_RopeDocument.register_event_type("on_remove_text")
+
+
+class RopeDocument(UnformattedDocument, _RopeDocument):
+    """Unformatted document backed by a Rope. This is used by the entry
+    widget, so editing several megabytes of text does not copy the whole
+    text on each keystroke, and its length is always known.
+
+    The rope only makes the edits of the document itself cheap. A pyglet
+    IncrementalTextLayout still keeps a glyph list for the whole document,
+    and walks all of its lines to find the visible ones after every change,
+    so an edit displayed by a layout stays O(n) in the amount of lines. With
+    a few megabytes of text, a rope is not faster than an UnformattedDocument
+    behind a layout. It mostly helps code that edits the document without
+    displaying it, and reading its length.
+    """
+
+
+class FormattedRopeDocument(FormattedDocument, _RopeDocument):
+    """Formatted document backed by a Rope. Unlike a RopeDocument, styles can
+    be applied to ranges of text, which is used for syntax highlighting.
+    """
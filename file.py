@@ -1,13 +1,294 @@
-import sys
+"""Resource paths and preloading of theme images for arcade-gui."""
 
+from concurrent.futures import ThreadPoolExecutor, wait
+from json import dump, load
+from os import scandir
+from os.path import abspath, dirname, exists
 
-# Get directory paths
-directory = sys.path[0]
+__all__ = [
+           "ResourceManager",
+           "resources",
+           "load_texture",
+           "widgets"
+          ]
+
+
+# Get directory paths. These are relative to this module, not to the entry
+# point of the application.
+directory = dirname(abspath(__file__))
 
 path = f"{directory}/".replace("\\", "/")
 
 image_path = f"{path}resources/"
 
+THEMES = ("blue", "green", "red", "silver", "yellow")
+STATES = ("normal", "hover", "press", "disable", "focus")
+
+
+class ResourceManager:
+    """Manager of the images in the resources directory. The images are
+    listed in a manifest, with their sizes, themes, and states, so they can be
+    found without reading the directory.
+
+    Decoding a PNG is much slower than uploading it. Preloading decodes the
+    images on a pool of worker threads, and the decoded images are turned into
+    textures on the main thread, where OpenGL can be used.
+    """
+
+    def __init__(self, directory=image_path, workers=4):
+        """Initialize a resource manager. Nothing is read until the manifest
+        is needed.
+
+        >>> resources.preload(theme="yellow")
+        >>> # Create the first screen...
+        >>> resources.wait_until_loaded()
+
+        directory - directory of the images
+        workers - amount of threads decoding images. Defaults to 4.
+
+        properties:
+            manifest - map of file names to their width, height, size in
+                       bytes, theme, and state
+            textures - map of paths to loaded textures
+            loaded - fraction of the preloaded images that are loaded
+
+        parameters: str, int
+        """
+
+        self.directory = directory
+        self.workers = workers
+
+        self.textures = {}
+
+        self._manifest = None
+        self._executor = None
+        self._pending = {} # Paths to decoding futures
+        self._total = 0
+        self._scheduled = False
+
+    def _get_manifest(self):
+        """Get the manifest of the images. It is read from manifest.json, or
+        generated if that does not exist.
+
+        returns: dict
+        """
+
+        if self._manifest is None:
+            filename = f"{self.directory}manifest.json"
+
+            if exists(filename):
+                with open(filename) as file:
+                    self._manifest = load(file)
+            else:
+                self._manifest = self.generate_manifest()
+
+        return self._manifest
+
+    def _get_loaded(self):
+        """Get the fraction of the preloaded images that are loaded.
+
+        returns: float
+        """
+
+        if not self._total:
+            return 1.0
+
+        return 1 - len(self._pending) / self._total
+
+    manifest = property(_get_manifest)
+    loaded = property(_get_loaded)
+
+    def generate_manifest(self):
+        """Generate the manifest of the images by reading the directory. The
+        sizes of the images are read from their PNG headers, so they are not
+        decoded.
+
+        returns: dict
+        """
+
+        manifest = {}
+
+        for entry in sorted(scandir(self.directory), key=lambda e: e.name):
+            if not entry.name.endswith(".png"):
+                continue
+
+            with open(entry.path, "rb") as file:
+                header = file.read(24)
+
+            parts = entry.name[:-4].split("_")
+
+            manifest[entry.name] = {
+                "width" : int.from_bytes(header[16:20], "big"),
+                "height" : int.from_bytes(header[20:24], "big"),
+                "bytes" : entry.stat().st_size,
+                "theme" : parts[0] if parts[0] in THEMES else None,
+                "state" : parts[-1] if parts[-1] in STATES else None
+            }
+
+        return manifest
+
+    def write_manifest(self):
+        """Generate the manifest and write it to manifest.json. Run this
+        module to do this after adding or changing images.
+        """
+
+        self._manifest = self.generate_manifest()
+
+        with open(f"{self.directory}manifest.json", "w") as file:
+            dump(self._manifest, file, indent=4)
+            file.write("\n")
+
+    def _decode(self, filename):
+        """Decode an image. This is called on a worker thread.
+
+        filename - path of the image
+
+        parameters: str
+        returns: PIL.Image.Image
+        """
+
+        from PIL.Image import open as open_image
+
+        image = open_image(filename).convert("RGBA")
+        image.load()
+
+        return image
+
+    def preload(self, theme=None):
+        """Start decoding images in the background. This returns immediately.
+        The textures are created on the main thread by poll, which is
+        scheduled with the clock until all of them are loaded.
+
+        theme - only preload images of this theme, and images without a theme.
+                Defaults to None (all of the images).
+
+        parameters: str
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="resources"
+            )
+
+        for name, image in self.manifest.items():
+            if theme is not None and image["theme"] not in (theme, None):
+                continue
+
+            filename = f"{self.directory}{name}"
+
+            if filename in self.textures or filename in self._pending:
+                continue
+
+            self._pending[filename] = self._executor.submit(self._decode,
+                                                            filename)
+            self._total += 1
+
+        if self._pending and not self._scheduled:
+            from pyglet.clock import schedule_interval
+
+            schedule_interval(self.poll, 1 / 60)
+
+            self._scheduled = True
+
+    def _upload(self, filename, future):
+        """Create the texture of a decoded image. This has to be called on the
+        main thread.
+
+        filename - path of the image
+        future - future of the decoded image
+
+        parameters: str, Future
+        returns: arcade.Texture
+        """
+
+        from arcade import Texture
+
+        del self._pending[filename]
+
+        texture = Texture(filename, image=future.result())
+
+        self.textures[filename] = texture
+
+        return texture
+
+    def poll(self, delta=None):
+        """Create the textures of the images that were decoded. This is
+        scheduled by preload, and unscheduled when all of the images are
+        loaded.
+
+        delta - time elapsed since the last poll
+
+        parameters: float
+        """
+
+        for filename, future in list(self._pending.items()):
+            if future.done():
+                self._upload(filename, future)
+
+        if not self._pending and self._scheduled:
+            from pyglet.clock import unschedule
+
+            unschedule(self.poll)
+
+            self._scheduled = False
+
+    def wait_until_loaded(self, timeout=None):
+        """Wait until all of the preloaded images are decoded, and create
+        their textures.
+
+        timeout - maximum time to wait in seconds. Defaults to None (no
+                  limit).
+
+        parameters: float
+        returns: bool (whether all of the images are loaded)
+        """
+
+        wait(list(self._pending.values()), timeout)
+
+        self.poll()
+
+        return not self._pending
+
+    def load_texture(self, filename):
+        """Get the texture of an image. Preloaded textures are returned
+        immediately, and an image that is still being decoded is waited for.
+        Other images are loaded by arcade.
+
+        filename - path of the image, or a texture
+
+        parameters: str or arcade.Texture
+        returns: arcade.Texture
+        """
+
+        if not isinstance(filename, str):
+            return filename
+
+        if filename in self.textures:
+            return self.textures[filename]
+
+        if filename in self._pending:
+            return self._upload(filename, self._pending[filename])
+
+        from arcade import load_texture
+
+        return load_texture(filename)
+
+
+class _ResourceMap(dict):
+    """Map of image names to their paths, like "yellow_button_normal". Paths
+    are built when they are looked up, so the directory is not read.
+    """
+
+    def __missing__(self, name):
+        return f"{image_path}{name}.png"
+
+
+resources = ResourceManager()
+load_texture = resources.load_texture
+
+widgets = _ResourceMap()
+
 
 # To be put into settings
 theme = "yellow"
@@ -32,6 +313,10 @@ toggle_false = f"{image_path}toggle_false.png"
 toggle_true_hover = f"{image_path}toggle_true_hover.png"
 toggle_false_hover = f"{image_path}toggle_false_hover.png"
 
+combobox_top_normal = f"{image_path}combobox_top_normal.png"
+combobox_middle_normal = f"{image_path}combobox_middle_normal.png"
+combobox_bottom_normal = f"{image_path}combobox_bottom_normal.png"
+
 slider_horizontal = f"{image_path}slider_horizontal.png"
 
 knob = f"{image_path}knob.png"
@@ -39,3 +324,7 @@ knob = f"{image_path}knob.png"
 colorchooser = f"{image_path}colorchooser.png"
 
 none = f"{image_path}none.png"
+
+
+if __name__ == "__main__":
+    resources.write_manifest()
@@ -0,0 +1,179 @@
+"""Table models for arcade-gui data grids."""
+
+import numpy
+
+__all__ = [
+           "GridModel"
+          ]
+
+
+def _column(values):
+    """Convert the values of a column to a NumPy array. Strings are stored as
+    objects, because fixed-width string arrays truncate longer values.
+
+    values - values of the column
+
+    parameters: sequence
+    returns: numpy.ndarray
+    """
+
+    values = numpy.asarray(values)
+
+    if values.dtype.kind in "US":
+        return values.astype(object)
+
+    return values
+
+
+class GridModel:
+    """Model of the rows of a DataGrid, stored as NumPy columns. Rows are
+    displayed in the order of the order array, so sorting only argsorts a
+    column and never moves the data.
+    """
+
+    def __init__(self, data):
+        """Initialize a grid model.
+
+        >>> model = GridModel({"id" : [3, 1, 2], "speed" : [4.5, 2.0, 9.1]})
+        >>> model.sort("id")
+        >>> model.cell(0, "speed")
+        2.0
+
+        data - rows of the model, as a NumPy structured array or a dict of
+               column names to sequences of the same length
+
+        properties:
+            columns - names of the columns
+            data - map of column names to NumPy arrays
+            order - indices of the rows, in the displayed order
+            positions - displayed position of each row
+            sort_column - column the rows are sorted by, if sorted
+            reverse - rows are sorted in descending order
+
+        parameters: numpy.ndarray or dict
+        """
+
+        if isinstance(data, numpy.ndarray):
+            if data.dtype.names is None:
+                raise TypeError("Only structured arrays can be displayed.")
+
+            self.columns = list(data.dtype.names)
+            self.data = {name : _column(data[name]) for name in self.columns}
+        else:
+            self.columns = list(data)
+            self.data = {name : _column(values)
+                         for name, values in data.items()}
+
+        lengths = {len(values) for values in self.data.values()}
+
+        if len(lengths) > 1:
+            raise ValueError("All of the columns must have the same length.")
+
+        self.sort_column = None
+        self.reverse = False
+
+        self._set_order(numpy.arange(lengths.pop() if lengths else 0))
+
+    def __len__(self):
+        return len(self.order)
+
+    def _set_order(self, order):
+        """Set the displayed order of the rows, and the inverse of it.
+
+        order - indices of the rows, in the displayed order
+
+        parameters: numpy.ndarray
+        """
+
+        self.order = order
+
+        self.positions = numpy.empty_like(order)
+        self.positions[order] = numpy.arange(len(order))
+
+    def sort(self, column, reverse=False):
+        """Sort the rows by a column. This is a single stable argsort of the
+        column. Rows updated later are not moved until the rows are sorted
+        again.
+
+        column - name of the column
+        reverse - sort in descending order. Defaults to False.
+
+        parameters: str, bool
+        """
+
+        order = numpy.argsort(self.data[column], kind="stable")
+
+        if reverse:
+            order = order[::-1]
+
+        self.sort_column = column
+        self.reverse = reverse
+
+        self._set_order(order)
+
+    def rows(self, start, end):
+        """Get the indices of the rows displayed in a range.
+
+        start - first displayed position
+        end - position after the last one
+
+        parameters: int, int
+        returns: numpy.ndarray
+        """
+
+        return self.order[start:end]
+
+    def cell(self, position, column):
+        """Get the value of a cell.
+
+        position - displayed position of the row
+        column - name of the column
+
+        parameters: int, str
+        returns: any
+        """
+
+        return self.data[column][self.order[position]]
+
+    def update_rows(self, indices, values):
+        """Set the values of some rows.
+
+        indices - indices of the rows
+        values - new values, as a NumPy structured array or a dict of column
+                 names to sequences, in the order of indices. Columns that are
+                 left out are not changed. Columns are upcast if the values do
+                 not fit in them.
+
+        parameters: sequence of int, numpy.ndarray or dict
+        returns: tuple (numpy.ndarray of the displayed positions of the rows,
+                        list of the names of the changed columns)
+        """
+
+        indices = numpy.asarray(indices)
+
+        if isinstance(values, numpy.ndarray):
+            columns = list(values.dtype.names)
+        else:
+            columns = list(values)
+
+        for column in columns:
+            new = numpy.asarray(values[column])
+            old = self.data[column]
+
+            if old.dtype != object:
+                if new.dtype.kind in "US":
+                    dtype = numpy.dtype(object)
+                else:
+                    try:
+                        dtype = numpy.result_type(old.dtype, new.dtype)
+                    except TypeError:
+                        dtype = numpy.dtype(object)
+
+                # The column is upcast, like an int column set to floats, so
+                # the values are not truncated
+                if dtype != old.dtype:
+                    old = self.data[column] = old.astype(dtype)
+
+            old[indices] = new
+
+        return self.positions[indices], columns
@@ -0,0 +1,382 @@
+"""Incremental syntax highlighting for arcade-gui."""
+
+from bisect import bisect_right
+from re import compile as compile_regex
+
+__all__ = [
+           "Lexer",
+           "Highlighter",
+           "JSON_LEXER",
+           "JSON_STYLES",
+           "LOG_LEXER",
+           "LOG_STYLES"
+          ]
+
+ROOT = "root" # Initial state of a lexer
+
+
+class Lexer:
+    """Lexer that splits a line of text into tokens with regular expressions.
+
+    Rules are grouped by state. A rule can change the state, and the state at
+    the end of a line is passed to the next line, so tokens can span multiple
+    lines (for example tracebacks in logs). The rules of each state are
+    compiled into a single regular expression once.
+    """
+
+    def __init__(self, rules):
+        """Initialize a lexer.
+
+        >>> lexer = Lexer({
+                "root" : [
+                    (r"#.*", "comment", None),
+                    (r"\\d+", "number", None)
+                ]
+            })
+        >>> lexer.tokenize("x = 42 # answer")
+        ([(4, 6, "number"), (7, 15, "comment")], "root")
+
+        rules - map of states to lists of rules. A rule is a tuple of
+                (pattern, token, state). The state is the state the lexer
+                switches to after the rule matches, or None to stay in the
+                current state. The initial state is "root".
+
+        parameters: dict
+        """
+
+        self.rules = {}
+
+        for state, state_rules in rules.items():
+            pattern = "|".join(f"(?P<_{i}>{rule[0]})"
+                               for i, rule in enumerate(state_rules))
+
+            self.rules[state] = (
+                compile_regex(pattern),
+                [(token, next_state) for pattern, token, next_state
+                                     in state_rules]
+            )
+
+    def tokenize(self, line, state=ROOT):
+        """Split a line into tokens.
+
+        line - line of text, without its newline
+        state - state of the lexer at the start of the line
+
+        parameters: str, str
+        returns: tuple (list of tuple (start, end, token), state at the end)
+        """
+
+        tokens = []
+        position = 0
+
+        while position <= len(line):
+            regex, rules = self.rules[state]
+
+            match = regex.search(line, position)
+
+            if not match:
+                break
+
+            token, next_state = rules[int(match.lastgroup[1:])]
+
+            if match.end() > match.start():
+                tokens.append((match.start(), match.end(), token))
+
+            position = max(match.end(), match.start() + 1)
+
+            if next_state is not None:
+                state = next_state
+
+        return tokens, state
+
+
+class Highlighter:
+    """Highlighter that applies the styles of tokens to a document. When the
+    document is edited, only the edited lines are tokenized again. The state
+    of the lexer at the start of each line is cached, so the following lines
+    are only tokenized while their state changes.
+
+    Styles are applied when flush is called, which widgets do once per frame.
+    Styling a document while it dispatches its events would get ahead of the
+    layouts of the document, which receive the events after the highlighter.
+    """
+
+    def __init__(self, document, lexer, styles, default=None):
+        """Initialize a highlighter. This pushes events to the document
+        automatically. The document must be formatted, like a
+        FormattedRopeDocument, as unformatted documents style all of their
+        text at once.
+
+        >>> document = FormattedRopeDocument(text)
+        >>> highlighter = Highlighter(document, JSON_LEXER, JSON_STYLES,
+                                      {"color" : (0, 0, 0, 255)})
+
+        document - document to be highlighted
+        lexer - lexer used to tokenize the lines of the document
+        styles - map of tokens to the style attributes applied to them
+        default - style attributes of text that is not a token. These should
+                  set every attribute used in styles, so styles are reset when
+                  the text of a token changes. Defaults to None.
+
+        properties:
+            lines - amount of lines of the document
+            tokenized - amount of lines tokenized since the highlighter was
+                        created. This only grows by the edited lines.
+
+        parameters: pyglet.text.document.FormattedDocument, Lexer, dict, dict
+        """
+
+        if not hasattr(document, "_style_runs"):
+            raise TypeError("Only formatted documents can be highlighted.")
+
+        self.document = document
+        self.lexer = lexer
+        self.styles = styles
+        self.default = default or {}
+
+        self.tokenized = 0
+
+        self._starts = [0] # Start position of each line
+        self._states = [ROOT] # State of the lexer at the start of each line
+        self._dirty = [True] # Line has been edited since it was styled
+
+        self._dirty_lines = 1
+        self._first_dirty = 0
+
+        text = str(document.text)
+
+        index = text.find("\n")
+
+        while index >= 0:
+            self._starts.append(index + 1)
+            self._states.append(None)
+            self._dirty.append(True)
+
+            self._dirty_lines += 1
+
+            index = text.find("\n", index + 1)
+
+        self.document.push_handlers(
+            self.on_insert_text,
+            self.on_delete_text
+        )
+
+    def _get_lines(self):
+        """Get the amount of lines of the document.
+
+        returns: int
+        """
+
+        return len(self._starts)
+
+    lines = property(_get_lines)
+
+    def _get_line(self, position):
+        """Get the line of a position.
+
+        position - position in the document
+
+        parameters: int
+        returns: int
+        """
+
+        return bisect_right(self._starts, position) - 1
+
+    def _mark(self, line):
+        """Mark a line as edited.
+
+        line - index of the line
+
+        parameters: int
+        """
+
+        if not self._dirty[line]:
+            self._dirty[line] = True
+            self._dirty_lines += 1
+
+        self._first_dirty = min(self._first_dirty, line)
+
+    def _style_line(self, line, state):
+        """Tokenize a line and apply the styles of its tokens.
+
+        line - index of the line
+        state - state of the lexer at the start of the line
+
+        parameters: int, str
+        returns: str (state at the end of the line)
+        """
+
+        start = self._starts[line]
+
+        if line + 1 < len(self._starts):
+            end = self._starts[line + 1] # Including the newline
+        else:
+            end = len(self.document.text)
+
+        tokens, state = self.lexer.tokenize(
+            self.document.text[start:end].rstrip("\n"), state
+        )
+
+        if self.default and end > start:
+            self.document.set_style(start, end, self.default)
+
+        for token_start, token_end, token in tokens:
+            if token in self.styles:
+                self.document.set_style(start + token_start,
+                                        start + token_end,
+                                        self.styles[token])
+
+        self.tokenized += 1
+
+        return state
+
+    def flush(self):
+        """Tokenize and style the edited lines. The lines after them are only
+        tokenized if their state changes, for example when a multiline token
+        is started or ended.
+        """
+
+        if not self._dirty_lines:
+            return
+
+        line = self._first_dirty
+        state = self._states[line]
+
+        while line < len(self._starts):
+            if not self._dirty[line] and self._states[line] == state:
+                if not self._dirty_lines:
+                    break
+
+                # Skip the line, its end state is the next line's start state
+                line += 1
+
+                if line < len(self._starts):
+                    state = self._states[line]
+
+                continue
+
+            if self._dirty[line]:
+                self._dirty[line] = False
+                self._dirty_lines -= 1
+
+            self._states[line] = state
+
+            state = self._style_line(line, state)
+
+            line += 1
+
+        self._first_dirty = len(self._starts)
+
+    def delete(self):
+        """Stop highlighting the document. The styles that were applied are
+        kept.
+        """
+
+        self.document.remove_handlers(
+            self.on_insert_text,
+            self.on_delete_text
+        )
+
+    def on_insert_text(self, start, text):
+        """Some text was inserted into the document. This only updates the
+        positions of the lines. The edited lines are styled in flush.
+
+        start - position of the insertion
+        text - text that was inserted
+
+        parameters: int, str
+        """
+
+        line = self._get_line(start)
+        length = len(text)
+
+        for i in range(line + 1, len(self._starts)):
+            self._starts[i] += length
+
+        self._mark(line)
+
+        starts = []
+        index = text.find("\n")
+
+        while index >= 0:
+            starts.append(start + index + 1)
+
+            index = text.find("\n", index + 1)
+
+        if starts:
+            self._starts[line + 1:line + 1] = starts
+            self._states[line + 1:line + 1] = [None] * len(starts)
+            self._dirty[line + 1:line + 1] = [True] * len(starts)
+
+            self._dirty_lines += len(starts)
+
+    def on_delete_text(self, start, end):
+        """Some text was deleted from the document. This only updates the
+        positions of the lines. The edited lines are styled in flush.
+
+        start - start of the deleted text
+        end - end of the deleted text
+
+        parameters: int, int
+        """
+
+        line = self._get_line(start)
+        last = self._get_line(end)
+
+        self._dirty_lines -= sum(self._dirty[line + 1:last + 1])
+
+        del self._starts[line + 1:last + 1]
+        del self._states[line + 1:last + 1]
+        del self._dirty[line + 1:last + 1]
+
+        for i in range(line + 1, len(self._starts)):
+            self._starts[i] -= end - start
+
+        self._mark(line)
+
+
+JSON_LEXER = Lexer({
+    ROOT : [
+        (r'"(?:[^"\\]|\\.)*"(?=\s*:)', "key", None),
+        (r'"(?:[^"\\]|\\.)*"', "string", None),
+        (r'"(?:[^"\\]|\\.)*$', "error", None),
+        (r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?", "number", None),
+        (r"\b(?:true|false|null)\b", "keyword", None),
+        (r"[{}\[\],:]", "punctuation", None)
+    ]
+})
+
+JSON_STYLES = {
+    "key" : {"color" : (4, 81, 165, 255)},
+    "string" : {"color" : (163, 21, 21, 255)},
+    "number" : {"color" : (9, 134, 88, 255)},
+    "keyword" : {"color" : (0, 0, 255, 255)},
+    "punctuation" : {"color" : (80, 80, 80, 255)},
+    "error" : {"color" : (255, 0, 0, 255)}
+}
+
+LOG_LEXER = Lexer({
+    ROOT : [
+        (r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?", "timestamp",
+         None),
+        (r"\bDEBUG\b", "debug", None),
+        (r"\bINFO\b", "info", None),
+        (r"\bWARN(?:ING)?\b", "warning", None),
+        (r"\b(?:ERROR|CRITICAL|FATAL)\b", "error", None),
+        (r"^Traceback \(most recent call last\):$", "traceback",
+         "traceback")
+    ],
+    "traceback" : [
+        (r"^\s+.*", "traceback", None),
+        (r"^\S.*", "error", ROOT)
+    ]
+})
+
+LOG_STYLES = {
+    "timestamp" : {"color" : (128, 128, 128, 255)},
+    "debug" : {"color" : (128, 128, 128, 255)},
+    "info" : {"color" : (0, 120, 215, 255)},
+    "warning" : {"color" : (202, 138, 4, 255)},
+    "error" : {"color" : (220, 38, 38, 255)},
+    "traceback" : {"color" : (153, 27, 27, 255)}
+}
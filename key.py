@@ -1,6 +1,5 @@
 """Key symbols, tools, and constants for arcade-gui."""
 
-from arcade import get_window
 from pyglet.event import EventDispatcher
 
 from geometry import Point
@@ -47,6 +46,10 @@ class Keys(EventDispatcher):
                 Called as an event when a key is released.
         """
 
+        # Arcade is imported here, so importing the key constants and helpers
+        # does not import it
+        from arcade import get_window
+
         self.data = {}
 
         self.window = get_window()
@@ -122,7 +125,9 @@ class Mouse(EventDispatcher):
         
         TODO: add specifying button functionality
         """
-        
+
+        from arcade import get_window
+
         self.x = 0
         self.y = 0
 
@@ -0,0 +1,723 @@
+"""Option search and providers for arcade-gui comboboxes."""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from heapq import nlargest
+from itertools import islice
+
+from constants import (COMBOBOX_CACHE_PAGES, COMBOBOX_READ_AHEAD,
+                       COMBOBOX_THREAD_THRESHOLD)
+
+__all__ = [
+           "OptionIndex",
+           "OptionFilter",
+           "OptionProvider",
+           "ListProvider",
+           "GeneratorProvider",
+           "CachedProvider"
+          ]
+
+
+def _trigrams(text):
+    """Get the trigrams of some text.
+
+    parameters: str
+    returns: set
+    """
+
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class OptionIndex:
+    """Search index of the options of a combobox. It is built once, and then
+    finds the options starting with or containing a query without looking at
+    every option.
+
+    Prefixes are found by bisecting a sorted list of the options, which works
+    like a prefix trie without a node for each character. Substrings are found
+    with a trigram index, which maps each three characters to the options
+    containing them. Searching is case-insensitive.
+    """
+
+    def __init__(self, options, fuzzy=False):
+        """Initialize an option index.
+
+        >>> index = OptionIndex(cities)
+        >>> [cities[i] for i in index.search("san fr", 3)]
+        ["San Francisco"]
+        >>> [cities[i] for i in index.search("san frnacisco", 3, fuzzy=True)]
+        ["San Francisco", "San Francisco de Macoris", ...]
+
+        options - list of options as strings
+        fuzzy - options that do not contain the query are also found, ranked
+                by how many trigrams they share with it. This finds options
+                with typos. Defaults to False.
+
+        properties:
+            options - list of options
+            sorted - lowercase options with their indices, sorted
+            trigrams - map of trigrams to the indices of the options
+                       containing them, in ascending order
+
+        parameters: list of str, bool
+        """
+
+        self.options = options
+        self.fuzzy = fuzzy
+
+        self._lower = [str(option).lower() for option in options]
+
+        self.sorted = sorted((option, index) for index, option
+                             in enumerate(self._lower))
+        self.trigrams = {}
+
+        for index, option in enumerate(self._lower):
+            for trigram in _trigrams(option):
+                self.trigrams.setdefault(trigram, []).append(index)
+
+    def __len__(self):
+        return len(self.options)
+
+    def prefix(self, query, limit=None):
+        """Get the options starting with a query.
+
+        query - start of the options
+        limit - maximum amount of options returned. Defaults to None (all of
+                the options).
+
+        parameters: str, int
+        returns: list of int (indices of the options, in alphabetical order)
+        """
+
+        query = query.lower()
+
+        start = bisect_left(self.sorted, (query,))
+        found = []
+
+        for position in range(start, len(self.sorted)):
+            option, index = self.sorted[position]
+
+            if not option.startswith(query) or len(found) == limit:
+                break
+
+            found.append(index)
+
+        return found
+
+    def _get_candidates(self, query):
+        """Get the options that could contain a query. These are the options
+        containing the rarest trigram of the query. Every candidate is checked
+        anyways, so the other trigrams are not intersected, and the search can
+        stop as soon as enough options are found.
+
+        query - lowercase query of three or more characters
+
+        parameters: str
+        returns: list of int (indices of the options, in ascending order)
+        """
+
+        return min((self.trigrams.get(trigram, ())
+                    for trigram in _trigrams(query)), key=len)
+
+    def search(self, query, limit=None, fuzzy=None):
+        """Search for options matching a query. Options starting with the
+        query are ranked first, followed by options containing it, and then
+        fuzzy matches if enabled.
+
+        query - text to search for
+        limit - maximum amount of options returned. Defaults to None (all of
+                the matches).
+        fuzzy - add fuzzy matches. Defaults to the fuzzy property.
+
+        parameters: str, int, bool
+        returns: list of int (indices of the options)
+        """
+
+        if fuzzy is None:
+            fuzzy = self.fuzzy
+
+        query = query.lower()
+
+        if not query:
+            return list(range(len(self.options) if limit is None else
+                              min(limit, len(self.options))))
+
+        found = self.prefix(query, limit)
+
+        if limit is not None and len(found) >= limit:
+            return found
+
+        seen = set(found)
+
+        if len(query) < 3:
+            # Too short for trigrams, so the options are scanned until the
+            # limit is reached
+            candidates = range(len(self.options))
+        else:
+            candidates = self._get_candidates(query)
+
+        for index in candidates:
+            if index not in seen and query in self._lower[index]:
+                found.append(index)
+                seen.add(index)
+
+                if len(found) == limit:
+                    return found
+
+        if fuzzy and len(query) >= 3:
+            found.extend(self._fuzzy(query, seen,
+                                     None if limit is None else
+                                     limit - len(found)))
+
+        return found
+
+    def matches(self, query, within=None):
+        """Get all of the options containing a query.
+
+        query - text to search for
+        within - indices of the options to search in, in ascending order. This
+                 is used to narrow down the matches of a shorter query.
+                 Defaults to None (all of the options).
+
+        parameters: str, list of int
+        returns: list of int (indices of the options, in ascending order)
+        """
+
+        query = query.lower()
+
+        if within is None:
+            if len(query) < 3:
+                within = range(len(self.options))
+            else:
+                within = self._get_candidates(query)
+
+        lower = self._lower
+
+        return [index for index in within if query in lower[index]]
+
+    def _fuzzy(self, query, seen, limit):
+        """Rank the options by how many trigrams they share with a query.
+
+        query - lowercase query
+        seen - indices of the options already found
+        limit - maximum amount of options returned
+
+        parameters: str, set, int
+        returns: list of int (indices of the options, best first)
+        """
+
+        trigrams = _trigrams(query)
+        scores = {}
+
+        for trigram in trigrams:
+            for index in self.trigrams.get(trigram, ()):
+                scores[index] = scores.get(index, 0) + 1
+
+        # At least half of the trigrams have to match
+        minimum = max(1, len(trigrams) // 2)
+
+        ranked = ((score, -index) for index, score in scores.items()
+                  if score >= minimum and index not in seen)
+
+        if limit is None:
+            ranked = sorted(ranked, reverse=True)
+        else:
+            ranked = nlargest(limit, ranked)
+
+        return [-index for score, index in ranked]
+
+
+class OptionFilter:
+    """Incremental filter of the options of an OptionIndex. All of the matches
+    of the last query are kept, so a query that extends it (like "san fr"
+    after "san f") only checks the previous matches.
+
+    Queries are requested and the results polled once per frame, so a query
+    is filtered once however many characters were typed in between. Very
+    large option lists are filtered on a worker thread. Results are only
+    applied on the thread that polls them, and results of queries that were
+    replaced while filtering are dropped.
+    """
+
+    def __init__(self, index, threshold=COMBOBOX_THREAD_THRESHOLD):
+        """Initialize an option filter.
+
+        >>> options = OptionFilter(index)
+        >>> options.request("san fr")
+        >>> # Once per frame...
+        >>> if options.poll():
+                display = [cities[i] for i in options.page(0, 3)]
+
+        index - OptionIndex of the options
+        threshold - amount of options from which filtering is done on a
+                    worker thread. Defaults to COMBOBOX_THREAD_THRESHOLD.
+
+        properties:
+            query - query of the current matches
+            matches - indices of the options containing the query, in
+                      ascending order, or None if every option matches
+            generation - number of the latest requested query
+
+        parameters: OptionIndex, int
+        """
+
+        self.index = index
+        self.threshold = threshold
+
+        self.query = ""
+        self.matches = None
+        self.generation = 0
+
+        self._result = None
+        self._executor = None
+
+    def _filter(self, query, generation, previous, matches):
+        """Get the matches of a query, narrowing down the matches of the
+        previous query if it is contained in it.
+
+        query - lowercase query
+        generation - number of the query
+        previous - lowercase query of the matches
+        matches - matches of the previous query
+
+        parameters: str, int, str, list of int
+        returns: tuple (generation, query, matches), or None if stale
+        """
+
+        if generation != self.generation:
+            # Another query was requested before this one started
+            return None
+
+        if not query:
+            return generation, query, None
+
+        if previous not in query:
+            matches = None
+
+        return generation, query, self.index.matches(query, matches)
+
+    def request(self, query):
+        """Request the matches of a query. They are available after poll
+        returns True.
+
+        query - text to filter the options with
+
+        parameters: str
+        """
+
+        self.generation += 1
+
+        arguments = (query.lower(), self.generation, self.query, self.matches)
+
+        if len(self.index) < self.threshold:
+            self._result = self._filter(*arguments)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="options"
+            )
+
+        self._result = self._executor.submit(self._filter, *arguments)
+
+    def poll(self):
+        """Apply the result of the last requested query if it is available.
+
+        returns: bool (whether the matches changed)
+        """
+
+        result = self._result
+
+        if result is None:
+            return False
+
+        if not isinstance(result, tuple):
+            if not result.done():
+                return False
+
+            result = result.result()
+
+        self._result = None
+
+        if result is None or result[0] != self.generation:
+            return False
+
+        generation, self.query, self.matches = result
+
+        return True
+
+    def page(self, start, count):
+        """Get a page of the current matches. Options starting with the query
+        are ranked first, followed by the options containing it, and then
+        fuzzy matches if the index is fuzzy.
+
+        start - rank of the first match
+        count - amount of matches
+
+        parameters: int, int
+        returns: list of int (indices of the options)
+        """
+
+        limit = start + count
+
+        if self.matches is None:
+            return list(range(start, min(limit, len(self.index))))
+
+        lower = self.index._lower
+        found = list(islice((index for index in self.matches
+                             if lower[index].startswith(self.query)), limit))
+
+        if len(found) < limit:
+            seen = set(found)
+
+            for index in self.matches:
+                if index not in seen:
+                    found.append(index)
+
+                    if len(found) == limit:
+                        break
+
+        if len(found) < limit and self.index.fuzzy and len(self.query) >= 3:
+            found.extend(self.index._fuzzy(self.query, set(self.matches),
+                                           limit - len(found)))
+
+        return found[start:]
+
+    def delete(self):
+        """Stop the worker thread. Requests that are filtering are dropped."""
+
+        self.generation += 1
+        self._result = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class OptionProvider:
+    """Base class of option providers. A provider gives a combobox its options
+    without them having to be in a list, for example when they are stored in
+    a file or a database. Subclasses implement __len__, fetch, and search.
+
+    A combobox requests a query when its text changes, polls for the result
+    once per frame, and then gets the page of options it displays. By default
+    the query is searched when the page is got.
+    """
+
+    query = ""
+
+    _changed = False
+
+    def __len__(self):
+        """Get the amount of options.
+
+        returns: int
+        """
+
+        raise NotImplementedError
+
+    def fetch(self, start, end):
+        """Get the options in a range.
+
+        start - index of the first option
+        end - index after the last option
+
+        parameters: int, int
+        returns: list of str
+        """
+
+        raise NotImplementedError
+
+    def search(self, query, start, count):
+        """Get the options matching a query.
+
+        query - text to search for
+        start - rank of the first match
+        count - maximum amount of matches
+
+        parameters: str, int, int
+        returns: list of str
+        """
+
+        raise NotImplementedError
+
+    def request(self, query):
+        """Request the matches of a query.
+
+        query - text to filter the options with
+
+        parameters: str
+        """
+
+        self.query = query
+        self._changed = True
+
+    def poll(self):
+        """Check if the matches changed since they were last polled.
+
+        returns: bool
+        """
+
+        changed = self._changed
+        self._changed = False
+
+        return changed
+
+    def page(self, start, count):
+        """Get a page of the matches of the requested query. If the query is
+        empty, the options are fetched in order.
+
+        start - rank of the first match
+        count - maximum amount of matches
+
+        parameters: int, int
+        returns: list of str
+        """
+
+        if not self.query:
+            return self.fetch(start, start + count)
+
+        return self.search(self.query, start, count)
+
+    def delete(self):
+        """Release the resources of the provider."""
+
+
+class ListProvider(OptionProvider):
+    """Provider of options in a list. The options are indexed when they are
+    first searched, and filtered incrementally with an OptionFilter. Fetching
+    options only slices the list.
+    """
+
+    def __init__(self, options, fuzzy=False):
+        """Initialize a list provider.
+
+        options - list of options as strings
+        fuzzy - fuzzy matches are also found. Defaults to False.
+
+        properties:
+            options - list of options
+            index - search index of the options
+            option_filter - incremental filter of the options
+
+        parameters: list of str, bool
+        """
+
+        self.options = options
+        self.fuzzy = fuzzy
+
+        self._index = None
+        self._option_filter = None
+
+    def __len__(self):
+        return len(self.options)
+
+    def _get_index(self):
+        """Get the search index of the options, building it if needed.
+
+        returns: OptionIndex
+        """
+
+        if self._index is None:
+            self._index = OptionIndex(self.options, self.fuzzy)
+
+        return self._index
+
+    def _get_option_filter(self):
+        """Get the incremental filter of the options, creating it if needed.
+
+        returns: OptionFilter
+        """
+
+        if self._option_filter is None:
+            self._option_filter = OptionFilter(self.index)
+
+        return self._option_filter
+
+    index = property(_get_index)
+    option_filter = property(_get_option_filter)
+
+    def fetch(self, start, end):
+        return self.options[start:end]
+
+    def search(self, query, start, count):
+        return [self.options[index] for index in
+                self.index.search(query, start + count)[start:]]
+
+    def request(self, query):
+        self.query = query
+        self.option_filter.request(query)
+
+    def poll(self):
+        return self.option_filter.poll()
+
+    def page(self, start, count):
+        return [self.options[index] for index in
+                self.option_filter.page(start, count)]
+
+    def delete(self):
+        if self._option_filter is not None:
+            self._option_filter.delete()
+
+
+class GeneratorProvider(OptionProvider):
+    """Provider of options from a generator. The generator is started again
+    for every fetch and search, so only the options that are needed are kept
+    in memory. Wrap it in a CachedProvider to avoid reading the same options
+    repeatedly.
+    """
+
+    def __init__(self, generate, length=None):
+        """Initialize a generator provider.
+
+        >>> def read_catalog():
+                with open("catalog.txt") as file:
+                    for line in file:
+                        yield line.rstrip("\\n")
+
+        >>> provider = GeneratorProvider(read_catalog)
+
+        generate - function returning an iterator of the options
+        length - amount of options. If None, it is counted the first time it
+                 is needed. Defaults to None.
+
+        parameters: callable, int
+        """
+
+        self.generate = generate
+
+        self._length = length
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(1 for option in self.generate())
+
+        return self._length
+
+    def fetch(self, start, end):
+        return list(islice(self.generate(), start, end))
+
+    def search(self, query, start, count):
+        query = query.lower()
+
+        matches = (option for option in self.generate()
+                   if query in option.lower())
+
+        return list(islice(matches, start, start + count))
+
+
+class CachedProvider(OptionProvider):
+    """Provider that caches another provider. Options and matches are fetched
+    in pages, so scrolling reads ahead, and the least recently used pages are
+    dropped when the cache is full. The memory used is bounded by the size of
+    the cache, however many options there are.
+    """
+
+    def __init__(self, provider, read_ahead=COMBOBOX_READ_AHEAD,
+                 pages=COMBOBOX_CACHE_PAGES):
+        """Initialize a cached provider.
+
+        >>> provider = CachedProvider(GeneratorProvider(read_catalog))
+        >>> combobox = Combobox(100, 200, provider)
+
+        provider - provider to be cached
+        read_ahead - amount of options fetched at once. Defaults to
+                     COMBOBOX_READ_AHEAD.
+        pages - maximum amount of pages cached. Defaults to
+                COMBOBOX_CACHE_PAGES.
+
+        properties:
+            provider - cached provider
+            pages - cached pages of options and matches
+
+        parameters: OptionProvider, int, int
+        """
+
+        self.provider = provider
+        self.read_ahead = read_ahead
+        self.size = pages
+
+        self.pages = OrderedDict()
+
+    def __len__(self):
+        return len(self.provider)
+
+    def _get_page(self, query, page):
+        """Get a page of options or matches, fetching it if it is not cached.
+
+        query - query of the matches, or None for options
+        page - index of the page
+
+        parameters: str, int
+        returns: list of str
+        """
+
+        key = (query, page)
+
+        if key in self.pages:
+            self.pages.move_to_end(key)
+
+            return self.pages[key]
+
+        start = page * self.read_ahead
+
+        if query is None:
+            options = self.provider.fetch(start, start + self.read_ahead)
+        else:
+            options = self.provider.search(query, start, self.read_ahead)
+
+        self.pages[key] = options
+
+        if len(self.pages) > self.size:
+            self.pages.popitem(last=False)
+
+        return options
+
+    def _get_range(self, query, start, end):
+        """Get a range of options or matches from the cached pages.
+
+        query - query of the matches, or None for options
+        start - index of the first option
+        end - index after the last option
+
+        parameters: str, int, int
+        returns: list of str
+        """
+
+        options = []
+
+        for page in range(start // self.read_ahead,
+                          (end - 1) // self.read_ahead + 1):
+            fetched = self._get_page(query, page)
+
+            options.extend(fetched)
+
+            if len(fetched) < self.read_ahead:
+                break
+
+        offset = start % self.read_ahead
+
+        return options[offset : offset + end - start]
+
+    def fetch(self, start, end):
+        if end <= start:
+            return []
+
+        return self._get_range(None, start, end)
+
+    def search(self, query, start, count):
+        if count <= 0:
+            return []
+
+        return self._get_range(query, start, start + count)
+
+    def clear(self):
+        """Clear the cache."""
+
+        self.pages.clear()
+
+    def delete(self):
+        self.clear()
+        self.provider.delete()
@@ -0,0 +1,655 @@
+"""Indexed find and replace for arcade-gui text widgets."""
+
+from bisect import bisect_left, bisect_right
+
+__all__ = [
+           "SearchIndex",
+           "Finder"
+          ]
+
+HIGHLIGHT_COLOR = (255, 230, 120, 255) # Background of highlighted matches
+
+
+class _Line:
+    """Line of an indexed document, with the trigrams of its text. Trigrams
+    are stored in lowercase, so they can be used whether the case of a query
+    must match or not.
+    """
+
+    __slots__ = ("text", "trigrams", "index")
+
+    def __init__(self, text):
+        lower = text.lower()
+
+        self.text = text
+        self.trigrams = {lower[i : i + 3] for i in range(len(lower) - 2)}
+        self.index = 0
+
+
+class SearchIndex:
+    """Trigram index of the lines of a document. Searching only looks at the
+    lines containing every trigram of the query, instead of running str.find
+    over the whole text. The index is updated when the document is edited,
+    and only the edited lines are indexed again.
+    """
+
+    def __init__(self, document):
+        """Initialize a search index. This pushes events to the document
+        automatically.
+
+        >>> index = SearchIndex(entry.document)
+        >>> index.find_all("error")
+        [(12, 17), (240, 245)]
+
+        document - document to be indexed
+
+        properties:
+            lines - amount of lines of the document
+            version - number of edits made to the document. Results of a
+                      search are only valid for the version they were made in.
+
+        parameters: pyglet.text.document.AbstractDocument
+        """
+
+        self.document = document
+
+        self.version = 0
+
+        self._lines = []
+        self._starts = []
+        self._trigrams = {} # Map of trigrams to the lines containing them
+
+        self._numbered = True
+
+        start = 0
+
+        for text in str(document.text).split("\n"):
+            self._insert_line(len(self._lines), start, text)
+
+            start += len(text) + 1
+
+        self.document.push_handlers(
+            self.on_insert_text,
+            self.on_delete_text
+        )
+
+    def _get_lines(self):
+        """Get the amount of lines of the document.
+
+        returns: int
+        """
+
+        return len(self._lines)
+
+    lines = property(_get_lines)
+
+    def _insert_line(self, index, start, text):
+        """Add a line to the index.
+
+        index - index of the line
+        start - position of the start of the line
+        text - text of the line
+
+        parameters: int, int, str
+        """
+
+        line = _Line(text)
+
+        self._lines.insert(index, line)
+        self._starts.insert(index, start)
+
+        for trigram in line.trigrams:
+            self._trigrams.setdefault(trigram, set()).add(line)
+
+        self._numbered = False
+
+    def _remove_trigrams(self, line):
+        """Remove the trigrams of a line from the index.
+
+        line - line to be removed
+
+        parameters: _Line
+        """
+
+        for trigram in line.trigrams:
+            lines = self._trigrams[trigram]
+            lines.discard(line)
+
+            if not lines:
+                del self._trigrams[trigram]
+
+    def _reindex(self, index):
+        """Index the text of a line again.
+
+        index - index of the line
+
+        parameters: int
+        """
+
+        start = self._starts[index]
+
+        if index + 1 < len(self._starts):
+            end = self._starts[index + 1] - 1
+        else:
+            end = len(self.document.text)
+
+        old = self._lines[index]
+        line = _Line(self.document.text[start:end])
+        line.index = old.index
+
+        self._remove_trigrams(old)
+
+        for trigram in line.trigrams:
+            self._trigrams.setdefault(trigram, set()).add(line)
+
+        self._lines[index] = line
+
+    def _shift(self, index, delta):
+        """Move the start of the lines after a line.
+
+        index - index of the line
+        delta - amount of characters inserted or deleted before the lines
+
+        parameters: int, int
+        """
+
+        self._starts[index + 1:] = [start + delta for start in
+                                    self._starts[index + 1:]]
+
+    def _number(self):
+        """Store the index of each line in it, so the lines found with the
+        trigrams can be sorted. This is only done after lines were added or
+        removed.
+        """
+
+        if self._numbered:
+            return
+
+        for index, line in enumerate(self._lines):
+            line.index = index
+
+        self._numbered = True
+
+    def _get_candidates(self, query):
+        """Get the lines that could contain a query.
+
+        query - query without newlines
+
+        parameters: str
+        returns: list of int (indices of lines)
+        """
+
+        query = query.lower()
+
+        if len(query) < 3:
+            return range(len(self._lines))
+
+        lines = None
+
+        # Intersect the rarest trigrams first
+        for trigram in sorted({query[i : i + 3] for i in
+                               range(len(query) - 2)},
+                              key=lambda trigram:
+                                  len(self._trigrams.get(trigram, ()))):
+            found = self._trigrams.get(trigram)
+
+            if not found:
+                return []
+
+            lines = set(found) if lines is None else lines & found
+
+            if not lines:
+                return []
+
+        self._number()
+
+        return sorted(line.index for line in lines)
+
+    def find_all(self, query, match_case=True):
+        """Find all of the occurrences of a query. Like str.replace, the
+        matches do not overlap, so "aa" is found twice in "aaaa".
+
+        query - text to find
+        match_case - the case of the text must match. Defaults to True.
+
+        parameters: str, bool
+        returns: list of tuple (start, end)
+        """
+
+        if not query:
+            return []
+
+        if "\n" in query:
+            # Queries spanning lines are searched in the document
+            return self._find_in_document(query, match_case)
+
+        if not match_case:
+            query = query.lower()
+
+        matches = []
+
+        for index in self._get_candidates(query):
+            text = self._lines[index].text
+            start = self._starts[index]
+
+            if not match_case:
+                text = text.lower()
+
+            position = text.find(query)
+
+            while position >= 0:
+                matches.append((start + position,
+                                start + position + len(query)))
+
+                position = text.find(query, position + len(query))
+
+        return matches
+
+    def _find_in_document(self, query, match_case):
+        """Find all of the occurrences of a query in the document text.
+
+        query - text to find
+        match_case - the case of the text must match
+
+        parameters: str, bool
+        returns: list of tuple (start, end)
+        """
+
+        text = str(self.document.text)
+
+        if not match_case:
+            text = text.lower()
+            query = query.lower()
+
+        matches = []
+        position = text.find(query)
+
+        while position >= 0:
+            matches.append((position, position + len(query)))
+
+            position = text.find(query, position + len(query))
+
+        return matches
+
+    def delete(self):
+        """Stop indexing the document."""
+
+        self.document.remove_handlers(
+            self.on_insert_text,
+            self.on_delete_text
+        )
+
+    def on_insert_text(self, start, text):
+        """Some text was inserted into the document. The edited line is
+        indexed again, and the new lines are added.
+
+        start - position of the insertion
+        text - text that was inserted
+
+        parameters: int, str
+        """
+
+        self.version += 1
+
+        first = bisect_right(self._starts, start) - 1
+
+        self._shift(first, len(text))
+
+        index = first
+        position = start
+
+        # Add a line for each new line, then index all of the edited lines
+        for line in text.split("\n")[:-1]:
+            position += len(line) + 1
+            index += 1
+
+            self._insert_line(index, position, "")
+
+        for i in range(first, index + 1):
+            self._reindex(i)
+
+    def on_delete_text(self, start, end):
+        """Some text was deleted from the document. The lines that were
+        deleted are removed, and the edited line is indexed again.
+
+        start - start of the deleted text
+        end - end of the deleted text
+
+        parameters: int, int
+        """
+
+        self.version += 1
+
+        index = bisect_right(self._starts, start) - 1
+        last = bisect_right(self._starts, end) - 1
+
+        for line in self._lines[index + 1:last + 1]:
+            self._remove_trigrams(line)
+
+        if last > index:
+            del self._lines[index + 1:last + 1]
+            del self._starts[index + 1:last + 1]
+
+            self._numbered = False
+
+        self._shift(index, start - end)
+        self._reindex(index)
+
+
+class Finder:
+    """Find and replace for the layout of a text widget. Searching as the
+    user types narrows down the previous results instead of searching again,
+    and all matches are highlighted by changing the style of only the
+    matches that were added or removed.
+    """
+
+    def __init__(self, layout, color=HIGHLIGHT_COLOR):
+        """Initialize a finder.
+
+        >>> finder = Finder(entry.layout)
+        >>> finder.search("err")
+        >>> finder.search("erro") # Narrowed down from the last results
+        >>> finder.next()
+        (12, 16)
+        >>> finder.replace("ERROR")
+
+        Matches are highlighted with a background color if the document is
+        formatted, like a FormattedRopeDocument. Otherwise, only the current
+        match is shown with the layout's selection.
+
+        layout - layout of the text widget
+        color - background color of highlighted matches as a tuple of four
+                ints. If None, matches are not highlighted.
+
+        properties:
+            index - search index of the document
+            query - current query
+            matches - matches of the query, sorted by position
+            current - index of the current match in matches, or None
+
+        parameters: pyglet.text.layout.IncrementalTextLayout, tuple
+        """
+
+        self.layout = layout
+        self.color = color
+
+        self.index = SearchIndex(layout.document)
+
+        self.query = ""
+        self.match_case = True
+        self.matches = []
+        self.current = None
+
+        self._version = self.index.version
+        self._highlighted = set()
+
+        self.document.push_handlers(
+            self.on_insert_text,
+            self.on_delete_text
+        )
+
+    def _get_document(self):
+        """Get the document of the finder.
+
+        returns: pyglet.text.document.AbstractDocument
+        """
+
+        return self.index.document
+
+    document = property(_get_document)
+
+    def search(self, query, match_case=True):
+        """Search for a query and highlight all of its matches. If the query
+        starts with the last query and the document has not been edited, only
+        the last matches are checked.
+
+        query - text to find
+        match_case - the case of the text must match. Defaults to True.
+
+        parameters: str, bool
+        returns: list of tuple (start, end)
+        """
+
+        if self._version == self.index.version and \
+            match_case == self.match_case and \
+            self.query and query.startswith(self.query):
+            text = self.document.text
+            length = len(query)
+
+            needle = query if match_case else query.lower()
+
+            matches = []
+
+            for start, end in self.matches:
+                found = text[start : start + length]
+
+                if not match_case:
+                    found = found.lower()
+
+                if found == needle:
+                    matches.append((start, start + length))
+        else:
+            matches = self.index.find_all(query, match_case)
+
+        self.query = query
+        self.match_case = match_case
+        self.matches = matches
+        self.current = None
+
+        self._version = self.index.version
+
+        self._highlight()
+
+        return matches
+
+    def _refresh(self):
+        """Search again if the document was edited since the last search."""
+
+        if not self._version == self.index.version:
+            self.search(self.query, self.match_case)
+
+    def _highlight(self):
+        """Highlight the matches. Only the matches that were added or removed
+        since the last highlight are styled.
+        """
+
+        if self.color is None or not hasattr(self.document, "_style_runs"):
+            return
+
+        matches = set(self.matches)
+        length = len(self.document.text)
+
+        for start, end in self._highlighted - matches:
+            if end <= length:
+                self.document.set_style(start, end,
+                                        {"background_color" : None})
+
+        for start, end in matches - self._highlighted:
+            self.document.set_style(start, end,
+                                    {"background_color" : self.color})
+
+        self._highlighted = matches
+
+    def _select(self, current):
+        """Select a match and scroll it into view.
+
+        current - index of the match
+
+        parameters: int
+        returns: tuple (start, end)
+        """
+
+        self.current = current
+
+        start, end = self.matches[current]
+
+        self.layout.set_selection(start, end)
+
+        line = self.layout.get_line_from_position(start)
+
+        self.layout.ensure_line_visible(line)
+
+        return start, end
+
+    def next(self, position=None):
+        """Select the next match.
+
+        position - position to search from. Defaults to the end of the
+                   current match.
+
+        parameters: int
+        returns: tuple (start, end), or None if there are no matches
+        """
+
+        self._refresh()
+
+        if not self.matches:
+            return None
+
+        if position is None:
+            position = self.matches[self.current][0] + 1 \
+                       if self.current is not None else 0
+
+        current = bisect_left(self.matches, (position,))
+
+        return self._select(current % len(self.matches))
+
+    def previous(self, position=None):
+        """Select the previous match.
+
+        position - position to search from. Defaults to the start of the
+                   current match.
+
+        parameters: int
+        returns: tuple (start, end), or None if there are no matches
+        """
+
+        self._refresh()
+
+        if not self.matches:
+            return None
+
+        if position is None:
+            position = self.matches[self.current][0] \
+                       if self.current is not None else \
+                       len(self.document.text) + 1
+
+        current = bisect_left(self.matches, (position,)) - 1
+
+        return self._select(current % len(self.matches))
+
+    def replace(self, text):
+        """Replace the current match and select the next one.
+
+        text - replacement text
+
+        parameters: str
+        returns: tuple (start, end), or None if there are no more matches
+        """
+
+        self._refresh()
+
+        if self.current is None:
+            return self.next()
+
+        start, end = self.matches[self.current]
+
+        self.document.delete_text(start, end)
+        self.document.insert_text(start, text)
+
+        self.search(self.query, self.match_case)
+
+        return self.next(start + len(text))
+
+    def replace_all(self, text):
+        """Replace all of the matches. The matches are replaced from the last
+        to the first, so the positions of the others do not change.
+
+        text - replacement text
+
+        parameters: str
+        returns: int (amount of matches replaced)
+        """
+
+        self._refresh()
+
+        matches = self.matches
+
+        for start, end in reversed(matches):
+            self.document.delete_text(start, end)
+            self.document.insert_text(start, text)
+
+        self.search(self.query, self.match_case)
+
+        return len(matches)
+
+    def clear(self):
+        """Remove the highlight of all matches and clear the query."""
+
+        self.matches = []
+        self.query = ""
+        self.current = None
+
+        self._highlight()
+
+        self.layout.set_selection(0, 0)
+
+    def delete(self):
+        """Clear the finder and stop indexing the document."""
+
+        self.clear()
+        self.index.delete()
+
+        self.document.remove_handlers(
+            self.on_insert_text,
+            self.on_delete_text
+        )
+
+    def on_insert_text(self, start, text):
+        """Some text was inserted into the document. The styles of highlighted
+        matches move with their text, so their positions are updated.
+
+        start - position of the insertion
+        text - text that was inserted
+
+        parameters: int, str
+        """
+
+        length = len(text)
+
+        def move(match_start, match_end):
+            # Inserted text takes the style of the character before it
+            if start < match_start or start == match_start > 0:
+                return (match_start + length, match_end + length)
+
+            if start <= match_end:
+                return (match_start, match_end + length)
+
+            return (match_start, match_end)
+
+        self._highlighted = {
+            move(match_start, match_end)
+            for match_start, match_end in self._highlighted
+        }
+
+    def on_delete_text(self, start, end):
+        """Some text was deleted from the document. The positions of the
+        highlighted matches are updated.
+
+        start - start of the deleted text
+        end - end of the deleted text
+
+        parameters: int, int
+        """
+
+        def move(position):
+            if position <= start:
+                return position
+
+            return max(start, position - (end - start))
+
+        self._highlighted = {
+            (move(match_start), move(match_end))
+            for match_start, match_end in self._highlighted
+            if move(match_end) > move(match_start)
+        }
@@ -0,0 +1,176 @@
+"""Compact sets of selected indices for arcade-gui."""
+
+from bisect import bisect_left, bisect_right
+
+__all__ = [
+           "IndexSet"
+          ]
+
+
+class IndexSet:
+    """Set of indices stored as sorted, non-overlapping ranges. Selecting a
+    range of a million items stores one range, not a million indices, and
+    checking if an index is in the set is done by bisecting the ranges.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, indices=()):
+        """Initialize an index set.
+
+        >>> selection = IndexSet()
+        >>> selection.add_range(0, 1000000)
+        >>> selection.remove(500)
+        >>> selection.ranges()
+        [(0, 500), (501, 1000000)]
+        >>> 500 in selection
+        False
+
+        indices - indices in the set. Defaults to an empty tuple.
+
+        parameters: iterable of int
+        """
+
+        self._starts = [] # Start of each range
+        self._ends = [] # End of each range, which is not in the set
+
+        for index in indices:
+            self.add(index)
+
+    def __contains__(self, index):
+        position = bisect_right(self._starts, index) - 1
+
+        return position >= 0 and index < self._ends[position]
+
+    def __len__(self):
+        return sum(end - start for start, end in zip(self._starts, self._ends))
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __iter__(self):
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end)
+
+    def __eq__(self, other):
+        if not isinstance(other, IndexSet):
+            return NotImplemented
+
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self):
+        return f"IndexSet({self.ranges()!r})"
+
+    def ranges(self):
+        """Get the ranges of the set.
+
+        returns: list of tuple (start, end)
+        """
+
+        return list(zip(self._starts, self._ends))
+
+    def add_range(self, start, end):
+        """Add a range of indices to the set. Overlapping and adjacent ranges
+        are merged.
+
+        start - first index of the range
+        end - index after the last one of the range
+
+        parameters: int, int
+        """
+
+        if end <= start:
+            return
+
+        low = bisect_left(self._ends, start)
+        high = bisect_right(self._starts, end)
+
+        if low < high:
+            start = min(start, self._starts[low])
+            end = max(end, self._ends[high - 1])
+
+        self._starts[low:high] = [start]
+        self._ends[low:high] = [end]
+
+    def remove_range(self, start, end):
+        """Remove a range of indices from the set. Ranges are split if the
+        indices are in the middle of them.
+
+        start - first index of the range
+        end - index after the last one of the range
+
+        parameters: int, int
+        """
+
+        if end <= start:
+            return
+
+        low = bisect_right(self._ends, start)
+        high = bisect_left(self._starts, end)
+
+        if low >= high:
+            return
+
+        starts = []
+        ends = []
+
+        if self._starts[low] < start:
+            starts.append(self._starts[low])
+            ends.append(start)
+        if self._ends[high - 1] > end:
+            starts.append(end)
+            ends.append(self._ends[high - 1])
+
+        self._starts[low:high] = starts
+        self._ends[low:high] = ends
+
+    def add(self, index):
+        """Add an index to the set.
+
+        index - index to be added
+
+        parameters: int
+        """
+
+        self.add_range(index, index + 1)
+
+    def remove(self, index):
+        """Remove an index from the set. If it is not in the set, nothing
+        happens.
+
+        index - index to be removed
+
+        parameters: int
+        """
+
+        self.remove_range(index, index + 1)
+
+    def toggle(self, index):
+        """Add an index to the set if it is not in it, otherwise remove it.
+
+        index - index to be toggled
+
+        parameters: int
+        returns: bool (whether the index is in the set)
+        """
+
+        if index in self:
+            self.remove(index)
+            return False
+
+        self.add(index)
+        return True
+
+    def first(self):
+        """Get the lowest index of the set.
+
+        returns: int, or None if the set is empty
+        """
+
+        return self._starts[0] if self._starts else None
+
+    def clear(self):
+        """Remove all of the indices."""
+
+        self._starts.clear()
+        self._ends.clear()
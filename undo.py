@@ -0,0 +1,260 @@
+"""Undo and redo history for editable documents in arcade-gui."""
+
+from collections import deque
+from sys import getsizeof
+
+__all__ = [
+           "Edit",
+           "UndoManager"
+          ]
+
+WHITESPACE = " \t\n\r\v\f\u2028\u2029"
+
+
+class Edit:
+    """A single insertion or deletion recorded by an undo manager. Only the
+    text that changed is stored, not a copy of the whole document.
+    """
+
+    __slots__ = ("insert", "start", "text")
+
+    def __init__(self, insert, start, text):
+        """Initialize an edit.
+
+        insert - the text was inserted. If False, the text was deleted.
+        start - position of the edit
+        text - text that was inserted or deleted
+
+        parameters: bool, int, str
+        """
+
+        self.insert = insert
+        self.start = start
+        self.text = text
+
+    def _get_size(self):
+        """Get the size of the edit in bytes.
+
+        returns: int
+        """
+
+        return getsizeof(self.text)
+
+    size = property(_get_size)
+
+
+class UndoManager:
+    """Undo manager that records the insertions and deletions of a document.
+
+    Consecutive typing is coalesced, so undoing removes a whole word instead
+    of a single character. The history is kept within a byte budget, and the
+    oldest steps are discarded when it is exceeded.
+    """
+
+    def __init__(self, document, max_bytes=1024 * 1024, coalesce=True):
+        """Initialize an undo manager. This pushes events to the document
+        automatically. The document must dispatch on_remove_text, like a
+        RopeDocument does.
+
+        >>> undo = UndoManager(entry.document)
+        >>> entry.insert(0, "Hello")
+        >>> undo.undo()
+        0
+
+        document - document to record edits of
+        max_bytes - byte budget of the history. When exceeded, the oldest
+                    steps are evicted. Defaults to 1 MiB.
+        coalesce - consecutive typing and deleting is merged into one step.
+                   Typing whitespace after a word starts a new step. Defaults
+                   to True.
+
+        properties:
+            undo_stack - steps that can be undone, oldest first
+            redo_stack - steps that can be redone, newest last
+            size - size of the history in bytes
+
+        parameters: pyglet.text.document.AbstractDocument, int, bool
+        """
+
+        self.document = document
+        self.max_bytes = max_bytes
+        self.coalesce = coalesce
+
+        self.undo_stack = deque()
+        self.redo_stack = []
+
+        self.size = 0
+
+        self._applying = False
+        self._merge = False
+
+        self.document.push_handlers(
+            self.on_insert_text,
+            self.on_remove_text
+        )
+
+    def _can_merge(self, edit, insert, start, text):
+        """Check if an edit can be merged into the last step.
+
+        edit - last step of the undo stack
+        insert - the new text was inserted
+        start - position of the new edit
+        text - text of the new edit
+
+        parameters: Edit, bool, int, str
+        returns: bool
+        """
+
+        if not self.coalesce or not self._merge or \
+            not edit.insert == insert or not len(text) == 1:
+            return False
+
+        if insert:
+            if not start == edit.start + len(edit.text):
+                return False
+
+            # Start a new step at the first whitespace after a word
+            return not (text in WHITESPACE and
+                        edit.text[-1] not in WHITESPACE)
+
+        # Backspace and Delete
+        return start + 1 == edit.start or start == edit.start
+
+    def _record(self, insert, start, text):
+        """Record an edit, merging it into the last step if possible.
+
+        insert - the text was inserted
+        start - position of the edit
+        text - text that was inserted or deleted
+
+        parameters: bool, int, str
+        """
+
+        if self._applying or not text:
+            return
+
+        self.size -= sum(edit.size for edit in self.redo_stack)
+        self.redo_stack.clear()
+
+        if self.undo_stack and \
+            self._can_merge(self.undo_stack[-1], insert, start, text):
+            edit = self.undo_stack[-1]
+
+            self.size -= edit.size
+
+            if insert or start == edit.start:
+                edit.text += text
+            else:
+                edit.text = text + edit.text
+                edit.start = start
+        else:
+            edit = Edit(insert, start, text)
+
+            self.undo_stack.append(edit)
+
+        self.size += edit.size
+        self._merge = True
+
+        self.evict()
+
+    def evict(self):
+        """Evict the oldest steps until the history fits in its byte budget.
+        The latest step is always kept.
+        """
+
+        while self.size > self.max_bytes and len(self.undo_stack) > 1:
+            self.size -= self.undo_stack.popleft().size
+
+    def separate(self):
+        """Start a new step, so the next edit is not merged into the last
+        one. Call this when the caret is moved.
+        """
+
+        self._merge = False
+
+    def _apply(self, edit, insert):
+        """Apply an edit to the document without recording it.
+
+        edit - edit to apply
+        insert - insert the text of the edit. If False, it is deleted.
+
+        parameters: Edit, bool
+        returns: int (position of the caret after the edit)
+        """
+
+        self._applying = True
+
+        try:
+            if insert:
+                self.document.insert_text(edit.start, edit.text)
+
+                return edit.start + len(edit.text)
+
+            self.document.delete_text(edit.start,
+                                      edit.start + len(edit.text))
+
+            return edit.start
+
+        finally:
+            self._applying = False
+            self._merge = False
+
+    def undo(self):
+        """Undo the last step.
+
+        returns: int (position of the caret), or None if there is nothing to
+                 undo
+        """
+
+        if not self.undo_stack:
+            return None
+
+        edit = self.undo_stack.pop()
+        self.redo_stack.append(edit)
+
+        return self._apply(edit, not edit.insert)
+
+    def redo(self):
+        """Redo the last undone step.
+
+        returns: int (position of the caret), or None if there is nothing to
+                 redo
+        """
+
+        if not self.redo_stack:
+            return None
+
+        edit = self.redo_stack.pop()
+        self.undo_stack.append(edit)
+
+        return self._apply(edit, edit.insert)
+
+    def clear(self):
+        """Clear the history."""
+
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+        self.size = 0
+
+    def on_insert_text(self, start, text):
+        """Some text was inserted into the document.
+
+        start - position of the insertion
+        text - text that was inserted
+
+        parameters: int, str
+        """
+
+        self._record(True, start, str(text))
+
+    def on_remove_text(self, start, text):
+        """Some text was deleted from the document.
+
+        start - position of the deletion
+        text - text that was deleted
+
+        parameters: int, str
+        """
+
+        self._record(False, start, text)
@@ -0,0 +1,332 @@
+"""Compiled input validators for arcade-gui."""
+
+from re import compile as compile_regex
+from re import escape
+from string import printable
+
+from constants import FILTER, REJECT
+
+__all__ = [
+           "Validator",
+           "CharsetValidator",
+           "RegexValidator",
+           "RangeValidator",
+           "compile_validator",
+           "VALIDATION_LOWERCASE",
+           "VALIDATION_UPPERCASE",
+           "VALIDATION_LETTERS",
+           "VALIDATION_DIGITS",
+           "VALIDATION_ADVANCED_DIGITS",
+           "VALIDATION_PUNCTUATION",
+           "VALIDATION_WHITESPACE",
+           "VALIDATION_PRINTABLE",
+           "VALIDATION_REGULAR"
+          ]
+
+
+class Validator:
+    """Base class of validators. A validator is compiled once when it is
+    created, and then checks whole strings in a single pass, so pasting a
+    large amount of text is not validated character by character.
+    """
+
+    def __init__(self, mode=REJECT):
+        """Initialize a validator.
+
+        mode - what happens when invalid text is found. With REJECT, all of
+               the text is rejected. With FILTER, only the invalid characters
+               are removed. Defaults to REJECT.
+
+        parameters: str
+        """
+
+        self.mode = mode
+
+    def __contains__(self, text):
+        return self.check(text)
+
+    def check(self, text):
+        """Check if all of some text is valid.
+
+        text - text to check
+
+        parameters: str
+        returns: bool
+        """
+
+        raise NotImplementedError
+
+    def filter(self, text):
+        """Remove the invalid characters of some text.
+
+        text - text to filter
+
+        parameters: str
+        returns: str
+        """
+
+        return text if self.check(text) else ""
+
+    def validate(self, text, current="", start=0, end=None):
+        """Validate some text that is about to be inserted. Validators that
+        check the whole value, like a RangeValidator, use the current text to
+        build the result of the insertion. The current text is not read by the
+        other validators.
+
+        >>> validator = CharsetValidator("0123456789", mode=FILTER)
+        >>> validator.validate("1a2b3")
+        "123"
+
+        text - text to be inserted
+        current - current text the insertion is made in
+        start - start of the insertion. Text between start and end is replaced.
+        end - end of the insertion. Defaults to start.
+
+        parameters: str, str, int, int
+        returns: str (text to be inserted, empty if it was rejected)
+        """
+
+        if self.mode == FILTER:
+            return self.filter(text)
+
+        return text if self.check(text) else ""
+
+
+class CharsetValidator(Validator):
+    """Validator that only accepts characters from a charset. The charset is
+    compiled into a regular expression matching any invalid character. An
+    empty charset accepts everything, like no validation.
+    """
+
+    def __init__(self, charset, mode=REJECT):
+        """Initialize a charset validator.
+
+        >>> validator = CharsetValidator("abc")
+        >>> validator.check("cab")
+        True
+        >>> "d" in validator
+        False
+
+        charset - string containing all of the valid characters
+        mode - REJECT or FILTER. Defaults to REJECT.
+
+        parameters: str, str
+        """
+
+        Validator.__init__(self, mode)
+
+        self.charset = charset
+
+        if charset:
+            self._invalid = compile_regex(f"[^{escape(charset)}]")
+        else:
+            self._invalid = None
+
+    def __repr__(self):
+        return f"CharsetValidator({self.charset!r})"
+
+    def check(self, text):
+        if self._invalid is None:
+            return True
+
+        return self._invalid.search(text) is None
+
+    def filter(self, text):
+        if self._invalid is None:
+            return text
+
+        return self._invalid.sub("", text)
+
+
+class RegexValidator(Validator):
+    """Validator that accepts text fully matching a regular expression. When
+    filtering, only the parts of the text matching it are kept.
+    """
+
+    def __init__(self, pattern, mode=REJECT):
+        """Initialize a regex validator.
+
+        >>> validator = RegexValidator(r"[0-9a-f]+", mode=FILTER)
+        >>> validator.filter("c0ffee!")
+        "c0ffee"
+
+        pattern - regular expression of valid text
+        mode - REJECT or FILTER. Defaults to REJECT.
+
+        parameters: str, str
+        """
+
+        Validator.__init__(self, mode)
+
+        self.pattern = compile_regex(pattern)
+
+    def __repr__(self):
+        return f"RegexValidator({self.pattern.pattern!r})"
+
+    def check(self, text):
+        return self.pattern.fullmatch(text) is not None
+
+    def filter(self, text):
+        return "".join(match.group() for match in
+                       self.pattern.finditer(text))
+
+
+class RangeValidator(Validator):
+    """Validator for numbers within a range. Unlike other validators, this
+    checks the text the insertion results in, as a single digit can make a
+    number leave its range.
+    """
+
+    INTEGER = compile_regex(r"[+-]?\d*")
+    DECIMAL = compile_regex(r"[+-]?\d*\.?\d*")
+
+    def __init__(self, minimum=None, maximum=None, integer=False,
+                 mode=REJECT):
+        """Initialize a range validator.
+
+        >>> validator = RangeValidator(0, 255, integer=True)
+        >>> validator.validate("5", "25", 2)
+        "5"
+        >>> validator.validate("6", "25", 2)
+        ""
+
+        Incomplete numbers like "-" or "." are accepted while typing, and so
+        are numbers below the minimum that can still grow into the range.
+        Use check to validate a finished number.
+
+        minimum - minimum value of the number. Defaults to None (no minimum).
+        maximum - maximum value of the number. Defaults to None (no maximum).
+        integer - only integers are accepted. Defaults to False.
+        mode - REJECT or FILTER. Defaults to REJECT.
+
+        parameters: int or float, int or float, bool, str
+        """
+
+        Validator.__init__(self, mode)
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.integer = integer
+
+        self._number = self.INTEGER if integer else self.DECIMAL
+        self._invalid = compile_regex(r"[^0-9+\-]" if integer else
+                                      r"[^0-9+\-.]")
+
+    def __repr__(self):
+        return f"RangeValidator({self.minimum!r}, {self.maximum!r})"
+
+    def _get_value(self, text):
+        """Get the value of a number, or None if it is incomplete.
+
+        text - text of the number
+
+        parameters: str
+        returns: int or float
+        """
+
+        if not self._number.fullmatch(text):
+            return None
+
+        try:
+            return int(text) if self.integer else float(text)
+        except ValueError:
+            return None
+
+    def _accepts(self, text):
+        """Check if some text is a number, or could still become one, that
+        is within the range.
+
+        text - text to check
+
+        parameters: str
+        returns: bool
+        """
+
+        if not self._number.fullmatch(text):
+            return False
+
+        value = self._get_value(text)
+
+        if value is None:
+            return True
+
+        # Typing more digits only moves a number away from zero
+        if self.maximum is not None and value > max(self.maximum, 0):
+            return False
+        if self.minimum is not None and value < min(self.minimum, 0):
+            return False
+
+        return True
+
+    def check(self, text):
+        value = self._get_value(text)
+
+        if value is None:
+            return False
+
+        if self.minimum is not None and value < self.minimum:
+            return False
+        if self.maximum is not None and value > self.maximum:
+            return False
+
+        return True
+
+    def filter(self, text):
+        return self._invalid.sub("", text)
+
+    def validate(self, text, current="", start=0, end=None):
+        if end is None:
+            end = start
+
+        if self.mode == FILTER:
+            text = self.filter(text)
+
+        if self._accepts(current[:start] + text + current[end:]):
+            return text
+
+        return ""
+
+
+_compiled = {}
+
+def compile_validator(validate, mode=REJECT):
+    """Compile a validation into a validator. Strings are treated as charsets,
+    and compiled validators are reused for the same charset.
+
+    >>> compile_validator("0123456789") is compile_validator("0123456789")
+    True
+
+    validate - charset, validator, or None or an empty charset for no
+               validation
+    mode - REJECT or FILTER, used for charsets. Defaults to REJECT.
+
+    parameters: str or Validator, str
+    returns: Validator
+    """
+
+    if not validate:
+        return None
+
+    if isinstance(validate, Validator):
+        return validate
+
+    key = (validate, mode)
+
+    if key not in _compiled:
+        _compiled[key] = CharsetValidator(validate, mode)
+
+    return _compiled[key]
+
+
+VALIDATION_LOWERCASE = compile_validator("abcdefghijklmnopqrstuvwxyz")
+VALIDATION_UPPERCASE = compile_validator("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+VALIDATION_LETTERS = compile_validator(VALIDATION_LOWERCASE.charset +
+                                       VALIDATION_UPPERCASE.charset)
+VALIDATION_DIGITS = compile_validator("1234567890")
+VALIDATION_ADVANCED_DIGITS = compile_validator("1234567890.+-*/^<>[]{}()!|")
+VALIDATION_PUNCTUATION = compile_validator(
+    r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""
+)
+VALIDATION_WHITESPACE = compile_validator(" \t\n\r\v\f")
+VALIDATION_PRINTABLE = compile_validator(printable)
+VALIDATION_REGULAR = None